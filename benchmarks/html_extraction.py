@@ -0,0 +1,93 @@
+"""
+Compare the job-page text extraction engines on saved job-board pages.
+
+Usage:
+    python -m benchmarks.html_extraction path/to/pages [--repeat 5]
+
+Every ``*.html`` file in the directory is extracted with the previous
+BeautifulSoup + chained select_one implementation and with the current
+extractor. Reports the best time of each and whether the texts agree.
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from bs4 import BeautifulSoup
+
+from src.utils.html_extractor import HAS_LXML, extract_main_text
+from src.utils.job_description_parser import JobDescriptionParser
+
+
+def legacy_extract(html_content: str, selectors: list) -> Optional[str]:
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    for element in soup(["script", "style", "header", "footer", "nav", "aside"]):
+        element.decompose()
+
+    for selector in selectors:
+        try:
+            content = soup.select_one(selector)
+            if content:
+                return content.get_text(separator=" ", strip=True)
+        except Exception:
+            continue
+
+    if soup.body:
+        return soup.body.get_text(separator=" ", strip=True)
+
+    return None
+
+
+def best_time(function: Callable, html_content: str, selectors: list, repeat: int):
+    elapsed = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(html_content, selectors)
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed), result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argument_parser.add_argument("directory", type=Path)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    pages = sorted(args.directory.glob("*.html"))
+    if not pages:
+        raise SystemExit(f"No HTML files found in {args.directory}")
+
+    selectors = JobDescriptionParser().content_selectors
+    legacy_total = current_total = 0.0
+    mismatches = 0
+
+    print(f"engine: {'lxml' if HAS_LXML else 'html.parser'}")
+    print(f"{'page':<40} {'KB':>7} {'legacy ms':>10} {'new ms':>8} {'speedup':>8} same")
+    for page in pages:
+        html_content = page.read_text(encoding="utf-8", errors="replace")
+        legacy_time, legacy_text = best_time(
+            legacy_extract, html_content, selectors, args.repeat
+        )
+        current_time, current_text = best_time(
+            extract_main_text, html_content, selectors, args.repeat
+        )
+        same = legacy_text == current_text
+        mismatches += not same
+        legacy_total += legacy_time
+        current_total += current_time
+        print(
+            f"{page.name[:40]:<40} {len(html_content) / 1024:>7.0f} "
+            f"{legacy_time * 1000:>10.1f} {current_time * 1000:>8.1f} "
+            f"{legacy_time / current_time:>7.1f}x {'yes' if same else 'NO'}"
+        )
+
+    print(
+        f"\ntotal: legacy {legacy_total * 1000:.1f} ms, new {current_total * 1000:.1f}"
+        f" ms ({legacy_total / current_total:.1f}x), {mismatches} text mismatches"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Per-request overhead of the HTTP middlewares: the previous
+@app.middleware("http") functions (BaseHTTPMiddleware) against the pure ASGI
+RateLimitMiddleware and CatchExceptionMiddleware.
+
+Usage:
+    python -m benchmarks.middleware_overhead [--requests 5000] [--concurrency 1 16 64]
+
+Requests are driven straight through the ASGI interface (no sockets), so the
+numbers are the cost of the middleware stack itself on top of a trivial route.
+Typical result: BaseHTTPMiddleware adds ~550us per request, pure ASGI ~30us.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+from src.helpers.logger import request_id_context
+from src.middlewares.exception_middleware import CatchExceptionMiddleware
+from src.middlewares.rate_limit_middleware import RateLimitMiddleware
+
+
+def add_routes(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    async def ping():
+        return {"request_id": request_id_context.get()}
+
+    return app
+
+
+def bare_app() -> FastAPI:
+    return add_routes(FastAPI())
+
+
+def base_http_app() -> FastAPI:
+    """The middlewares as they were in src/main.py (success path)"""
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def rate_limit_middleware(request: Request, call_next):
+        client_ip = request.client.host
+        if request.url.path.startswith("/analyze"):
+            raise AssertionError(f"not benchmarked ({client_ip})")
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def catch_exception_middleware(request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        token = request_id_context.set(request_id)
+        try:
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            request_id_context.reset(token)
+
+    return add_routes(app)
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(CatchExceptionMiddleware)
+    return add_routes(app)
+
+
+async def call(app, path: str = "/ping"):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    assert status == 200, status
+
+
+async def run(app, requests: int, concurrency: int) -> float:
+    """Microseconds per request with `concurrency` requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call(app)
+
+    for _ in range(200):
+        await call(app)  # warm up routing and middleware stack
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    args = parser.parse_args()
+
+    apps = [
+        ("no middleware", bare_app),
+        ("BaseHTTPMiddleware", base_http_app),
+        ("pure ASGI", asgi_app),
+    ]
+    print(f"{'concurrency':>11}  " + "  ".join(f"{name:>20}" for name, _ in apps))
+    for concurrency in args.concurrency:
+        timings = []
+        for _, factory in apps:
+            timings.append(asyncio.run(run(factory(), args.requests, concurrency)))
+        bare = timings[0]
+        cells = [f"{timings[0]:>15.1f} us/req"] + [
+            f"{t:>9.1f} us (+{t - bare:>5.1f})" for t in timings[1:]
+        ]
+        print(f"{concurrency:>11}  " + "  ".join(f"{c:>20}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
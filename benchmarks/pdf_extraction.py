@@ -0,0 +1,109 @@
+"""
+Compare PDF text backends on a corpus of sample resumes.
+
+Usage:
+    python -m benchmarks.pdf_extraction path/to/resumes [--repeat 3]
+
+For every PDF in the directory each installed backend is timed. Fidelity is the
+token F1 against a reference text: ``<name>.txt`` next to the PDF when present,
+otherwise the PyPDF2 output.
+"""
+import argparse
+import io
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from src.services.pdf_reader_service import PDF_BACKENDS, available_backends
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    candidate_tokens = Counter(candidate.lower().split())
+    reference_tokens = Counter(reference.lower().split())
+    if not candidate_tokens or not reference_tokens:
+        return 0.0
+
+    overlap = sum((candidate_tokens & reference_tokens).values())
+    precision = overlap / sum(candidate_tokens.values())
+    recall = overlap / sum(reference_tokens.values())
+    if precision + recall == 0:
+        return 0.0
+    return 2 * precision * recall / (precision + recall)
+
+
+def run(directory: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    pdfs = sorted(directory.glob("*.pdf"))
+    if not pdfs:
+        raise SystemExit(f"No PDF files found in {directory}")
+
+    backends = available_backends()
+    timings: Dict[str, List[float]] = {name: [] for name in backends}
+    fidelity: Dict[str, List[float]] = {name: [] for name in backends}
+    failures: Counter = Counter()
+
+    for pdf in pdfs:
+        data = pdf.read_bytes()
+        reference_file = pdf.with_suffix(".txt")
+        reference = (
+            reference_file.read_text(encoding="utf-8")
+            if reference_file.exists()
+            else PDF_BACKENDS["pypdf2"](io.BytesIO(data))
+        )
+
+        for name in backends:
+            extract = PDF_BACKENDS[name]
+            try:
+                elapsed = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    text = extract(io.BytesIO(data))
+                    elapsed.append(time.perf_counter() - start)
+            except Exception:
+                failures[name] += 1
+                continue
+
+            timings[name].append(min(elapsed))
+            fidelity[name].append(token_f1(text, reference))
+
+    report = {}
+    for name in backends:
+        if not timings[name]:
+            report[name] = {"documents": 0, "failures": failures[name]}
+            continue
+        report[name] = {
+            "documents": len(timings[name]),
+            "failures": failures[name],
+            "total_ms": sum(timings[name]) * 1000,
+            "median_ms": statistics.median(timings[name]) * 1000,
+            "mean_f1": statistics.mean(fidelity[name]),
+        }
+    return report
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argument_parser.add_argument("directory", type=Path)
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    report = run(args.directory, args.repeat)
+    baseline = report.get("pypdf2", {}).get("total_ms")
+
+    print(f"{'backend':<10} {'docs':>5} {'fail':>5} {'total ms':>10} "
+          f"{'median ms':>10} {'speedup':>8} {'F1':>6}")
+    for name, row in report.items():
+        if not row["documents"]:
+            print(f"{name:<10} {0:>5} {row['failures']:>5}")
+            continue
+        speedup = baseline / row["total_ms"] if baseline else float("nan")
+        print(
+            f"{name:<10} {row['documents']:>5} {row['failures']:>5} "
+            f"{row['total_ms']:>10.1f} {row['median_ms']:>10.2f} "
+            f"{speedup:>7.2f}x {row['mean_f1']:>6.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
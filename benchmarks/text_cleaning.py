@@ -0,0 +1,109 @@
+"""
+Microbenchmark of JobDescriptionParser.clean_text and is_job_finished.
+
+Usage:
+    python -m benchmarks.text_cleaning [path/to/pages] [--repeat 20]
+
+Pages are ``*.html`` or ``*.txt`` files from scraped job boards; without a
+directory a ~1 MB synthetic page is used. Compares the previous
+implementations (three re.sub calls, one scan per indicator) with the
+module-level engines, plus a single regex alternation for reference.
+"""
+import argparse
+import re
+import timeit
+from pathlib import Path
+from typing import List
+
+from src.utils.job_description_parser import (
+    CLOSED_POSITION_INDICATORS,
+    JobDescriptionParser,
+    closed_position_matcher,
+)
+
+LEGACY_INDICATORS = [
+    indicator
+    for indicators in CLOSED_POSITION_INDICATORS.values()
+    for indicator in indicators
+]
+ALTERNATION = re.compile("|".join(re.escape(i) for i in LEGACY_INDICATORS))
+
+
+def legacy_clean_text(text: str) -> str:
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[\n\r\t]", " ", text)
+    text = re.sub(r"[^\w\s.,!?-]", "", text)
+    return text.strip()
+
+
+def legacy_is_job_finished(text: str) -> bool:
+    normalized_text = text.lower()
+    for indicator in LEGACY_INDICATORS:
+        if indicator in normalized_text:
+            return True
+    return False
+
+
+def alternation_is_job_finished(text: str) -> bool:
+    return ALTERNATION.search(text.lower()) is not None
+
+
+def synthetic_page() -> str:
+    block = (
+        "<div class='job'>\n\tSenior Python Engineer (Remote) — R$ 15.000,00\n"
+        "  Requirements: FastAPI, Redis & PostgreSQL; 5+ years…\n</div>\n"
+    )
+    return block * 8000
+
+
+def load_pages(directory: Path) -> List[str]:
+    files = sorted(list(directory.glob("*.html")) + list(directory.glob("*.txt")))
+    return [f.read_text(encoding="utf-8", errors="replace") for f in files]
+
+
+def report(label: str, candidates, pages: List[str], repeat: int):
+    print(f"\n{label}")
+    baseline = None
+    for name, function in candidates:
+        seconds = min(
+            timeit.repeat(lambda: [function(p) for p in pages], number=1, repeat=repeat)
+        )
+        baseline = baseline or seconds
+        print(f"  {name:<24} {seconds * 1000:>9.2f} ms  {baseline / seconds:>5.2f}x")
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argument_parser.add_argument("directory", type=Path, nargs="?")
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    args = argument_parser.parse_args()
+
+    pages = load_pages(args.directory) if args.directory else [synthetic_page()]
+    if not pages:
+        raise SystemExit(f"No pages found in {args.directory}")
+
+    parser = JobDescriptionParser()
+    mismatches = sum(parser.clean_text(p) != legacy_clean_text(p) for p in pages)
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1024:.0f} KB total, "
+          f"{mismatches} clean_text mismatches")
+
+    report(
+        "clean_text",
+        [("legacy (3x re.sub)", legacy_clean_text), ("current", parser.clean_text)],
+        pages,
+        args.repeat,
+    )
+    report(
+        "is_job_finished",
+        [
+            ("legacy (loop)", legacy_is_job_finished),
+            ("regex alternation", alternation_is_job_finished),
+            ("current", closed_position_matcher.matches),
+        ],
+        pages,
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
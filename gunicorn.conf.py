@@ -0,0 +1,45 @@
+"""
+Multi-worker deployment: gunicorn master with uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+Workers share nothing but the pages preloaded by the master: each one opens
+its own Redis pool, HTTP session and browser pool in the app lifespan.
+"""
+import gc
+import multiprocessing
+import os
+
+# Every worker appends to the same log file: no in-process size rotation,
+# which races across processes (set before the master imports the app)
+os.environ.setdefault("LOG_FILE_ROTATION", "external")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8009')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# PDF extraction and HTML parsing are CPU bound: one worker per core
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Import the app (and preload its state) once in the master, then fork
+preload_app = True
+
+# LLM calls can take close to a minute with retries
+timeout = int(os.getenv("WORKER_TIMEOUT", 120))
+# On SIGTERM workers stop accepting connections and finish in-flight
+# requests for up to this long before the lifespan shutdown runs
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Recycle workers now and then, staggered so they do not restart together
+max_requests = int(os.getenv("MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+
+
+def when_ready(server):
+    from src.helpers.preload import preload_state
+
+    preload_state()
+    # Objects created so far are never collected in the workers, so the GC
+    # does not touch (and copy) the pages shared with the master
+    gc.freeze()
@@ -0,0 +1,304 @@
+"""
+Offline bulk scoring: every PDF of a directory against every job description
+of a file, without the HTTP API (multipart, middlewares, rate limit).
+
+Usage:
+    python -m src.bulk_score RESUMES_DIR JOBS_FILE [--output results.jsonl]
+        [--language en] [--workers N] [--concurrency N]
+
+JOBS_FILE is JSONL ({"id": ..., "text": ...}, the text may be a job URL) or
+plain text with the descriptions separated by lines containing only "---".
+
+PDFs are extracted and validated (is_resume_content) in a process pool, one
+process per core by default; the scoring fans out on the event loop, bounded
+by --concurrency and by the LLM governor. At most two resumes per worker
+are in flight (extracted or being scored), so memory does not grow with the
+directory. Each result is appended to the output as soon as it is ready.
+Rerunning with the same output skips the pairs already scored (or whose PDF
+is not a resume), so an interrupted run resumes where it stopped; failed
+pairs are retried.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import config
+from src.exceptions.NotResume import NotResume
+from src.services.pdf_reader_service import extract_pdf_text
+from src.services.resume_condenser import condense_resume
+from src.services.resume_index_service import resume_id
+from src.services.resume_matcher_service import is_resume_content
+from src.services.similarity_service import SimilarityContent
+from src.utils.job_description_parser import URL_PATTERN, JobDescriptionParser
+from src.utils.job_index import JobPosting, index_job_description
+
+STATUS_OK = "ok"
+STATUS_NOT_RESUME = "not_resume"
+STATUS_ERROR = "error"
+
+# Pairs with these statuses are not scored again on resume
+DONE_STATUSES = (STATUS_OK, STATUS_NOT_RESUME)
+JOB_SEPARATOR = "---"
+
+
+def load_jobs(path: str) -> List[Dict]:
+    """Job descriptions as [{"id", "text"}], from JSONL or "---" separated text"""
+    with open(path, encoding="utf-8") as jobs_file:
+        content = jobs_file.read()
+
+    if path.endswith(".jsonl"):
+        jobs = []
+        for number, line in enumerate(content.splitlines(), 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            text = job.get("text") or job.get("job_description") or job.get("url")
+            jobs.append({"id": str(job.get("id", number)), "text": text})
+        return jobs
+
+    blocks, current = [], []
+    for line in content.splitlines():
+        if line.strip() == JOB_SEPARATOR:
+            blocks.append("\n".join(current))
+            current = []
+        else:
+            current.append(line)
+    blocks.append("\n".join(current))
+    return [
+        {"id": str(number), "text": block.strip()}
+        for number, block in enumerate(blocks, 1)
+        if block.strip()
+    ]
+
+
+def list_pdfs(directory: str) -> List[str]:
+    """PDF paths relative to the directory, sorted (stable checkpoint keys)"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(paths)
+
+
+def load_checkpoint(output: str) -> Set[Tuple[str, str]]:
+    """(resume, job_id) pairs already done in a previous run"""
+    done: Set[Tuple[str, str]] = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding="utf-8") as output_file:
+        for line in output_file:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # last line of an interrupted run
+            if row.get("status") in DONE_STATUSES:
+                done.add((row["resume"], row["job_id"]))
+    return done
+
+
+def open_output(output: str):
+    """Append mode, after terminating a line cut by an interrupted run"""
+    torn = False
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, "rb") as output_file:
+            output_file.seek(-1, os.SEEK_END)
+            torn = output_file.read(1) != b"\n"
+    output_file = open(output, "a", encoding="utf-8")
+    if torn:
+        output_file.write("\n")
+    return output_file
+
+
+def extract_resume_file(path: str, language: str) -> Dict:
+    """
+    Text of the PDF, validated as a resume. Runs in a pool process: takes and
+    returns only picklable values.
+    """
+    try:
+        with open(path, "rb") as pdf_file:
+            text = extract_pdf_text(pdf_file)
+        is_resume_content(resume=text, language=language)
+    except NotResume as e:
+        return {"status": STATUS_NOT_RESUME, "error": e.message}
+    except Exception as e:
+        return {"status": STATUS_ERROR, "error": f"{type(e).__name__}: {e}"}
+    return {"status": STATUS_OK, "text": text}
+
+
+class BulkScorer:
+    def __init__(
+        self,
+        resumes_dir: str,
+        jobs: List[Dict],
+        output: str,
+        language: str,
+        workers: int,
+        concurrency: int,
+    ):
+        self.resumes_dir = resumes_dir
+        self.jobs = jobs
+        self.output = output
+        self.language = language
+        self.workers = workers
+        self.concurrency = concurrency
+        self.done = load_checkpoint(output)
+        self.counts = {STATUS_OK: 0, STATUS_NOT_RESUME: 0, STATUS_ERROR: 0}
+        self._output_file = None
+        self._postings: Dict[str, Tuple[JobPosting, bool]] = {}
+
+    def write(self, row: Dict):
+        """Append one result; flushed so a crash loses nothing already scored"""
+        self._output_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._output_file.flush()
+        self.counts[row["status"]] += 1
+
+    async def prepare_jobs(self):
+        """Parse (or fetch) and index each job description once"""
+        parser = JobDescriptionParser()
+        if any(URL_PATTERN.match(job["text"] or "") for job in self.jobs):
+            await parser.start()
+        try:
+            for job in self.jobs:
+                parsed = await parser.parse(job["text"] or "")
+                if parsed is None or not parsed.content:
+                    print(f"Skipping job {job['id']}: could not parse it")
+                    continue
+                posting = await index_job_description(parsed.content)
+                self._postings[job["id"]] = (posting, parsed.is_position_closed)
+        finally:
+            await parser.close()
+
+    async def score(
+        self, row: Dict, text: str, job_id: str, slots: asyncio.Semaphore
+    ):
+        posting, is_position_closed = self._postings[job_id]
+        row = {**row, "job_id": job_id, "job_hash": posting.content_hash}
+        async with slots:
+            try:
+                similarity = await SimilarityContent(
+                    text,
+                    posting,
+                    self.language,
+                    is_position_closed=is_position_closed,
+                ).compute_similarity()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                self.write({**row, "status": STATUS_ERROR, "error": error})
+                return
+
+        self.write(
+            {
+                **row,
+                "status": STATUS_OK,
+                "score": round(similarity["similarity_score"] * 100, 2),
+                "missing_keywords": similarity["missing_keywords"],
+                "total_missing": similarity["total_missing"],
+                "message": similarity["feedback"],
+                "is_position_closed": similarity["is_position_closed"],
+            }
+        )
+
+    async def process(
+        self,
+        resume: str,
+        pool: ProcessPoolExecutor,
+        resume_slots: asyncio.Semaphore,
+        scoring_slots: asyncio.Semaphore,
+    ):
+        job_ids = [j for j in self._postings if (resume, j) not in self.done]
+        if not job_ids:
+            return
+
+        loop = asyncio.get_running_loop()
+        path = os.path.join(self.resumes_dir, resume)
+        # Held until the resume is scored: bounds the texts in memory (waiting
+        # for a scoring slot included), not only the pool queue
+        async with resume_slots:
+            extracted = await loop.run_in_executor(
+                pool, extract_resume_file, path, self.language
+            )
+            if extracted["status"] != STATUS_OK:
+                for job_id in job_ids:
+                    self.write(
+                        {
+                            "resume": resume,
+                            "job_id": job_id,
+                            "status": extracted["status"],
+                            "error": extracted["error"],
+                        }
+                    )
+                return
+
+            row = {"resume": resume, "resume_hash": resume_id(extracted["text"])}
+            condensed = condense_resume(extracted["text"]).text
+            await asyncio.gather(
+                *(
+                    self.score(row, condensed, job_id, scoring_slots)
+                    for job_id in job_ids
+                )
+            )
+        print(f"{resume}: {len(job_ids)} jobs ({sum(self.counts.values())} rows)")
+
+    async def run(self) -> Dict[str, int]:
+        await self.prepare_jobs()
+        resumes = list_pdfs(self.resumes_dir)
+        print(
+            f"{len(resumes)} PDFs x {len(self._postings)} jobs, "
+            f"{len(self.done)} pairs already done"
+        )
+
+        # Resumes extracted or being scored at a time
+        resume_slots = asyncio.Semaphore(self.workers * 2)
+        scoring_slots = asyncio.Semaphore(self.concurrency)
+        self._output_file = open_output(self.output)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                await asyncio.gather(
+                    *(
+                        self.process(resume, pool, resume_slots, scoring_slots)
+                        for resume in resumes
+                    )
+                )
+        finally:
+            self._output_file.close()
+        return self.counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("resumes_dir")
+    parser.add_argument("jobs_file")
+    parser.add_argument("--output", default="bulk_results.jsonl")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--concurrency", type=int, default=config["LLM_MAX_CONCURRENCY"]
+    )
+    args = parser.parse_args(argv)
+
+    scorer = BulkScorer(
+        args.resumes_dir,
+        load_jobs(args.jobs_file),
+        args.output,
+        args.language,
+        args.workers,
+        args.concurrency,
+    )
+    start = time.perf_counter()
+    counts = asyncio.run(scorer.run())
+    print(
+        f"Done in {time.perf_counter() - start:.1f}s: {counts[STATUS_OK]} scored, "
+        f"{counts[STATUS_NOT_RESUME]} not resumes, {counts[STATUS_ERROR]} errors"
+        f" -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
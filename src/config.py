@@ -1,3 +1,4 @@
+import json
 from os import environ
 
 from dotenv import load_dotenv
@@ -6,10 +7,136 @@ load_dotenv()
 
 env = environ.get("API_ENV", "development")
 
+
+def _json_env(name: str, default: str, expected: type):
+    """JSON value of an environment variable; a clear error when it is malformed"""
+    raw = environ.get(name, default)
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{name} is not valid JSON ({e}): {raw!r}") from None
+    if not isinstance(value, expected):
+        raise ValueError(
+            f"{name} must be a JSON {expected.__name__}, got {type(value).__name__}"
+        )
+    return value
+
+
+def _closed_indicators_env() -> dict:
+    """{"language": ["phrase", ...]}, validated at startup"""
+    indicators = _json_env("JOB_CLOSED_INDICATORS", "{}", dict)
+    for language, phrases in indicators.items():
+        if not isinstance(phrases, list) or not all(
+            isinstance(phrase, str) for phrase in phrases
+        ):
+            raise ValueError(
+                f"JOB_CLOSED_INDICATORS['{language}'] must be a list of strings"
+            )
+    return indicators
+
+
 config = {
     "LLM_API_KEY": None,
     "DEBUG": False,
     "LOG_LEVEL": "INFO",
+    "PDF_BACKEND": environ.get("PDF_BACKEND", "auto"),
+    # Extra closed-position phrases, e.g. {"es": ["vacante cerrada"]}; every
+    # posting is checked against the phrases of all languages
+    "JOB_CLOSED_INDICATORS": _closed_indicators_env(),
+    # Per-host fetch strategy memory: score half-life (s) and decision threshold
+    "FETCH_STRATEGY_HALF_LIFE": float(
+        environ.get("FETCH_STRATEGY_HALF_LIFE", 60 * 60 * 24 * 3)
+    ),
+    "FETCH_STRATEGY_THRESHOLD": float(environ.get("FETCH_STRATEGY_THRESHOLD", 2)),
+    # Seconds before racing Playwright against a slow simple request (0 disables)
+    "FETCH_HEDGE_DELAY": float(environ.get("FETCH_HEDGE_DELAY", 1.5)),
+    # Concurrent Playwright pages per worker (one shared Chromium per worker)
+    "BROWSER_POOL_SIZE": int(environ.get("BROWSER_POOL_SIZE", 4)),
+    # Job posting index: also store an embedding of each posting
+    "JOB_INDEX_EMBEDDINGS": environ.get("JOB_INDEX_EMBEDDINGS", "false").lower()
+    == "true",
+    # "hashing" (local feature hashing) or "openai"
+    "EMBEDDING_BACKEND": environ.get("EMBEDDING_BACKEND", "hashing"),
+    "EMBEDDING_MODEL": environ.get("EMBEDDING_MODEL", "text-embedding-3-small"),
+    "EMBEDDING_DIMENSIONS": int(environ.get("EMBEDDING_DIMENSIONS", 512)),
+    # Resume vector index used by /resumes/top-matches. Off by default: it keeps
+    # an embedding of every uploaded resume
+    "RESUME_INDEX_ENABLED": environ.get("RESUME_INDEX_ENABLED", "false").lower()
+    == "true",
+    # /resumes/top-matches needs X-Admin-Token: RESUME_SEARCH_TOKEN (disabled
+    # without it) and is limited to RESUME_SEARCH_RATE_LIMIT searches per hour
+    "RESUME_SEARCH_TOKEN": environ.get("RESUME_SEARCH_TOKEN"),
+    "RESUME_SEARCH_RATE_LIMIT": int(environ.get("RESUME_SEARCH_RATE_LIMIT", 30)),
+    "RESUME_INDEX_PATH": environ.get("RESUME_INDEX_PATH", "data/resume_index"),
+    # "numpy" (exact brute force) or "hnswlib" (approximate, optional dependency)
+    "RESUME_INDEX_BACKEND": environ.get("RESUME_INDEX_BACKEND", "numpy"),
+    # Upper bound of the condensed resume sent to the LLM
+    "RESUME_MAX_TOKENS": int(environ.get("RESUME_MAX_TOKENS", 2000)),
+    # LLM providers: any OpenAI-compatible endpoint, see llm_providers.py
+    "LLM_PROVIDERS": _json_env("LLM_PROVIDERS", "[]", list),
+    "LLM_BASE_URL": environ.get("LLM_BASE_URL"),
+    "LLM_SCORING_MODEL": environ.get("LLM_SCORING_MODEL", "gpt-3.5-turbo"),
+    "LLM_ANALYSIS_MODEL": environ.get("LLM_ANALYSIS_MODEL", "gpt-4-turbo"),
+    # LLM governor: adaptive concurrency, retries and circuit breaker
+    "LLM_INITIAL_CONCURRENCY": int(environ.get("LLM_INITIAL_CONCURRENCY", 4)),
+    "LLM_MAX_CONCURRENCY": int(environ.get("LLM_MAX_CONCURRENCY", 16)),
+    "LLM_MAX_RETRIES": int(environ.get("LLM_MAX_RETRIES", 3)),
+    "LLM_RETRY_BASE_DELAY": float(environ.get("LLM_RETRY_BASE_DELAY", 0.5)),
+    "LLM_RETRY_MAX_DELAY": float(environ.get("LLM_RETRY_MAX_DELAY", 20)),
+    "LLM_BREAKER_FAILURES": int(environ.get("LLM_BREAKER_FAILURES", 5)),
+    "LLM_BREAKER_RESET": float(environ.get("LLM_BREAKER_RESET", 30)),
+    # Postings no longer accepting applications: "local" (keyword scorer only),
+    # "skip" (no scoring at all) or "llm" (full analysis anyway)
+    "CLOSED_POSITION_SCORING": environ.get("CLOSED_POSITION_SCORING", "local"),
+    # Answer with the local keyword scorer while the circuit is open
+    "LLM_DEGRADE_TO_LOCAL": environ.get("LLM_DEGRADE_TO_LOCAL", "false").lower()
+    == "true",
+    # Health probes: results are reused for HEALTH_CACHE_TTL seconds
+    "HEALTH_CACHE_TTL": float(environ.get("HEALTH_CACHE_TTL", 2)),
+    "HEALTH_REDIS_MAX_LATENCY_MS": float(
+        environ.get("HEALTH_REDIS_MAX_LATENCY_MS", 100)
+    ),
+    # Calls waiting for an LLM slot before the worker reports itself degraded
+    "HEALTH_LLM_MAX_QUEUE": int(environ.get("HEALTH_LLM_MAX_QUEUE", 32)),
+    # Tokens a request may spend on the LLM (0: unlimited). Over budget the
+    # call is not made: reject (413) or downgrade to the local scorer
+    "LLM_REQUEST_TOKEN_BUDGET": int(environ.get("LLM_REQUEST_TOKEN_BUDGET", 0)),
+    "LLM_TOKEN_BUDGET_POLICY": environ.get("LLM_TOKEN_BUDGET_POLICY", "downgrade"),
+    # {"model": [prompt, completion]} price per 1K tokens, for the usage logs
+    "LLM_TOKEN_PRICES": _json_env("LLM_TOKEN_PRICES", "{}", dict),
+    # LLM response cache: off, redis, record (disk) or replay (disk only)
+    "LLM_CACHE_MODE": environ.get("LLM_CACHE_MODE", "redis"),
+    "LLM_CACHE_DIR": environ.get("LLM_CACHE_DIR", "data/llm_cache"),
+    # History of analysis results: SQLite (WAL) file written in batches
+    "RESULT_SINK_ENABLED": environ.get("RESULT_SINK_ENABLED", "true").lower()
+    == "true",
+    "RESULT_STORE_PATH": environ.get("RESULT_STORE_PATH", "data/results.sqlite3"),
+    "RESULT_SINK_BATCH_SIZE": int(environ.get("RESULT_SINK_BATCH_SIZE", 200)),
+    "RESULT_SINK_FLUSH_INTERVAL": float(environ.get("RESULT_SINK_FLUSH_INTERVAL", 2)),
+    # Results waiting to be written; beyond it new results are dropped
+    "RESULT_SINK_MAX_QUEUE": int(environ.get("RESULT_SINK_MAX_QUEUE", 10000)),
+    # Resumes whose MinHash Jaccard to one already scored for the same posting
+    # is at least NEAR_DUPLICATE_THRESHOLD reuse its result instead of the LLM
+    "NEAR_DUPLICATE_ENABLED": environ.get("NEAR_DUPLICATE_ENABLED", "true").lower()
+    == "true",
+    "NEAR_DUPLICATE_THRESHOLD": float(environ.get("NEAR_DUPLICATE_THRESHOLD", 0.9)),
+    # Retries with the same X-Request-ID reuse the first response (Redis);
+    # a retry waits IDEMPOTENCY_WAIT seconds for one running in another worker
+    "IDEMPOTENCY_ENABLED": environ.get("IDEMPOTENCY_ENABLED", "true").lower()
+    == "true",
+    "IDEMPOTENCY_WAIT": float(environ.get("IDEMPOTENCY_WAIT", 60)),
+    "IDEMPOTENCY_MAX_BODY": int(environ.get("IDEMPOTENCY_MAX_BODY", 1024 * 1024)),
+    # On-demand profiling of requests sending X-Profile-Token: PROFILING_TOKEN;
+    # mode sampling (folded stacks, flamegraph) or cprofile (pstats)
+    "PROFILING_ENABLED": environ.get("PROFILING_ENABLED", "false").lower()
+    == "true",
+    "PROFILING_TOKEN": environ.get("PROFILING_TOKEN"),
+    "PROFILING_MODE": environ.get("PROFILING_MODE", "sampling"),
+    "PROFILING_DIR": environ.get("PROFILING_DIR", "data/profiles"),
+    "PROFILING_INTERVAL": float(environ.get("PROFILING_INTERVAL", 0.001)),
+    # Preload the deferred libraries when a worker starts instead of on first
+    # use; gunicorn.conf.py always preloads them in the master
+    "PRELOAD_ON_START": environ.get("PRELOAD_ON_START", "false").lower() == "true",
 }
 
 if env == "production":
@@ -37,5 +164,5 @@ elif env == "test":
         }
     )
 
-if env != "test" and not config["LLM_API_KEY"]:
+if env != "test" and not config["LLM_API_KEY"] and not config["LLM_PROVIDERS"]:
     raise ValueError(f"LLM_API_KEY not found for environment '{env}'")
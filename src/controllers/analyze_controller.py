@@ -1,14 +1,37 @@
+from typing import Optional
+
 from fastapi import UploadFile
 
-from src.services.resume_matcher_service import resume_matcher_service
+from src.services.resume_matcher_service import extract_resume, resume_matcher_service
+from src.utils.job_description_parser import ParseResult
+
+
+async def extract_resume_controller(resume: UploadFile, language: str) -> str:
+    """
+    :param resume: PDF upload
+    :param language:
+    :return: Resume text
+    :raises NotResume: If the document is not a valid resume
+    """
+    return await extract_resume(resume=resume, language=language)
+
 
-async def analyze_controller(resume: UploadFile, job_description: str, language: str):
+async def analyze_controller(
+    resume: UploadFile,
+    job_description: ParseResult,
+    language: str,
+    resume_text: Optional[str] = None,
+):
     """
 
     :param resume:
     :param job_description:
+    :param resume_text: Resume already extracted by extract_resume_controller
     :return:
     """
     return await resume_matcher_service(
-        resume=resume, job_description=job_description, language=language
+        resume=resume,
+        job_description=job_description,
+        language=language,
+        resume_text=resume_text,
     )
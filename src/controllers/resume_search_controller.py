@@ -0,0 +1,13 @@
+from src.services.resume_index_service import search_resumes
+from src.utils.job_index import index_job_description
+
+
+async def top_resumes_controller(job_description: str, k: int):
+    """
+
+    :param job_description: Parsed job description text
+    :param k: Number of resumes to return
+    :return: Indexed resumes that best match the job, best first
+    """
+    job_posting = await index_job_description(job_description)
+    return await search_resumes(job_posting, k)
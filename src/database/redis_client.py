@@ -1,6 +1,8 @@
 import os
-import redis
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import redis
 
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
@@ -10,17 +12,26 @@ REDIS_DB = int(os.getenv('REDIS_DB', 0))
 _redis_client = None
 
 RATE_LIMIT_EXPIRATION = 60 * 60 * 24 * 7  # 7 days
+RESUME_SEARCH_RATE_LIMIT_EXPIRATION = 60 * 60  # 1 hour
 SIMILARITY_CACHE_EXPIRATION = 60 * 60 * 24 * 5  # 5 days
 SESSION_EXPIRATION = 60 * 60 * 24  # 1 day
+FETCH_STRATEGY_EXPIRATION = 60 * 60 * 24 * 30  # 30 days
+JOB_INDEX_EXPIRATION = 60 * 60 * 24 * 30  # 30 days
+LLM_CACHE_EXPIRATION = 60 * 60 * 24 * 7  # 7 days
+NEAR_DUPLICATE_EXPIRATION = 60 * 60 * 24 * 5  # 5 days
+IDEMPOTENCY_EXPIRATION = 60 * 10  # 10 minutes
+IDEMPOTENCY_LOCK_EXPIRATION = 60 * 5  # 5 minutes
 
 
-def get_redis_client() -> redis.Redis:
+def get_redis_client() -> "redis.Redis":
     """
     Retorna uma instância compartilhada do cliente Redis.
     Cria a conexão se ainda não existir.
     """
     global _redis_client
     if _redis_client is None:
+        import redis
+
         _redis_client = redis.Redis(
             host=REDIS_HOST,
             port=REDIS_PORT,
@@ -33,6 +44,17 @@ def get_redis_client() -> redis.Redis:
     return _redis_client
 
 
+def close_redis_client():
+    """
+    Fecha as conexões do pool (shutdown da aplicação).
+    Uma chamada posterior a get_redis_client cria um novo cliente.
+    """
+    global _redis_client
+    if _redis_client is not None:
+        _redis_client.connection_pool.disconnect()
+        _redis_client = None
+
+
 def set_with_expiry(key: str, value: str, expiration: int) -> bool:
     """
     Define um valor no Redis com expiração.
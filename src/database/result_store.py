@@ -0,0 +1,159 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    request_id TEXT,
+    language TEXT,
+    job_hash TEXT,
+    resume_hash TEXT,
+    score REAL,
+    total_missing INTEGER,
+    is_position_closed INTEGER,
+    llm_tokens INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analysis_results_created_at
+    ON analysis_results (created_at);
+CREATE INDEX IF NOT EXISTS analysis_results_job_hash
+    ON analysis_results (job_hash);
+"""
+
+COLUMNS = (
+    "created_at",
+    "request_id",
+    "language",
+    "job_hash",
+    "resume_hash",
+    "score",
+    "total_missing",
+    "is_position_closed",
+    "llm_tokens",
+)
+
+
+class ResultStore:
+    """
+    Append-only SQLite store of analysis results, in WAL mode: readers
+    (reports, other workers) never block the writer and each batch is a
+    single transaction. Every worker process opens its own connection;
+    concurrent writers wait on the database lock up to `busy_timeout`.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 30.0):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Used from the worker thread that flushes and from reporting code
+        self._connection = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints: a crash loses at most the last batches
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+
+    def write_many(self, results: List[Dict]) -> int:
+        """Append the results in one transaction; returns the rows written"""
+        rows = [
+            tuple(result.get(column) for column in COLUMNS)
+            + (json.dumps(result.get("payload", {}), ensure_ascii=False),)
+            for result in results
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT INTO analysis_results ({', '.join(COLUMNS)}, payload) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                rows,
+            )
+        return len(rows)
+
+    def iter_results(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict]:
+        """
+        Results in insertion order, read in batches by primary key so large
+        exports neither hold a read transaction open nor load the table
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT * FROM analysis_results WHERE id > ? "
+                    "AND created_at >= ? AND created_at < ? ORDER BY id LIMIT ?",
+                    (last_id, since or 0, until or float("inf"), batch_size),
+                ).fetchall()
+            for row in rows:
+                result = dict(row)
+                result["payload"] = json.loads(result["payload"])
+                yield result
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def read(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        results = []
+        for result in self.iter_results(since, until):
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(result)
+        return results
+
+    def summary(self, since: Optional[float] = None) -> Dict:
+        """Aggregates for reports, computed by SQLite"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) AS analyses, AVG(score) AS average_score, "
+                "SUM(is_position_closed) AS closed_positions, "
+                "SUM(llm_tokens) AS llm_tokens, "
+                "COUNT(DISTINCT job_hash) AS job_postings "
+                "FROM analysis_results WHERE created_at >= ?",
+                (since or 0,),
+            ).fetchone()
+        return {key: row[key] or 0 for key in row.keys()}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def result_row(
+    result: Dict,
+    language: str,
+    job_hash: Optional[str] = None,
+    resume_hash: Optional[str] = None,
+    request_id: Optional[str] = None,
+    llm_tokens: Optional[int] = None,
+) -> Dict:
+    """Row of an analysis result as returned by resume_matcher_service"""
+    return {
+        "created_at": time.time(),
+        "request_id": request_id,
+        "language": language,
+        "job_hash": job_hash,
+        "resume_hash": resume_hash,
+        "score": result.get("score"),
+        "total_missing": result.get("total_missing"),
+        "is_position_closed": int(bool(result.get("is_position_closed"))),
+        "llm_tokens": llm_tokens,
+        "payload": result,
+    }
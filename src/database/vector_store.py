@@ -0,0 +1,212 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+
+class VectorStore:
+    """
+    Append-only store of L2-normalised vectors with cosine top-K search.
+
+    Vectors live in a float32 memory-mapped file (``vectors.f32``) and their
+    metadata in ``metadata.jsonl``, one line per row. A row only becomes
+    visible once its metadata line is written, so readers never see a half
+    written vector. Appends take an exclusive file lock, and each process
+    picks up rows appended by other workers before searching. A thread lock
+    serialises refresh, add and search within the process (the index is
+    used from asyncio.to_thread).
+
+    Search is a brute-force matrix product by default; with
+    ``backend="hnswlib"`` (and hnswlib installed) an in-memory HNSW graph is
+    built from the file and kept up to date.
+    """
+
+    def __init__(self, directory: str, dimensions: int, backend: str = "numpy"):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.metadata_path = os.path.join(directory, "metadata.jsonl")
+        self.lock_path = os.path.join(directory, ".lock")
+
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._metadata: List[Dict] = []
+        self._ids: Dict[str, int] = {}
+        self._metadata_offset = 0
+        self._ann = None
+        self._thread_lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._check_manifest()
+        if backend == "hnswlib":
+            self._ann = _HnswIndex.create(dimensions)
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._ids
+
+    def _check_manifest(self):
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                stored = json.load(manifest_file)["dimensions"]
+            if stored != self.dimensions:
+                raise ValueError(
+                    f"Vector store at {self.directory} has {stored} dimensions, "
+                    f"expected {self.dimensions}"
+                )
+            return
+        with open(manifest_path, "w") as manifest_file:
+            json.dump({"dimensions": self.dimensions}, manifest_file)
+
+    @contextmanager
+    def _locked(self):
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _map(self, rows: int):
+        """Map the vectors file, growing it to at least the given rows"""
+        capacity = max(INITIAL_CAPACITY, self._capacity)
+        while capacity < rows:
+            capacity *= 2
+
+        size = capacity * self.dimensions * 4
+        if not os.path.exists(self.vectors_path) or os.path.getsize(
+            self.vectors_path
+        ) < size:
+            with open(self.vectors_path, "ab") as vectors_file:
+                vectors_file.truncate(size)
+        else:
+            capacity = os.path.getsize(self.vectors_path) // (self.dimensions * 4)
+
+        if self._matrix is None or capacity != self._capacity:
+            self._matrix = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r+",
+                shape=(capacity, self.dimensions),
+            )
+            self._capacity = capacity
+
+    def refresh(self):
+        """Load rows appended since the last call, by this or other processes"""
+        with self._thread_lock:
+            self._load_new_rows()
+
+    def _load_new_rows(self):
+        if not os.path.exists(self.metadata_path):
+            self._map(0)
+            return
+
+        with open(self.metadata_path) as metadata_file:
+            metadata_file.seek(self._metadata_offset)
+            new_rows = []
+            for line in iter(metadata_file.readline, ""):
+                if not line.endswith("\n"):
+                    break
+                new_rows.append(json.loads(line))
+                self._metadata_offset = metadata_file.tell()
+
+        if not new_rows:
+            if self._matrix is None:
+                self._map(0)
+            return
+
+        first_row = len(self._metadata)
+        self._map(first_row + len(new_rows))
+        for row, metadata in enumerate(new_rows, start=first_row):
+            self._metadata.append(metadata)
+            self._ids[metadata["id"]] = row
+
+        if self._ann is not None:
+            self._ann.add(self._matrix[first_row : len(self._metadata)], first_row)
+
+    def add(self, item_id: str, vector: np.ndarray, metadata: Dict) -> bool:
+        """
+        Append a vector. Returns False when the id is already stored.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            raise ValueError(f"Expected a vector of {self.dimensions} dimensions")
+
+        with self._thread_lock, self._locked():
+            self._load_new_rows()
+            if item_id in self._ids:
+                return False
+
+            row = len(self._metadata)
+            self._map(row + 1)
+            self._matrix[row] = vector
+            self._matrix.flush()
+
+            with open(self.metadata_path, "a") as metadata_file:
+                metadata_file.write(json.dumps({**metadata, "id": item_id}) + "\n")
+
+            self._load_new_rows()
+        return True
+
+    def search(self, vector: np.ndarray, k: int = 10) -> List[Tuple[Dict, float]]:
+        """Top-k rows by cosine similarity, best first"""
+        with self._thread_lock:
+            self._load_new_rows()
+            count = len(self._metadata)
+            if count == 0 or k <= 0:
+                return []
+
+            query = np.asarray(vector, dtype=np.float32)
+            k = min(k, count)
+
+            if self._ann is not None:
+                rows, scores = self._ann.query(query, k)
+            else:
+                similarities = self._matrix[:count] @ query
+                rows = np.argpartition(-similarities, k - 1)[:k]
+                rows = rows[np.argsort(-similarities[rows])]
+                scores = similarities[rows]
+
+            return [
+                (self._metadata[int(row)], round(float(score), 4))
+                for row, score in zip(rows, scores)
+            ]
+
+
+class _HnswIndex:
+    """Optional approximate index, rebuilt in memory from the vectors file"""
+
+    def __init__(self, index):
+        self.index = index
+
+    @classmethod
+    def create(cls, dimensions: int):
+        import hnswlib
+
+        index = hnswlib.Index(space="ip", dim=dimensions)
+        index.init_index(max_elements=INITIAL_CAPACITY, ef_construction=200, M=16)
+        index.set_ef(64)
+        return cls(index)
+
+    def add(self, vectors: np.ndarray, first_row: int):
+        needed = first_row + len(vectors)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, self.index.get_max_elements() * 2))
+        self.index.add_items(
+            np.asarray(vectors), np.arange(first_row, needed, dtype=np.int64)
+        )
+
+    def query(self, vector: np.ndarray, k: int):
+        labels, distances = self.index.knn_query(vector, k=k)
+        # inner product space returns 1 - similarity
+        return labels[0], 1.0 - distances[0]
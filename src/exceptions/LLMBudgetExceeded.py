@@ -0,0 +1,14 @@
+class LLMBudgetExceeded(Exception):
+    def __init__(self, language: str = "en", message=None, tokens: int = 0, budget: int = 0):
+        if message is None:
+            if language.lower() in ['pt-br', 'pt', 'portuguese']:
+                self.message = "Currículo e vaga excedem o tamanho máximo de análise"
+            else:
+                self.message = "Resume and job description exceed the maximum analysis size"
+        else:
+            self.message = message
+
+        self.language = language
+        self.tokens = tokens
+        self.budget = budget
+        super().__init__(self.message)
@@ -0,0 +1,13 @@
+class LLMUnavailable(Exception):
+    def __init__(self, language: str = "en", message=None, retry_after: float = 0):
+        if message is None:
+            if language.lower() in ['pt-br', 'pt', 'portuguese']:
+                self.message = "Serviço de análise temporariamente indisponível, tente novamente em instantes"
+            else:
+                self.message = "Analysis service temporarily unavailable, please try again shortly"
+        else:
+            self.message = message
+
+        self.language = language
+        self.retry_after = retry_after
+        super().__init__(self.message)
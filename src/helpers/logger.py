@@ -1,12 +1,19 @@
 import logging
+import os
 import sys
 import json
-import newrelic.agent
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, WatchedFileHandler
 from contextvars import ContextVar
 
 request_id_context = ContextVar("request_id", default="")
 
+# "size": rotated by this process (a single one); "external": several worker
+# processes append to the same file and logrotate rotates it (the handler
+# reopens it once moved); "none": stdout only
+ROTATION_SIZE = "size"
+ROTATION_EXTERNAL = "external"
+ROTATION_NONE = "none"
+
 
 class RequestIdFilter(logging.Filter):
     def filter(self, record):
@@ -15,7 +22,9 @@ class RequestIdFilter(logging.Filter):
 
 
 class Logger:
-    def __init__(self, log_file: str = "app.log"):
+    def __init__(self, log_file: str = None, rotation: str = None):
+        log_file = log_file or os.getenv("LOG_FILE", "app.log")
+        rotation = rotation or os.getenv("LOG_FILE_ROTATION", ROTATION_SIZE)
         log_format = "%(asctime)s - %(levelname)s - [%(request_id)s] - %(message)s"
 
         self.logger = logging.getLogger("AppLogger")
@@ -28,12 +37,24 @@ class Logger:
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(logging.Formatter(log_format))
 
-        file_handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=3)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(logging.Formatter(log_format))
-
         self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+
+        # delay: the file is opened on the first record, not at import time
+        if rotation == ROTATION_SIZE:
+            # Rotation is not safe across processes: single process only
+            file_handler = RotatingFileHandler(
+                log_file, maxBytes=1_000_000, backupCount=3, delay=True
+            )
+        elif rotation == ROTATION_EXTERNAL:
+            file_handler = WatchedFileHandler(log_file, delay=True)
+        else:
+            file_handler = None
+        if file_handler is not None:
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(logging.Formatter(log_format))
+            self.logger.addHandler(file_handler)
+
+        self._newrelic_task = None
 
     def send_log(self, message):
         """Logs an informational message"""
@@ -70,9 +91,21 @@ class Logger:
         self.logger.critical(message)
         self._send_to_newrelic('critical', message)
 
-    @newrelic.agent.background_task(name='send_log_to_newrelic')
     def _send_to_newrelic(self, level, message):
-        """Send logs to New Relic as log events"""
+        """Send logs to New Relic as log events (agent imported on first use)"""
+        if not os.getenv("NEW_RELIC_LICENSE_KEY"):
+            return
+        if self._newrelic_task is None:
+            import newrelic.agent
+
+            self._newrelic_task = newrelic.agent.background_task(
+                name='send_log_to_newrelic'
+            )(self._record_newrelic_log)
+        self._newrelic_task(level, message)
+
+    def _record_newrelic_log(self, level, message):
+        import newrelic.agent
+
         try:
             request_id = request_id_context.get()
 
@@ -0,0 +1,47 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+_lock = threading.Lock()
+_counters: Dict[str, Number] = defaultdict(int)
+_gauges: Dict[str, Number] = {}
+
+
+def _send_to_newrelic(name: str, value: Number):
+    """Forward the metric to New Relic as Custom/<name> when the agent is on"""
+    if not os.getenv("NEW_RELIC_LICENSE_KEY"):
+        return
+    try:
+        import newrelic.agent
+
+        newrelic.agent.record_custom_metric(f"Custom/{name}", value)
+    except Exception:
+        pass
+
+
+def increment(name: str, value: Number = 1):
+    """Add to a monotonically increasing counter"""
+    with _lock:
+        _counters[name] += value
+    _send_to_newrelic(name, value)
+
+
+def set_gauge(name: str, value: Number):
+    """Record the current value of a gauge (queue depth, limits, ...)"""
+    with _lock:
+        _gauges[name] = value
+    _send_to_newrelic(name, value)
+
+
+def snapshot() -> Dict[str, Dict[str, Number]]:
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
@@ -0,0 +1,48 @@
+import importlib
+
+from src.config import config
+from src.helpers.logger import logger
+
+# Imported on first use to keep cold starts short (see tests/test_import_time.py);
+# under gunicorn the master imports them once for every worker
+DEFERRED_MODULES = (
+    "aiohttp",
+    "langchain_core.messages",
+    "langchain_openai",
+    "numpy",
+    "playwright.async_api",
+    "redis",
+)
+
+# Set once preloaded: workers forked by the gunicorn master inherit it
+_preloaded = False
+
+
+def preload_state():
+    """
+    Build the read-only state every worker would otherwise build on its
+    first request: compiled selectors, tiktoken ranks, the PDF backend
+    module and the libraries deferred at import time. Run in the gunicorn
+    master before forking, the workers share these pages copy-on-write.
+    No-op once done in this process (or in the master it was forked from).
+    """
+    global _preloaded
+    if _preloaded:
+        return
+
+    from src.services.pdf_reader_service import _BACKEND_MODULES, resolve_backend
+    from src.utils.html_extractor import compile_selectors
+    from src.utils.job_description_parser import JobDescriptionParser
+    from src.utils.text_features import count_tokens
+
+    compile_selectors(tuple(JobDescriptionParser().content_selectors))
+    for model in {config["LLM_SCORING_MODEL"], config["LLM_ANALYSIS_MODEL"]}:
+        count_tokens("preload", model)
+
+    backend = resolve_backend(config["PDF_BACKEND"])
+    # PyPDF2 is also the fallback of every other backend
+    for module in {_BACKEND_MODULES[backend], "PyPDF2", *DEFERRED_MODULES}:
+        importlib.import_module(module)
+
+    _preloaded = True
+    logger.send_log(f"State preloaded (PDF backend: {backend})")
@@ -3,105 +3,63 @@ import os
 
 load_dotenv()
 
-import newrelic.agent
 if os.getenv("NEW_RELIC_LICENSE_KEY"):
+    # Only imported when enabled, the agent adds ~200ms to every cold start
+    import newrelic.agent
     print("New Relic is enabled")
     newrelic.agent.initialize('newrelic.ini')
 
-import uvicorn
-import uuid
-import time
-from datetime import datetime
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from src.helpers.logger import logger, request_id_context
-from src.exceptions.NotResume import NotResume
-
-from src.routes import analyze_route
-from src.database.redis_client import get_redis_client, RATE_LIMIT_EXPIRATION
-
-app = FastAPI(title="Backend Intelligent Resumer")
-
-redis_client = get_redis_client()
-RATE_LIMIT = 5
-
-
-@app.middleware('http')
-async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    
-    if request.url.path.startswith('/analyze'):
-        redis_key = f'rate_limit:{client_ip}'
-        
-        if not redis_client.exists(redis_key):
-            
-            pipe = redis_client.pipeline()
-            pipe.lpush(redis_key, time.time())
-            pipe.expire(redis_key, RATE_LIMIT_EXPIRATION)
-            pipe.execute()
-        else:
-            count = redis_client.llen(redis_key)
-            
-            if count >= RATE_LIMIT:
-                ttl = redis_client.ttl(redis_key)
-                days = int(ttl / (60 * 60 * 24))
-                hours = int((ttl % (60 * 60 * 24)) / (60 * 60))
-                
-                error_response = {
-                    "status": "error",
-                    "message": f"Rate limit exceeded. Try again in {days} days and {hours} hours.",
-                    "error": True,
-                    "exception_id": str(uuid.uuid4()),
-                    "x_request_id": request.headers.get('X-Request-ID', str(uuid.uuid4()))
-                }
-                return JSONResponse(content=error_response, status_code=429)
-        
-        await redis_client.lpush(redis_key, time.time())
-    
-    return await call_next(request)
-
-
-@app.middleware('http')
-async def catch_exception_middleware(request: Request, call_next):
-    request_id = request.headers.get('X-Request-ID', str(uuid.uuid4()))
-    token = request_id_context.set(request_id)
-
-    try:
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
-    except NotResume as exception:
-        error_response = {
-            "status": "error",
-            "message": exception.message,
-            "error": True,
-            "exception_id": str(uuid.uuid4()),
-            "x_request_id": request_id
-        }
-        return JSONResponse(content=error_response, status_code=400)
-    except Exception as exception:
-        error_response = {
-            "status": "error",
-            "message": str(exception),
-            "error": True,
-            "exception_id": str(uuid.uuid4()),
-            "x_request_id": request_id
-        }
-
-        logger.send_error({
-            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "type": type(exception).__name__,
-            "message": str(exception),
-            "exception_id": error_response["exception_id"],
-            "x_request_id": request_id,
-        })
-
-        return JSONResponse(content=error_response, status_code=500)
-    finally:
-        request_id_context.reset(token)
 
+from src.config import config
+from src.database.redis_client import RESUME_SEARCH_RATE_LIMIT_EXPIRATION
+from src.middlewares.exception_middleware import CatchExceptionMiddleware
+from src.middlewares.rate_limit_middleware import RateLimitMiddleware
+from src.routes import analyze_route, health_route, resume_search_route
+from src.resources import get_resources
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-worker startup and shutdown. Shutdown runs after the server has
+    drained the in-flight requests (graceful_timeout / timeout_graceful_shutdown).
+    """
+    resources = get_resources()
+    await resources.start()
+    app.state.resources = resources
+
+    yield
+
+    await resources.close()
+
+
+app = FastAPI(title="Backend Intelligent Resumer", lifespan=lifespan)
+
+# Added last = outermost: errors of the rate limiter get the envelope too
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(
+    RateLimitMiddleware,
+    path_prefix="/resumes",
+    limit=config["RESUME_SEARCH_RATE_LIMIT"],
+    expiration=RESUME_SEARCH_RATE_LIMIT_EXPIRATION,
+    key_prefix="rate_limit_resume_search",
+)
+if config["PROFILING_ENABLED"] and config["PROFILING_TOKEN"]:
+    # Inside CatchExceptionMiddleware, which sets the X-Request-ID; not even
+    # in the stack unless enabled
+    from src.middlewares.profiling_middleware import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CatchExceptionMiddleware)
+if config["IDEMPOTENCY_ENABLED"]:
+    # Outside the rate limiter (a replay is not counted) and the exception
+    # envelope (NotResume answers are replayed too)
+    from src.middlewares.idempotency_middleware import IdempotencyMiddleware
+
+    app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -111,6 +69,22 @@ app.add_middleware(
 )
 
 app.include_router(analyze_route.router, prefix="/analyze")
+app.include_router(resume_search_route.router, prefix="/resumes")
+app.include_router(health_route.router, prefix="/health")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8009)
+    import uvicorn
+
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        # Inherited by the spawned workers, which share the log file
+        os.environ.setdefault("LOG_FILE_ROTATION", "external")
+    # With several workers uvicorn needs the import string to spawn them;
+    # gunicorn.conf.py is the preferred multi-worker mode (preload + fork)
+    uvicorn.run(
+        "src.main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8009,
+        workers=workers,
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+    )
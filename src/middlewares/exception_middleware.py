@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.exceptions.LLMBudgetExceeded import LLMBudgetExceeded
+from src.exceptions.LLMUnavailable import LLMUnavailable
+from src.exceptions.NotResume import NotResume
+from src.helpers.logger import logger, request_id_context
+from src.services.llm_usage import finish_request_usage, start_request_usage
+
+
+def error_response(
+    message: str,
+    request_id: str,
+    status_code: int,
+    headers: Optional[Dict[str, str]] = None,
+    exception_id: Optional[str] = None,
+) -> JSONResponse:
+    """Error envelope shared by every middleware"""
+    return JSONResponse(
+        content={
+            "status": "error",
+            "message": message,
+            "error": True,
+            "exception_id": exception_id or str(uuid.uuid4()),
+            "x_request_id": request_id,
+        },
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+class CatchExceptionMiddleware:
+    """
+    Sets the request context (X-Request-ID header or a new UUID, LLM usage),
+    echoes the ID in the response headers and turns exceptions into the error
+    envelope.
+    Pure ASGI: no extra task or body stream per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("X-Request-ID") or str(uuid.uuid4())
+        token = request_id_context.set(request_id)
+        usage_token = start_request_usage()
+        response_started = False
+
+        async def send_with_request_id(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as exception:
+            if response_started:
+                # Too late for an error response, let the server close it
+                raise
+            response = self._handle(exception, request_id)
+            await response(scope, receive, send)
+        finally:
+            finish_request_usage(usage_token)
+            request_id_context.reset(token)
+
+    def _handle(self, exception: Exception, request_id: str) -> JSONResponse:
+        if isinstance(exception, NotResume):
+            return error_response(exception.message, request_id, 400)
+
+        if isinstance(exception, LLMBudgetExceeded):
+            return error_response(exception.message, request_id, 413)
+
+        if isinstance(exception, LLMUnavailable):
+            return error_response(
+                exception.message,
+                request_id,
+                503,
+                headers={"Retry-After": str(max(1, int(exception.retry_after)))},
+            )
+
+        exception_id = str(uuid.uuid4())
+        logger.send_error({
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "type": type(exception).__name__,
+            "message": str(exception),
+            "exception_id": exception_id,
+            "x_request_id": request_id,
+        })
+        return error_response(
+            str(exception), request_id, 500, exception_id=exception_id
+        )
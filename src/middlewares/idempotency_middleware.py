@@ -0,0 +1,306 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders, UploadFile
+from starlette.formparsers import MultiPartParser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import config
+from src.database.redis_client import (
+    IDEMPOTENCY_EXPIRATION,
+    IDEMPOTENCY_LOCK_EXPIRATION,
+    get_redis_client,
+)
+from src.helpers import metrics
+from src.helpers.logger import logger
+from src.middlewares.exception_middleware import error_response
+
+REPLAY_HEADER = "X-Idempotent-Replay"
+PENDING = "pending"
+MAX_REQUEST_ID_LENGTH = 128
+POLL_INTERVAL = 0.25
+CONFLICT_RETRY_AFTER = 5
+
+
+def is_storable(status: int) -> bool:
+    """Final answers only: a retry after a 5xx or a 429 must run again"""
+    return status < 500 and status != 429
+
+
+def encode_response(messages: List[Message], fingerprint: str) -> str:
+    start = messages[0]
+    return json.dumps(
+        {
+            "fingerprint": fingerprint,
+            "status": start["status"],
+            "headers": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in start.get("headers", [])
+            ],
+            "body": base64.b64encode(
+                b"".join(m.get("body", b"") for m in messages[1:])
+            ).decode("ascii"),
+        }
+    )
+
+
+def decode_response(value: str) -> Tuple[Optional[str], List[Message]]:
+    """Fingerprint of the request that produced the response, and the response"""
+    stored = json.loads(value)
+    return stored.get("fingerprint"), [
+        {
+            "type": "http.response.start",
+            "status": stored["status"],
+            "headers": [
+                [name.encode("latin-1"), value.encode("latin-1")]
+                for name, value in stored["headers"]
+            ],
+        },
+        {"type": "http.response.body", "body": base64.b64decode(stored["body"])},
+    ]
+
+
+def pending_marker(fingerprint: str) -> str:
+    return f"{PENDING}:{fingerprint}"
+
+
+def pending_fingerprint(value: str) -> Optional[str]:
+    """Fingerprint of the request in flight, None for a bare PENDING marker"""
+    _, _, fingerprint = value.partition(":")
+    return fingerprint or None
+
+
+async def content_digest(headers: Headers, body: bytes) -> bytes:
+    """
+    Digest of what the request sends: for a multipart form its fields and a
+    digest of each uploaded file, the random boundary left out, so the retry
+    of the same form matches; the raw body otherwise
+    """
+    if not headers.get("content-type", "").startswith("multipart/form-data"):
+        return hashlib.sha256(body).digest()
+
+    async def stream():
+        yield body
+
+    try:
+        form = await MultiPartParser(headers, stream()).parse()
+    except Exception:
+        # Malformed form: the app answers it, a retry gets the same answer
+        return hashlib.sha256(body).digest()
+    digest = hashlib.sha256()
+    try:
+        for name, value in form.multi_items():
+            if isinstance(value, UploadFile):
+                content = hashlib.sha256(await value.read()).hexdigest()
+                part = f"{name}\0file\0{value.filename}\0{content}"
+            else:
+                part = f"{name}\0field\0{value}"
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part.encode())
+    finally:
+        await form.close()
+    return digest.digest()
+
+
+async def request_fingerprint(scope: Scope, body: bytes) -> str:
+    """Client IP, query string and content: a reused X-Request-ID is told apart"""
+    client = scope.get("client")
+    digest = hashlib.sha256()
+    for part in (
+        (client[0] if client else "").encode(),
+        scope.get("query_string", b""),
+        await content_digest(Headers(scope=scope), body),
+    ):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+async def read_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """
+    Whole request body, and a receive that hands it to the app again and
+    then delegates to the original one (disconnect)
+    """
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Disconnected before the end of the body: pass it on
+            return b"".join(chunks), _replay_receive(message, receive)
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    return body, _replay_receive(
+        {"type": "http.request", "body": body, "more_body": False}, receive
+    )
+
+
+def _replay_receive(first: Message, receive: Receive) -> Receive:
+    pending = [first]
+
+    async def replay() -> Message:
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return replay
+
+
+class IdempotencyMiddleware:
+    """
+    Retries of an analysis with the same X-Request-ID do not run it again:
+    while the first request is in flight they attach to it (same worker) or
+    wait for its result in Redis (other workers); once it finished they get
+    the stored response for IDEMPOTENCY_EXPIRATION. Outside the rate limiter,
+    so a replay is not counted twice. Requests without the header, and
+    responses that are not final (5xx, 429) or too large, are not stored.
+    Entries are bound to the request fingerprint (client IP, query string,
+    form fields and uploaded files): the same X-Request-ID on a different
+    request is answered 422.
+    Pure ASGI middleware; Redis errors fall back to running the request.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/analyze"):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_body = config["IDEMPOTENCY_MAX_BODY"]
+        self.wait = config["IDEMPOTENCY_WAIT"]
+        # Requests in flight in this worker: key -> (fingerprint, captured response)
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    def _key(self, scope: Scope) -> Optional[str]:
+        request_id = Headers(scope=scope).get("X-Request-ID")
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            return None
+        return f"idempotency:{scope['method']}:{scope['path']}:{request_id}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        key = None
+        if scope["type"] == "http" and scope["path"].startswith(self.path_prefix):
+            key = self._key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        body, receive = await read_body(receive)
+        fingerprint = await request_fingerprint(scope, body)
+        deadline = time.monotonic() + self.wait
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                if in_flight[0] != fingerprint:
+                    await self._mismatch(scope, receive, send)
+                    return
+                messages = await asyncio.shield(in_flight[1])
+                if messages is not None:
+                    metrics.increment("Idempotency/Attached")
+                    await self._replay(messages, send)
+                    return
+                continue  # first one failed: run it (or attach to the next)
+
+            try:
+                redis_client = get_redis_client()
+                claimed = redis_client.set(
+                    key,
+                    pending_marker(fingerprint),
+                    nx=True,
+                    ex=IDEMPOTENCY_LOCK_EXPIRATION,
+                )
+                stored = None if claimed else redis_client.get(key)
+            except Exception as e:
+                logger.send_warning(f"Idempotency disabled for this request: {e}")
+                await self.app(scope, receive, send)
+                return
+
+            if claimed:
+                await self._run(key, fingerprint, scope, receive, send)
+                return
+            if stored is None:
+                continue  # expired or released meanwhile: claim it again
+            if stored.startswith(PENDING):
+                stored_fingerprint, messages = pending_fingerprint(stored), None
+            else:
+                stored_fingerprint, messages = decode_response(stored)
+            if stored_fingerprint is not None and stored_fingerprint != fingerprint:
+                await self._mismatch(scope, receive, send)
+                return
+            if messages is not None:
+                metrics.increment("Idempotency/Replayed")
+                await self._replay(messages, send)
+                return
+            if time.monotonic() >= deadline:
+                # In flight in another worker for longer than a retry waits
+                response = error_response(
+                    "A request with this X-Request-ID is still being processed.",
+                    Headers(scope=scope)["X-Request-ID"],
+                    409,
+                    headers={"Retry-After": str(CONFLICT_RETRY_AFTER)},
+                )
+                await response(scope, receive, send)
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def _mismatch(self, scope: Scope, receive: Receive, send: Send):
+        metrics.increment("Idempotency/Mismatch")
+        response = error_response(
+            "This X-Request-ID was already used for a different request.",
+            Headers(scope=scope)["X-Request-ID"],
+            422,
+        )
+        await response(scope, receive, send)
+
+    async def _run(
+        self, key: str, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ):
+        """Run the request, streaming it to the client while capturing it"""
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        messages: List[Message] = []
+        size = 0
+
+        async def send_and_capture(message: Message):
+            nonlocal messages, size
+            if messages is not None:
+                if message["type"] == "http.response.start":
+                    messages.append(message)
+                elif message["type"] == "http.response.body":
+                    size += len(message.get("body", b""))
+                    messages.append(message)
+                if size > self.max_body:
+                    messages = None
+            await send(message)
+
+        captured = None
+        try:
+            await self.app(scope, receive, send_and_capture)
+            if messages and is_storable(messages[0]["status"]):
+                captured = messages
+        finally:
+            del self._in_flight[key]
+            future.set_result(captured)
+            self._store(key, fingerprint, captured)
+
+    def _store(self, key: str, fingerprint: str, messages: Optional[List[Message]]):
+        try:
+            redis_client = get_redis_client()
+            if messages is None:
+                redis_client.delete(key)  # a retry runs it again
+            else:
+                redis_client.setex(
+                    key, IDEMPOTENCY_EXPIRATION, encode_response(messages, fingerprint)
+                )
+        except Exception as e:
+            logger.send_warning(f"Failed to store the idempotent response: {e}")
+
+    async def _replay(self, messages: List[Message], send: Send):
+        start, body = messages[0], messages[1:]
+        start = {**start, "headers": list(start.get("headers", []))}
+        MutableHeaders(scope=start)[REPLAY_HEADER] = "true"
+        await send(start)
+        for message in body:
+            await send(message)
@@ -0,0 +1,171 @@
+import asyncio
+import cProfile
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import config
+from src.helpers.logger import logger, request_id_context
+
+PROFILE_HEADER = "X-Profile-Token"
+MODE_SAMPLING = "sampling"
+MODE_CPROFILE = "cprofile"
+
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _frame_label(code) -> str:
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _is_idle_pool_worker(frame) -> bool:
+    """Thread pool worker waiting on its queue: no work to attribute"""
+    return frame.f_code.co_name == "wait" and any(
+        f.f_code.co_name == "_worker" and f.f_code.co_filename.endswith("thread.py")
+        for f in _walk(frame)
+    )
+
+
+def _walk(frame):
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+class StackSampler:
+    """
+    Wall-clock stack sampler (pyinstrument style): a thread snapshots the
+    stacks of the other threads every `interval` seconds and counts them as
+    folded stacks, the input format of flamegraph.pl and speedscope.
+    Time the event loop spends in select() is time spent awaiting I/O.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle_pool_worker(frame):
+                    continue
+                labels = [_frame_label(f.f_code) for f in _walk(frame)]
+                labels.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class CProfiler:
+    """
+    Deterministic profile of the event loop thread, pstats format (.prof):
+    every coroutine the loop runs meanwhile, not only the profiled request
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path: str):
+        self.profile.dump_stats(path)
+
+
+PROFILERS = {
+    MODE_SAMPLING: (lambda: StackSampler(config["PROFILING_INTERVAL"]), "folded"),
+    MODE_CPROFILE: (CProfiler, "prof"),
+}
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests carrying PROFILE_HEADER with the configured token
+    and writes the profile to PROFILING_DIR/<X-Request-ID>-<timestamp>.<ext>
+    (named in the X-Profile response header). Only added to the app when
+    PROFILING_ENABLED is set: without it there is nothing in the request path.
+    The profile is process-wide: it covers the worker for the duration of
+    the request, including the requests served concurrently by the same
+    event loop (cprofile) or any thread (sampling); profile an idle worker
+    for a clean one. One profile runs at a time, a profiling request
+    arriving meanwhile runs unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.token = config["PROFILING_TOKEN"] or ""
+        self.mode = config["PROFILING_MODE"]
+        if self.mode not in PROFILERS:
+            raise ValueError(
+                f"Unknown profiling mode '{self.mode}', "
+                f"available: {', '.join(PROFILERS)}"
+            )
+        self.directory = config["PROFILING_DIR"]
+        self._busy = False
+
+    def _requested(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        return bool(token and self.token) and hmac.compare_digest(token, self.token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self._busy or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_context.get() or str(time.time_ns())
+        create_profiler, extension = PROFILERS[self.mode]
+        # The request ID is chosen by the client: the timestamp keeps a reused
+        # one from overwriting an earlier profile
+        safe_id = UNSAFE_FILENAME_CHARS.sub("_", request_id)
+        filename = f"{safe_id}-{time.time_ns()}.{extension}"
+
+        async def send_with_profile(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile"] = filename
+            await send(message)
+
+        profiler = create_profiler()
+        self._busy = True
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.stop()
+            self._busy = False
+            elapsed = time.perf_counter() - start
+            await asyncio.to_thread(self._dump, profiler, filename)
+            logger.send_log(
+                f"Request profiled in {elapsed:.3f}s: {self.directory}/{filename}"
+            )
+
+    def _dump(self, profiler, filename: str):
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump(os.path.join(self.directory, filename))
@@ -0,0 +1,71 @@
+import time
+import uuid
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.database.redis_client import RATE_LIMIT_EXPIRATION, get_redis_client
+from src.helpers.logger import request_id_context
+from src.middlewares.exception_middleware import error_response
+
+RATE_LIMIT = 5
+
+
+class RateLimitMiddleware:
+    """
+    At most `limit` requests under `path_prefix` per client IP within
+    `expiration` seconds, counted from the first one (by default RATE_LIMIT
+    analyses within RATE_LIMIT_EXPIRATION). Each prefix needs its own
+    `key_prefix`. Pure ASGI middleware.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str = "/analyze",
+        limit: int = RATE_LIMIT,
+        expiration: int = RATE_LIMIT_EXPIRATION,
+        key_prefix: str = "rate_limit",
+    ):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.limit = limit
+        self.expiration = expiration
+        self.key_prefix = key_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        redis_client = get_redis_client()
+        redis_key = f"{self.key_prefix}:{client[0] if client else None}"
+
+        if not redis_client.exists(redis_key):
+            pipe = redis_client.pipeline()
+            pipe.lpush(redis_key, time.time())
+            pipe.expire(redis_key, self.expiration)
+            pipe.execute()
+        else:
+            count = redis_client.llen(redis_key)
+
+            if count >= self.limit:
+                ttl = redis_client.ttl(redis_key)
+                days = int(ttl / (60 * 60 * 24))
+                hours = int((ttl % (60 * 60 * 24)) / (60 * 60))
+                if days or hours:
+                    wait = f"{days} days and {hours} hours"
+                else:
+                    wait = f"{max(1, int(ttl / 60))} minutes"
+
+                response = error_response(
+                    f"Rate limit exceeded. Try again in {wait}.",
+                    request_id_context.get() or str(uuid.uuid4()),
+                    429,
+                )
+                await response(scope, receive, send)
+                return
+
+            redis_client.lpush(redis_key, time.time())
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from typing import Optional
+
+from src.config import config
+from src.database.redis_client import close_redis_client, get_redis_client
+from src.helpers.logger import logger
+from src.services.health_service import HealthMonitor
+from src.services.llm_cache import LLMResponseCache, get_llm_cache
+from src.services.llm_governor import LLMGovernor, get_llm_governor
+from src.services.llm_providers import LLMRouter, get_llm_router
+from src.services.pdf_reader_service import resolve_backend
+from src.services.result_sink import ResultSink, create_result_sink
+from src.utils.job_description_parser import JobDescriptionParser
+
+
+class Resources:
+    """
+    Shared resources of a worker process: Redis pool, job parser (HTTP
+    session and browser pool), the LLM router, governor and cache and the
+    analysis result sink.
+    Opened by the app lifespan before traffic is accepted, closed after the
+    in-flight requests have drained.
+    """
+
+    def __init__(self, parser: Optional[JobDescriptionParser] = None):
+        self.parser = parser or JobDescriptionParser()
+        self.llm_router: Optional[LLMRouter] = None
+        self.llm_governor: Optional[LLMGovernor] = None
+        self.llm_cache: Optional[LLMResponseCache] = None
+        self.result_sink: Optional[ResultSink] = None
+        self.started = False
+        self.started_at: Optional[float] = None
+        self.health = HealthMonitor(self)
+
+    async def start(self):
+        # Fails fast on an unknown PDF_BACKEND instead of answering 500 to uploads
+        resolve_backend()
+
+        if config["PRELOAD_ON_START"]:
+            from src.helpers.preload import preload_state
+
+            # No-op when the gunicorn master already preloaded before forking
+            await asyncio.to_thread(preload_state)
+
+        try:
+            await asyncio.to_thread(get_redis_client().ping)
+        except Exception as e:
+            logger.send_warning(f"Redis unavailable at startup: {e}")
+
+        await self.parser.start()
+
+        # Built inside the worker's event loop (the governor queues futures)
+        self.llm_router = get_llm_router()
+        self.llm_governor = get_llm_governor()
+        self.llm_cache = get_llm_cache()
+
+        try:
+            self.result_sink = await asyncio.to_thread(create_result_sink)
+        except Exception as e:
+            logger.send_warning(f"Result store unavailable, history disabled: {e}")
+        if self.result_sink is not None:
+            self.result_sink.start()
+
+        self.started = True
+        self.started_at = time.time()
+        logger.send_log("Resources started")
+
+    async def close(self):
+        self.started = False
+        self.health.invalidate()
+        try:
+            try:
+                await self.parser.close()
+            finally:
+                # The queued results are written even if the parser fails to close
+                if self.result_sink is not None:
+                    await self.result_sink.close()
+        finally:
+            close_redis_client()
+        logger.send_log("Resources closed")
+
+
+_resources: Optional[Resources] = None
+
+
+def get_resources() -> Resources:
+    """Resources of this process; the lifespan starts them, scripts may not"""
+    global _resources
+    if _resources is None:
+        _resources = Resources()
+    return _resources
@@ -1,7 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, Form, UploadFile
 from fastapi.responses import JSONResponse
 
-from src.controllers.analyze_controller import analyze_controller
+from src.controllers.analyze_controller import (
+    analyze_controller,
+    extract_resume_controller,
+)
 from src.utils.job_description_parser import parse_job_description
 from src.helpers.logger import logger
 
@@ -15,13 +20,36 @@ async def analyze_resume(
     if resume.content_type != "application/pdf":
         return JSONResponse({"error": "Only PDF are accepted!"}, status_code=400)
 
-    parsed_job_description = await parse_job_description(job_description)
+    # Independentes: a extração do PDF roda enquanto a vaga é buscada
+    resume_task = asyncio.create_task(
+        extract_resume_controller(resume=resume, language=language)
+    )
+    job_task = asyncio.create_task(parse_job_description(job_description))
+    try:
+        resume_text = await resume_task
+        parsed_job_description = await job_task
+    finally:
+        # NotResume (ou cliente desconectado): não espera pelo navegador
+        pending = [task for task in (resume_task, job_task) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
     if parsed_job_description is None:
         return JSONResponse(
             {"error": "Failed to parse job description"}, status_code=400
         )
 
-    logger.send_log(f"parsed job description {parsed_job_description}")
+    logger.send_log(
+        f"parsed job description ({parsed_job_description.method}, "
+        f"closed: {parsed_job_description.is_position_closed}) "
+        f"{parsed_job_description.content}"
+    )
 
     return JSONResponse({"error": False, "data": await analyze_controller(
-        resume=resume, job_description=parsed_job_description, language=language)})
+        resume=resume,
+        job_description=parsed_job_description,
+        language=language,
+        resume_text=resume_text,
+    )})
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.resources import get_resources
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def live():
+    return JSONResponse(get_resources().health.liveness())
+
+
+@router.get("/ready")
+async def ready():
+    readiness = await get_resources().health.readiness()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
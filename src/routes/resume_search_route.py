@@ -0,0 +1,49 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Form, Header
+from fastapi.responses import JSONResponse
+
+from src.config import config
+from src.controllers.resume_search_controller import top_resumes_controller
+from src.utils.job_description_parser import parse_job_description
+
+router = APIRouter()
+
+MAX_TOP_K = 100
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Searching other users' resumes needs RESUME_SEARCH_TOKEN"""
+    expected = config["RESUME_SEARCH_TOKEN"] or ""
+    return bool(token and expected) and hmac.compare_digest(token, expected)
+
+
+@router.post("/top-matches")
+async def top_matching_resumes(
+    job_description: str = Form(...),
+    k: int = Form(10),
+    admin_token: Optional[str] = Header(None, alias="X-Admin-Token"),
+):
+    if not is_admin(admin_token):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+
+    if not 1 <= k <= MAX_TOP_K:
+        return JSONResponse(
+            {"error": f"k must be between 1 and {MAX_TOP_K}"}, status_code=400
+        )
+
+    parsed_job_description = await parse_job_description(job_description)
+    if parsed_job_description is None:
+        return JSONResponse(
+            {"error": "Failed to parse job description"}, status_code=400
+        )
+
+    return JSONResponse(
+        {
+            "error": False,
+            "data": await top_resumes_controller(
+                job_description=parsed_job_description.content, k=k
+            ),
+        }
+    )
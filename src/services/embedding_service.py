@@ -0,0 +1,60 @@
+import hashlib
+from typing import List
+
+import numpy as np
+
+from src.config import config
+from src.utils.text_features import tokenize
+
+
+def _hashing_embedding(text: str, dimensions: int) -> np.ndarray:
+    """
+    Signed feature hashing of the words and word pairs of the text. Local and
+    deterministic, good enough to rank documents by shared vocabulary.
+    """
+    tokens = tokenize(text)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if not features:
+        return vector
+
+    digests = np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little"
+            )
+            for feature in features
+        ],
+        dtype=np.uint64,
+    )
+    indexes = (digests % np.uint64(dimensions)).astype(np.int64)
+    signs = np.where(digests >> np.uint64(63), 1.0, -1.0).astype(np.float32)
+    np.add.at(vector, indexes, signs)
+    return vector
+
+
+def _openai_embedding(text: str) -> np.ndarray:
+    from langchain_openai import OpenAIEmbeddings
+
+    client = OpenAIEmbeddings(
+        model=config["EMBEDDING_MODEL"], openai_api_key=config.get("LLM_API_KEY")
+    )
+    return np.asarray(client.embed_query(text), dtype=np.float32)
+
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    L2-normalised embedding of a text with the configured EMBEDDING_BACKEND
+    ("hashing" or "openai"). Blocking, run it in a thread from async code.
+    """
+    if config["EMBEDDING_BACKEND"] == "openai":
+        vector = _openai_embedding(text)
+    else:
+        vector = _hashing_embedding(text, config["EMBEDDING_DIMENSIONS"])
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def to_list(vector: np.ndarray) -> List[float]:
+    return [round(float(value), 6) for value in vector]
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from src.config import config
+from src.database.redis_client import get_redis_client
+
+if TYPE_CHECKING:
+    from src.resources import Resources
+
+
+def _redis_probe() -> Dict:
+    start = time.perf_counter()
+    try:
+        get_redis_client().ping()
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    return {
+        "ok": latency_ms <= config["HEALTH_REDIS_MAX_LATENCY_MS"],
+        "latency_ms": round(latency_ms, 2),
+    }
+
+
+def _llm_probe(resources: "Resources") -> Dict:
+    """From the governor and router state: probes never call the LLM"""
+    governor = resources.llm_governor
+    if governor is None:
+        return {"ok": False, "error": "not started"}
+
+    snapshot = governor.snapshot()
+    # Not the snapshot's state: it only leaves "open" on a call, which an
+    # unready worker would never get
+    circuit_ok = not governor.breaker.is_open() or config["LLM_DEGRADE_TO_LOCAL"]
+    return {
+        "ok": circuit_ok and snapshot["queue_depth"] <= config["HEALTH_LLM_MAX_QUEUE"],
+        **snapshot,
+        "providers": resources.llm_router.snapshot() if resources.llm_router else {},
+    }
+
+
+def _browser_probe(resources: "Resources") -> Dict:
+    pool = resources.parser.browser_pool
+    if pool is None:
+        return {"ok": False, "error": "not started"}
+    return {"ok": pool.started, "in_use": pool.in_use, "size": pool.size}
+
+
+class HealthMonitor:
+    """
+    Readiness of a worker, probed at most once per `ttl` seconds. Concurrent
+    probes (load balancer, orchestrator, ...) share the same result, so
+    health checks add no load to Redis whatever their frequency.
+    """
+
+    # Checks a request cannot be served without; the browser pool is
+    # reported only, job pages fall back to the plain HTTP request
+    REQUIRED = ("redis", "http_session", "llm")
+
+    def __init__(self, resources: "Resources", ttl: Optional[float] = None):
+        self.resources = resources
+        self.ttl = config["HEALTH_CACHE_TTL"] if ttl is None else ttl
+        self._result: Optional[Dict] = None
+        self._checked_at = 0.0
+        # Created in the worker's event loop, on the first probe
+        self._lock: Optional[asyncio.Lock] = None
+
+    def liveness(self) -> Dict:
+        """The event loop answers: nothing else is checked"""
+        started_at = self.resources.started_at
+        return {
+            "status": "alive",
+            "uptime_seconds": round(time.time() - started_at, 1) if started_at else 0,
+        }
+
+    async def _probe(self) -> Dict:
+        session = self.resources.parser.session
+        checks = {
+            "redis": await asyncio.to_thread(_redis_probe),
+            "http_session": {"ok": session is not None and not session.closed},
+            "llm": _llm_probe(self.resources),
+            "browser_pool": _browser_probe(self.resources),
+        }
+        ready = self.resources.started and all(
+            checks[name]["ok"] for name in self.REQUIRED
+        )
+        return {
+            "status": "ready" if ready else "unavailable",
+            "ready": ready,
+            "started": self.resources.started,
+            "checks": checks,
+            "checked_at": time.time(),
+        }
+
+    def invalidate(self):
+        """Forget the cached result (shutdown must not report a stale ready)"""
+        self._result = None
+
+    async def readiness(self) -> Dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another request may have probed while this one waited
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = await self._probe()
+                self._checked_at = time.monotonic()
+            return self._result
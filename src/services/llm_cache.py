@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from src.config import config
+from src.database.redis_client import LLM_CACHE_EXPIRATION, get_value, set_with_expiry
+from src.helpers import metrics
+from src.helpers.logger import logger
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage
+
+MODE_OFF = "off"
+# Completions shared through Redis with a TTL
+MODE_REDIS = "redis"
+# Completions served from disk; misses call the LLM and are written to disk
+MODE_RECORD = "record"
+# Completions served from disk only, a miss is an error (offline tests, benchmarks)
+MODE_REPLAY = "replay"
+MODES = (MODE_OFF, MODE_REDIS, MODE_RECORD, MODE_REPLAY)
+
+
+class LLMReplayMiss(LookupError):
+    """Prompt not recorded while running in replay mode"""
+
+
+def prompt_hash(model: str, temperature: float, messages: list, **kwargs) -> str:
+    """Key of a completion: the model, the temperature and the exact prompt"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[message.type, message.content] for message in messages],
+            # functions / function_call change the completion as well
+            "options": kwargs,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def serialize_response(response) -> str:
+    return json.dumps(
+        {
+            "content": response.content,
+            "additional_kwargs": response.additional_kwargs,
+        },
+        ensure_ascii=False,
+    )
+
+
+def deserialize_response(raw: str) -> "AIMessage":
+    from langchain_core.messages import AIMessage
+
+    data = json.loads(raw)
+    return AIMessage(
+        content=data["content"], additional_kwargs=data.get("additional_kwargs", {})
+    )
+
+
+class LLMResponseCache:
+    """
+    Raw completions keyed by prompt_hash. Byte-identical prompts (e.g. the
+    contextual similarity re-sent as the fallback of analyze_resume_job_match)
+    are answered once.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        directory: Optional[str] = None,
+        expiration: int = LLM_CACHE_EXPIRATION,
+    ):
+        self.mode = (mode or config["LLM_CACHE_MODE"]).lower()
+        if self.mode not in MODES:
+            raise ValueError(
+                f"Unknown LLM cache mode '{self.mode}', available: {', '.join(MODES)}"
+            )
+        self.directory = directory or config["LLM_CACHE_DIR"]
+        self.expiration = expiration
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"llm_response:{key}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, raw: str):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{self._path(key)}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(raw)
+        os.replace(temporary, self._path(key))
+
+    def get(self, key: str) -> Optional["AIMessage"]:
+        if self.mode == MODE_OFF:
+            return None
+        if self.mode == MODE_REDIS:
+            raw = get_value(self._redis_key(key))
+        else:
+            raw = self._read_disk(key)
+        if raw is None:
+            return None
+
+        try:
+            return deserialize_response(raw)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.send_warning(f"Invalid LLM cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, response):
+        if self.mode == MODE_REDIS:
+            set_with_expiry(
+                self._redis_key(key), serialize_response(response), self.expiration
+            )
+        elif self.mode == MODE_RECORD:
+            self._write_disk(key, serialize_response(response))
+
+    async def fetch(
+        self,
+        key: str,
+        call: Callable[[], Awaitable],
+        cacheable: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        Cached completion for key, calling the LLM only on a miss. The new
+        completion is not stored when `cacheable` says so after the call.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            metrics.increment("LLM/CacheHit")
+            return cached
+
+        if self.mode == MODE_REPLAY:
+            raise LLMReplayMiss(
+                f"No recorded completion {key} in {self.directory}, "
+                f"record it first with LLM_CACHE_MODE={MODE_RECORD}"
+            )
+
+        metrics.increment("LLM/CacheMiss")
+        response = await call()
+        if cacheable is None or cacheable():
+            self.set(key, response)
+        else:
+            metrics.increment("LLM/CacheSkipped")
+        return response
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Cache shared by every OpenAiLLM instance, configured by LLM_CACHE_MODE"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
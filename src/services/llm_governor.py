@@ -0,0 +1,304 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from src.config import config
+from src.exceptions.LLMUnavailable import LLMUnavailable
+from src.helpers import metrics
+from src.helpers.logger import logger
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+OVERLOAD_STATUS = {429, 503}
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with additive increase / multiplicative decrease: every
+    success raises the limit by 1/limit (about +1 per round of calls), every
+    overload signal (429, timeout) halves it.
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # The slot was granted right before the cancellation
+                self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self):
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_overload(self):
+        self.limit = max(self.minimum, self.limit / 2)
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and fails fast until reset_timeout has
+    passed, then lets a single probe call through (half-open).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def is_open(self) -> bool:
+        """
+        Failing fast right now. Unlike allow() it changes nothing: once the
+        reset timeout has passed the circuit counts as not open, even before
+        a call moves it to half-open.
+        """
+        return self.state == self.OPEN and self.retry_after() > 0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN and self.retry_after() == 0:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return self.state == self.CLOSED
+
+    def abandon_probe(self):
+        """
+        The call let through ended without an outcome (cancelled): the next
+        call probes instead. No-op once an outcome was recorded.
+        """
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.send_warning("LLM circuit breaker opened")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_timeout(error: Exception) -> bool:
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or (
+        "Timeout" in type(error).__name__
+    )
+
+
+def is_retryable(error: Exception) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return _is_timeout(error) or "Connection" in type(error).__name__
+
+
+def is_overload(error: Exception) -> bool:
+    return _status_code(error) in OVERLOAD_STATUS or _is_timeout(error)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by the provider through Retry-After(-ms) headers"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class LLMGovernor:
+    """
+    Shared gate in front of every LLM call: adaptive concurrency, jittered
+    retries that honour Retry-After, and a circuit breaker that fails fast
+    with LLMUnavailable while the providers are down.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveLimiter,
+        breaker: CircuitBreaker,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+    ):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        requested = retry_after_seconds(error)
+        if requested is not None:
+            return min(requested, self.max_delay) + random.uniform(0, self.base_delay)
+        # Full jitter: uniform between 0 and the exponential ceiling
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _publish(self):
+        metrics.set_gauge("LLM/QueueDepth", self.limiter.waiting)
+        metrics.set_gauge("LLM/InFlight", self.limiter.in_flight)
+        metrics.set_gauge("LLM/ConcurrencyLimit", round(self.limiter.limit, 2))
+
+    async def call(
+        self, function: Callable[[], Awaitable[T]], language: str = "en"
+    ) -> T:
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                metrics.increment("LLM/Rejected")
+                raise LLMUnavailable(
+                    language=language, retry_after=self.breaker.retry_after()
+                )
+
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                self.breaker.abandon_probe()
+                raise
+            self._publish()
+            try:
+                result = await function()
+            except Exception as error:
+                retryable = is_retryable(error)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    # The request itself is wrong, the provider is healthy
+                    self.breaker.record_success()
+                if is_overload(error):
+                    self.limiter.on_overload()
+                    metrics.increment("LLM/Overloaded")
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, error)
+                metrics.increment("LLM/Retries")
+                logger.send_warning(
+                    f"LLM call failed ({type(error).__name__}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+            except BaseException:
+                # Cancelled (client gone, hedge lost): says nothing about
+                # the provider, but a half-open probe must not stay taken
+                self.breaker.abandon_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                self.limiter.on_success()
+                return result
+            finally:
+                self.limiter.release()
+                self._publish()
+
+            await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def snapshot(self) -> Dict:
+        return {
+            "queue_depth": self.limiter.waiting,
+            "in_flight": self.limiter.in_flight,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "circuit": self.breaker.state,
+            "retry_after": round(self.breaker.retry_after(), 1),
+        }
+
+
+_llm_governor: Optional[LLMGovernor] = None
+
+
+def get_llm_governor() -> LLMGovernor:
+    """Process-wide governor shared by every OpenAiLLM instance"""
+    global _llm_governor
+    if _llm_governor is None:
+        _llm_governor = LLMGovernor(
+            limiter=AdaptiveLimiter(
+                initial=config["LLM_INITIAL_CONCURRENCY"],
+                minimum=1,
+                maximum=config["LLM_MAX_CONCURRENCY"],
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=config["LLM_BREAKER_FAILURES"],
+                reset_timeout=config["LLM_BREAKER_RESET"],
+            ),
+            max_retries=config["LLM_MAX_RETRIES"],
+            base_delay=config["LLM_RETRY_BASE_DELAY"],
+            max_delay=config["LLM_RETRY_MAX_DELAY"],
+        )
+    return _llm_governor
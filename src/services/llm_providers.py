@@ -0,0 +1,206 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import config
+from src.helpers.logger import logger
+
+TASK_SCORING = "scoring"
+TASK_ANALYSIS = "analysis"
+
+# Weight of the newest sample in the per-provider latency average
+LATENCY_SMOOTHING = 0.3
+
+
+@dataclass
+class LLMProvider:
+    """OpenAI-compatible endpoint (OpenAI, vLLM, llama.cpp server, ...)"""
+
+    name: str
+    models: Dict[str, str]
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    timeout: float = 60.0
+    # Retries are handled by the LLM governor, not by the client
+    max_retries: int = 0
+
+    def model_for(self, task: str) -> Optional[str]:
+        return self.models.get(task)
+
+
+@dataclass
+class ProviderStats:
+    latency: Optional[float] = None
+    failures: int = 0
+    calls: int = 0
+
+    def record(self, seconds: float, success: bool):
+        self.calls += 1
+        if not success:
+            self.failures += 1
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+
+
+@dataclass
+class LLMCall:
+    """Response of a routed call and where it was served from"""
+
+    response: Any
+    provider: str
+    model: str
+    latency: float
+
+
+def load_providers() -> List[LLMProvider]:
+    """
+    Providers from the LLM_PROVIDERS setting, a JSON list such as
+    [{"name": "local", "base_url": "http://vllm:8000/v1",
+      "models": {"scoring": "llama-3-8b-instruct"}},
+     {"name": "openai", "models": {"scoring": "gpt-3.5-turbo",
+                                   "analysis": "gpt-4-turbo"}}]
+    Without it, a single provider is built from LLM_BASE_URL,
+    LLM_SCORING_MODEL and LLM_ANALYSIS_MODEL.
+    """
+    configured = config.get("LLM_PROVIDERS") or [
+        {
+            "name": "default",
+            "base_url": config.get("LLM_BASE_URL"),
+            "models": {
+                TASK_SCORING: config["LLM_SCORING_MODEL"],
+                TASK_ANALYSIS: config["LLM_ANALYSIS_MODEL"],
+            },
+        }
+    ]
+    providers = []
+    for entry in configured:
+        entry = dict(entry)
+        entry.setdefault("api_key", config.get("LLM_API_KEY"))
+        providers.append(LLMProvider(**entry))
+    return providers
+
+
+def _chat_client(provider: LLMProvider, model: str, temperature: float):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model_name=model,
+        temperature=temperature,
+        openai_api_key=provider.api_key or "not-needed",
+        openai_api_base=provider.base_url,
+        request_timeout=provider.timeout,
+        max_retries=provider.max_retries,
+    )
+
+
+class LLMRouter:
+    """
+    Routes each task to the providers that serve it, fastest first.
+
+    Providers are ordered by the moving average of their observed latency
+    (failures count as a full timeout), so slow or failing endpoints drift to
+    the back and the next one is tried when a call errors or times out.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        client_factory: Callable[[LLMProvider, str, float], Any] = _chat_client,
+    ):
+        if not providers:
+            raise ValueError("At least one LLM provider is required")
+        self.providers = providers
+        self.client_factory = client_factory
+        self.stats: Dict[str, ProviderStats] = {
+            p.name: ProviderStats() for p in providers
+        }
+        self._clients: Dict[Tuple[str, str, float], Any] = {}
+
+    def candidates(self, task: str) -> List[Tuple[LLMProvider, str]]:
+        serving = [
+            (position, provider, provider.model_for(task))
+            for position, provider in enumerate(self.providers)
+            if provider.model_for(task)
+        ]
+        if not serving:
+            raise ValueError(f"No LLM provider serves the task '{task}'")
+
+        # Providers without samples keep their configured position up front
+        def sort_key(item):
+            latency = self.stats[item[1].name].latency
+            return (latency is not None, latency or 0.0, item[0])
+
+        return [
+            (provider, model) for _, provider, model in sorted(serving, key=sort_key)
+        ]
+
+    def primary_model(self, task: str) -> str:
+        return self.candidates(task)[0][1]
+
+    def preferred_model(self, task: str) -> str:
+        """First configured model for the task, independent of latency"""
+        for provider in self.providers:
+            if provider.model_for(task):
+                return provider.model_for(task)
+        raise ValueError(f"No LLM provider serves the task '{task}'")
+
+    def _client(self, provider: LLMProvider, model: str, temperature: float):
+        key = (provider.name, model, temperature)
+        if key not in self._clients:
+            self._clients[key] = self.client_factory(provider, model, temperature)
+        return self._clients[key]
+
+    async def invoke(
+        self, task: str, messages: list, temperature: float, **kwargs
+    ) -> LLMCall:
+        last_error: Optional[Exception] = None
+
+        for provider, model in self.candidates(task):
+            client = self._client(provider, model, temperature)
+            start = time.perf_counter()
+            try:
+                # Async client: on timeout the request itself is cancelled, no
+                # worker thread keeps the connection past the concurrency limit
+                response = await asyncio.wait_for(
+                    client.ainvoke(messages, **kwargs), timeout=provider.timeout
+                )
+            except Exception as e:
+                self.stats[provider.name].record(provider.timeout, success=False)
+                logger.send_warning(
+                    f"LLM provider '{provider.name}' ({model}) failed for "
+                    f"{task}: {type(e).__name__}: {e}"
+                )
+                last_error = e
+                continue
+
+            latency = time.perf_counter() - start
+            self.stats[provider.name].record(latency, success=True)
+            return LLMCall(response, provider.name, model, latency)
+
+        raise last_error
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                "latency_ms": round(stats.latency * 1000, 1)
+                if stats.latency is not None
+                else None,
+                "calls": stats.calls,
+                "failures": stats.failures,
+            }
+            for name, stats in self.stats.items()
+        }
+
+
+_llm_router: Optional[LLMRouter] = None
+
+
+def get_llm_router() -> LLMRouter:
+    """Shared router, built from the configuration on first use"""
+    global _llm_router
+    if _llm_router is None:
+        _llm_router = LLMRouter(load_providers())
+    return _llm_router
@@ -0,0 +1,158 @@
+import json
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.config import config
+from src.exceptions.LLMBudgetExceeded import LLMBudgetExceeded
+from src.helpers import metrics
+from src.helpers.logger import logger
+from src.utils.text_features import count_tokens
+
+BUDGET_REJECT = "reject"
+BUDGET_DOWNGRADE = "downgrade"
+
+
+@dataclass
+class CallUsage:
+    """One LLM completion; cached ones cost no tokens"""
+
+    task: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float
+    cached: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def response_usage(response) -> Tuple[Optional[int], Optional[int]]:
+    """(prompt, completion) tokens reported by a LangChain message, if any"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens"), usage.get("output_tokens")
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or {}
+    return token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+
+
+def estimate_prompt_tokens(messages: list, model: str, **kwargs) -> int:
+    """Prompt size before the call (function schemas are sent as tokens too)"""
+    tokens = sum(count_tokens(str(message.content), model) for message in messages)
+    if kwargs:
+        tokens += count_tokens(json.dumps(kwargs, sort_keys=True, default=str), model)
+    return tokens
+
+
+def token_cost(
+    model: str, prompt_tokens: int, completion_tokens: int
+) -> Optional[float]:
+    """Cost from LLM_TOKEN_PRICES ({"model": [prompt, completion] per 1K tokens})"""
+    prices = config["LLM_TOKEN_PRICES"].get(model)
+    if not prices:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1000
+
+
+class RequestUsage:
+    """LLM calls of one request and its token budget (0: unlimited)"""
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = config["LLM_REQUEST_TOKEN_BUDGET"] if budget is None else budget
+        self.calls: List[CallUsage] = []
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(call.prompt_tokens for call in self.calls)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(call.completion_tokens for call in self.calls)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def check_budget(self, prompt_tokens: int, language: str = "en"):
+        """
+        :raises LLMBudgetExceeded: When the call would take the request over budget
+        """
+        if self.budget and self.total_tokens + prompt_tokens > self.budget:
+            metrics.increment("LLM/BudgetExceeded")
+            raise LLMBudgetExceeded(
+                language=language,
+                tokens=self.total_tokens + prompt_tokens,
+                budget=self.budget,
+            )
+
+    def record(self, call: CallUsage):
+        self.calls.append(call)
+
+    def summary(self) -> Dict:
+        models: Dict[str, Dict] = {}
+        cost = 0.0
+        priced = False
+        for call in self.calls:
+            model = models.setdefault(
+                call.model, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+            )
+            model["calls"] += 1
+            model["prompt_tokens"] += call.prompt_tokens
+            model["completion_tokens"] += call.completion_tokens
+            call_cost = token_cost(
+                call.model, call.prompt_tokens, call.completion_tokens
+            )
+            if call_cost is not None:
+                cost += call_cost
+                priced = True
+
+        return {
+            "calls": len(self.calls),
+            "cached_calls": sum(call.cached for call in self.calls),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": round(sum(call.latency for call in self.calls) * 1000, 1),
+            "cost": round(cost, 6) if priced else None,
+            "budget": self.budget or None,
+            "models": models,
+        }
+
+
+request_usage_context: ContextVar[Optional[RequestUsage]] = ContextVar(
+    "llm_usage", default=None
+)
+
+
+def record_call(call: CallUsage):
+    """Add the call to the current request (if any) and to the metrics"""
+    usage = request_usage_context.get()
+    if usage is not None:
+        usage.record(call)
+
+    if call.cached:
+        metrics.increment("LLM/CachedCalls")
+        return
+    metrics.increment("LLM/PromptTokens", call.prompt_tokens)
+    metrics.increment("LLM/CompletionTokens", call.completion_tokens)
+    metrics.increment(f"LLM/Tokens/{call.model}", call.total_tokens)
+
+
+def start_request_usage() -> Token:
+    """Open the usage of a request; tasks it creates share the same object"""
+    return request_usage_context.set(RequestUsage())
+
+
+def finish_request_usage(token: Token):
+    """Log the usage of the request (when it called the LLM) and close it"""
+    usage = request_usage_context.get()
+    request_usage_context.reset(token)
+    if usage is None or not usage.calls:
+        return
+
+    summary = usage.summary()
+    logger.send_log({"message": "LLM usage", **summary})
+    metrics.increment("LLM/RequestTokens", summary["total_tokens"])
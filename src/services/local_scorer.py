@@ -0,0 +1,76 @@
+from typing import Dict
+
+from src.utils.job_index import JobPosting
+from src.utils.text_features import tokenize
+
+MAX_MISSING_KEYWORDS = 15
+
+REASON_UNAVAILABLE = "unavailable"
+REASON_POSITION_CLOSED = "position_closed"
+REASON_OVER_BUDGET = "over_budget"
+
+FEEDBACK = {
+    REASON_UNAVAILABLE: {
+        "pt-BR": (
+            "Análise simplificada por palavras-chave: o serviço de análise "
+            "detalhada está temporariamente indisponível."
+        ),
+        "en": (
+            "Simplified keyword-based analysis: the detailed analysis service "
+            "is temporarily unavailable."
+        ),
+    },
+    REASON_POSITION_CLOSED: {
+        "pt-BR": (
+            "Esta vaga não está mais aceitando candidaturas. "
+            "Análise simplificada por palavras-chave."
+        ),
+        "en": (
+            "This position is no longer accepting applications. "
+            "Simplified keyword-based analysis."
+        ),
+    },
+    REASON_OVER_BUDGET: {
+        "pt-BR": (
+            "Análise simplificada por palavras-chave: currículo e vaga excedem "
+            "o tamanho da análise detalhada."
+        ),
+        "en": (
+            "Simplified keyword-based analysis: the resume and job description "
+            "exceed the size of the detailed analysis."
+        ),
+    },
+}
+
+
+def local_feedback(reason: str, language: str) -> str:
+    messages = FEEDBACK[reason]
+    return messages["pt-BR"] if language == "pt-BR" else messages["en"]
+
+
+def local_similarity(
+    resume_text: str,
+    job_posting: JobPosting,
+    language: str,
+    reason: str = REASON_UNAVAILABLE,
+) -> Dict:
+    """
+    LLM-free estimate of the match: share of the posting keywords found in the
+    resume, earlier (more frequent) keywords weighing more. Same shape as the
+    contextual analysis of OpenAiLLM.
+    """
+    resume_tokens = set(tokenize(resume_text))
+    keywords = job_posting.keywords
+    feedback = local_feedback(reason, language)
+    if not keywords:
+        return {"score": 0.0, "keywords": [], "feedback": feedback}
+
+    weights = [1.0 / (1 + rank * 0.1) for rank in range(len(keywords))]
+    found = sum(w for k, w in zip(keywords, weights) if k in resume_tokens)
+    missing = [k for k in keywords if k not in resume_tokens]
+
+    return {
+        "score": round(found / sum(weights), 2),
+        "keywords": missing[:MAX_MISSING_KEYWORDS],
+        "feedback": feedback,
+    }
@@ -0,0 +1,90 @@
+import json
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from src.database.redis_client import NEAR_DUPLICATE_EXPIRATION, get_redis_client
+from src.helpers.logger import logger
+
+# Entries are grouped per posting_key: posting hash and language of the
+# feedback, results are only reused for the same posting in the same language
+
+# Candidates compared per lookup, those sharing the most bands first
+MAX_CANDIDATES = 50
+
+
+def _band_key(posting_key: str, band: int, bucket: str) -> str:
+    return f"near_duplicate:{posting_key}:band:{band}:{bucket}"
+
+
+def _entry_key(posting_key: str, resume_hash: str) -> str:
+    return f"near_duplicate:{posting_key}:resume:{resume_hash}"
+
+
+def resume_signature(resume_text: str) -> List[int]:
+    # numpy is imported on first use, not at startup
+    from src.utils.minhash import signature
+
+    return signature(resume_text)
+
+
+def find_near_duplicate(
+    posting_key: str, signature: List[int], threshold: float
+) -> Optional[Tuple[float, Dict]]:
+    """
+    Result of the resume scored for this posting whose estimated Jaccard
+    similarity to `signature` is the highest, at least `threshold`, with
+    that similarity. None when there is none or Redis fails.
+    """
+    from src.utils.minhash import band_hashes, estimated_jaccard
+
+    try:
+        client = get_redis_client()
+        pipe = client.pipeline()
+        for band, bucket in enumerate(band_hashes(signature)):
+            pipe.smembers(_band_key(posting_key, band, bucket))
+        shared_bands = Counter(
+            resume_hash for bucket in pipe.execute() for resume_hash in bucket
+        )
+        if not shared_bands:
+            return None
+        entries = client.mget(
+            [
+                _entry_key(posting_key, resume_hash)
+                for resume_hash, _ in shared_bands.most_common(MAX_CANDIDATES)
+            ]
+        )
+    except Exception as e:
+        logger.send_warning(f"Near-duplicate lookup failed: {e}")
+        return None
+
+    best = None
+    for value in entries:
+        if not value:
+            continue  # expired before its buckets
+        entry = json.loads(value)
+        similarity = estimated_jaccard(signature, entry["signature"])
+        if similarity >= threshold and (best is None or similarity > best[0]):
+            best = (similarity, entry["result"])
+    return best
+
+
+def add_near_duplicate(
+    posting_key: str, resume_hash: str, signature: List[int], result: Dict
+) -> None:
+    """Index a scored resume for the posting, for NEAR_DUPLICATE_EXPIRATION"""
+    from src.utils.minhash import band_hashes
+
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.setex(
+            _entry_key(posting_key, resume_hash),
+            NEAR_DUPLICATE_EXPIRATION,
+            json.dumps({"signature": signature, "result": result}),
+        )
+        for band, bucket in enumerate(band_hashes(signature)):
+            key = _band_key(posting_key, band, bucket)
+            pipe.sadd(key, resume_hash)
+            pipe.expire(key, NEAR_DUPLICATE_EXPIRATION)
+        pipe.execute()
+    except Exception as e:
+        logger.send_warning(f"Could not index the resume for near duplicates: {e}")
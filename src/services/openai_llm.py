@@ -1,23 +1,95 @@
-import asyncio
 import json
 import re
-from typing import List
-
-from langchain.schema import HumanMessage
-from langchain_openai import ChatOpenAI
+import time
+from typing import List, Optional
 
 from src.config import config
 from src.helpers.logger import logger
+from src.services.llm_cache import LLMResponseCache, get_llm_cache, prompt_hash
+from src.services.llm_governor import LLMGovernor, get_llm_governor
+from src.services.llm_usage import (
+    CallUsage,
+    estimate_prompt_tokens,
+    record_call,
+    request_usage_context,
+    response_usage,
+)
+from src.services.llm_providers import (
+    TASK_ANALYSIS,
+    TASK_SCORING,
+    LLMRouter,
+    get_llm_router,
+)
+
+
+def human_message(content: str):
+    """LangChain is imported on the first prompt, not when the app starts"""
+    from langchain_core.messages import HumanMessage
+
+    return HumanMessage(content=content)
 
 
 class OpenAiLLM:
-    def __init__(self, language: str):
+    def __init__(
+        self,
+        language: str,
+        router: Optional[LLMRouter] = None,
+        governor: Optional[LLMGovernor] = None,
+        cache: Optional[LLMResponseCache] = None,
+    ):
         self.api_key = config.get("LLM_API_KEY", None)
         self.language = language
-        self.client = ChatOpenAI(
-            model_name="gpt-3.5-turbo", temperature=0.1, openai_api_key=self.api_key
+        self.router = router or get_llm_router()
+        self.governor = governor or get_llm_governor()
+        self.cache = cache or get_llm_cache()
+
+    async def _invoke(self, task: str, messages: list, temperature: float, **kwargs):
+        """
+        Send the messages to the fastest provider serving the task, through
+        the shared governor (concurrency limit, retries, circuit breaker).
+        Identical prompts are answered from the response cache, keyed by the
+        preferred model: completions served by a fallback model are not
+        stored under it. Tokens and latency are accounted to the current
+        request (llm_usage).
+        :raises LLMUnavailable: When the circuit breaker is open
+        :raises LLMBudgetExceeded: When the prompt exceeds the request budget
+        """
+        model = self.router.preferred_model(task)
+        key = prompt_hash(model, temperature, messages, **kwargs)
+        start = time.perf_counter()
+        call_usage: Optional[CallUsage] = None
+
+        async def call_llm():
+            nonlocal call_usage
+            prompt_tokens = estimate_prompt_tokens(messages, model, **kwargs)
+            usage = request_usage_context.get()
+            if usage is not None:
+                usage.check_budget(prompt_tokens, self.language)
+
+            call = await self.governor.call(
+                lambda: self.router.invoke(task, messages, temperature, **kwargs),
+                language=self.language,
+            )
+            reported_prompt, completion = response_usage(call.response)
+            call_usage = CallUsage(
+                task,
+                call.model,
+                reported_prompt or prompt_tokens,
+                completion or 0,
+                0.0,
+            )
+            return call.response
+
+        response = await self.cache.fetch(
+            key, call_llm, cacheable=lambda: call_usage.model == model
         )
 
+        # Not set when the response came from the cache
+        usage = call_usage or CallUsage(task, model, 0, 0, 0.0, cached=True)
+        usage.latency = time.perf_counter() - start
+        record_call(usage)
+        return response
+
     def get_extract_keywords_text(self, text: str) -> str:
         if self.language == "pt-BR":
             return (
@@ -29,8 +101,8 @@ class OpenAiLLM:
 
     async def extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from resume text."""
-        messages = [HumanMessage(content=self.get_extract_keywords_text(text=text))]
-        response = await asyncio.to_thread(self.client, messages)
+        messages = [human_message(self.get_extract_keywords_text(text=text))]
+        response = await self._invoke(TASK_SCORING, messages, temperature=0.1)
         return self._parse_response(response)
 
     def get_jaccard_similarity_text(self, resume: str, job_description: str):
@@ -59,13 +131,13 @@ class OpenAiLLM:
         self, resume: str, job_description: str
     ) -> float:
         messages = [
-            HumanMessage(
-                content=self.get_jaccard_similarity_text(
+            human_message(
+                self.get_jaccard_similarity_text(
                     resume=resume, job_description=job_description
                 )
             )
         ]
-        response = await asyncio.to_thread(self.client, messages)
+        response = await self._invoke(TASK_SCORING, messages, temperature=0.1)
         try:
             return float(response.content.strip())
         except ValueError:
@@ -108,13 +180,13 @@ class OpenAiLLM:
         self, resume: str, job_description: str
     ) -> dict:
         messages = [
-            HumanMessage(
-                content=self.get_contextual_similarity_text(
+            human_message(
+                self.get_contextual_similarity_text(
                     resume=resume, job_description=job_description
                 )
             )
         ]
-        response = self.client.invoke(messages)
+        response = await self._invoke(TASK_SCORING, messages, temperature=0.1)
         try:
             content = response.content.strip()
 
@@ -153,16 +225,9 @@ class OpenAiLLM:
         Analisa a correspondência entre currículo e vaga em uma única chamada à LLM.
         Retorna escore, palavras-chave faltantes e feedback estruturado.
         """
-        logger.info(f"Analyzing resume job match...")
+        logger.send_log(f"Analyzing resume job match...")
         prompt = self._get_comprehensive_analysis_prompt(resume, job_description)
-        messages = [HumanMessage(content=prompt)]
-        
-        # Configurando um modelo mais adequado para análises complexas
-        advanced_client = ChatOpenAI(
-            model_name="gpt-4-turbo", # ou outro modelo adequado
-            temperature=0.2,
-            openai_api_key=self.api_key
-        )
+        messages = [human_message(prompt)]
         
         # Usando function calling para retornar estrutura específica de dados
         functions = [
@@ -196,12 +261,13 @@ class OpenAiLLM:
             }
         ]
         
-        response = await asyncio.to_thread(
-            lambda: advanced_client.invoke(
-                messages,
-                functions=functions,
-                function_call={"name": "resume_analysis_result"}
-            )
+        # Tarefa de análise: roteada para o modelo maior configurado
+        response = await self._invoke(
+            TASK_ANALYSIS,
+            messages,
+            temperature=0.2,
+            functions=functions,
+            function_call={"name": "resume_analysis_result"},
         )
         
         try:
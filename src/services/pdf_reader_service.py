@@ -1,5 +1,132 @@
+import importlib.util
+from functools import lru_cache
+from io import BytesIO, StringIO
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
 from fastapi import UploadFile
-from PyPDF2 import PdfReader
+
+from src.config import config
+from src.helpers.logger import logger
+
+
+def _extract_with_pypdf2(stream: BinaryIO) -> str:
+    from PyPDF2 import PdfReader
+
+    content = PdfReader(stream)
+    return " ".join(page.extract_text() for page in content.pages)
+
+
+def _extract_with_pdfminer(stream: BinaryIO) -> str:
+    """pdfminer.six without the box-ordering pass, which dominates its cost."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    output = StringIO()
+    manager = PDFResourceManager(caching=True)
+    device = TextConverter(manager, output, laparams=LAParams(boxes_flow=None))
+    try:
+        interpreter = PDFPageInterpreter(manager, device)
+        for page in PDFPage.get_pages(stream):
+            interpreter.process_page(page)
+    finally:
+        device.close()
+
+    pages = output.getvalue().split("\x0c")
+    return " ".join(page.strip() for page in pages if page.strip())
+
+
+def _extract_with_pypdfium2(stream: BinaryIO) -> str:
+    import pypdfium2 as pdfium
+
+    document = pdfium.PdfDocument(stream.read())
+    try:
+        texts = []
+        for page in document:
+            text_page = page.get_textpage()
+            texts.append(text_page.get_text_range().replace("\r\n", "\n"))
+            text_page.close()
+            page.close()
+    finally:
+        document.close()
+
+    return " ".join(texts)
+
+
+PDF_BACKENDS: Dict[str, Callable[[BinaryIO], str]] = {
+    "pypdfium2": _extract_with_pypdfium2,
+    "pypdf2": _extract_with_pypdf2,
+    "pdfminer": _extract_with_pdfminer,
+}
+
+# Module each backend needs, in the order "auto" prefers them (fastest first).
+# pdfminer.six is kept for documents the others mangle, it is not faster.
+_BACKEND_MODULES = {
+    "pypdfium2": "pypdfium2",
+    "pypdf2": "PyPDF2",
+    "pdfminer": "pdfminer",
+}
+
+
+@lru_cache(maxsize=1)
+def available_backends() -> Tuple[str, ...]:
+    """
+    Return the backends whose libraries are installed, fastest first.
+    Resolved once: find_spec walks every import hook on each call.
+    """
+    return tuple(
+        name
+        for name, module in _BACKEND_MODULES.items()
+        if importlib.util.find_spec(module) is not None
+    )
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Resolve the configured backend name to one that can actually run.
+    :param name: Backend name, "auto" or None to use the PDF_BACKEND setting.
+    :return: Name of a key in PDF_BACKENDS.
+    """
+    name = (name or config.get("PDF_BACKEND") or "auto").lower()
+    available = available_backends()
+
+    if name == "auto":
+        return available[0] if available else "pypdf2"
+
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'")
+
+    if name not in available:
+        logger.send_warning(f"PDF backend '{name}' is not installed, using pypdf2")
+        return "pypdf2"
+
+    return name
+
+
+def extract_pdf_text(stream: BinaryIO, backend: Optional[str] = None) -> str:
+    """
+    Extract the text of a PDF with the configured backend, falling back to
+    PyPDF2 when the backend fails or finds no text in the document.
+    :param stream: Binary stream with the PDF content
+    :param backend: Optional backend name overriding the configuration
+    :return: Text of all pages joined by a space
+    """
+    data = stream.read()
+    name = resolve_backend(backend)
+
+    if name != "pypdf2":
+        try:
+            text = PDF_BACKENDS[name](BytesIO(data))
+            if text and text.strip():
+                return text
+            logger.send_warning(f"PDF backend '{name}' returned no text, using pypdf2")
+        except Exception as exception:
+            logger.send_warning(
+                f"PDF backend '{name}' failed ({exception}), using pypdf2"
+            )
+
+    return _extract_with_pypdf2(BytesIO(data))
 
 
 def pdf_reader(pdf_file: UploadFile) -> str:
@@ -9,9 +136,4 @@ def pdf_reader(pdf_file: UploadFile) -> str:
     :return: Responsible for return the content of PDF in string format.
     """
 
-    content = PdfReader(pdf_file.file)
-    resume_text = " ".join(page.extract_text() for page in content.pages)
-    return resume_text
-
-
-
+    return extract_pdf_text(pdf_file.file)
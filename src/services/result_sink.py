@@ -0,0 +1,129 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from src.config import config
+from src.database.result_store import ResultStore
+from src.helpers import metrics
+from src.helpers.logger import logger
+
+# Queued by close(): the task writes what it holds and stops
+_STOP = object()
+
+
+class ResultSink:
+    """
+    In-memory queue of analysis results written to the ResultStore in
+    batches, when `batch_size` results are waiting or `flush_interval`
+    seconds after the first one, by a background task of the worker.
+
+    The queue is bounded: `submit` never waits (a request does not pay for
+    the write) and drops the result when the queue is full, `put` waits for
+    room (bulk producers slow down to the write rate instead).
+    """
+
+    def __init__(
+        self,
+        store: ResultStore,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.store = store
+        self.batch_size = batch_size or config["RESULT_SINK_BATCH_SIZE"]
+        self.flush_interval = (
+            config["RESULT_SINK_FLUSH_INTERVAL"]
+            if flush_interval is None
+            else flush_interval
+        )
+        self.max_queue = max_queue or config["RESULT_SINK_MAX_QUEUE"]
+        self.written = 0
+        self.dropped = 0
+        # Created in the worker's event loop by start()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, result: Dict) -> bool:
+        """Queue the result without waiting; False when it was dropped"""
+        if not self.started:
+            return False
+        try:
+            self._queue.put_nowait(result)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            metrics.increment("Results/Dropped")
+            return False
+        return True
+
+    async def put(self, result: Dict):
+        """Queue the result, waiting while the queue is full"""
+        if not self.started:
+            raise RuntimeError("Result sink is not running")
+        await self._queue.put(result)
+
+    async def _next_batch(self) -> List[Dict]:
+        """Wait for a result, then gather more until the batch or time limit"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: List[Dict]):
+        start = time.perf_counter()
+        try:
+            self.written += await asyncio.to_thread(self.store.write_many, batch)
+        except Exception as e:
+            # History is best effort: never take the worker down with it
+            self.dropped += len(batch)
+            metrics.increment("Results/Dropped", len(batch))
+            logger.send_error(f"Failed to write {len(batch)} analysis results: {e}")
+            return
+        metrics.increment("Results/Written", len(batch))
+        metrics.set_gauge("Results/FlushSeconds", time.perf_counter() - start)
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch = await self._next_batch()
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            if batch:
+                await self._write(batch)
+            metrics.set_gauge("Results/Queued", self._queue.qsize())
+
+    async def close(self):
+        """Write what is still queued, then stop the task and the store"""
+        if self._task is not None:
+            self._closing = True
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+        await asyncio.to_thread(self.store.close)
+
+
+def create_result_sink() -> Optional[ResultSink]:
+    """Sink on the configured store, None when disabled"""
+    if not config["RESULT_SINK_ENABLED"]:
+        return None
+    return ResultSink(ResultStore(config["RESULT_STORE_PATH"]))
@@ -0,0 +1,167 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.config import config
+from src.helpers.logger import logger
+from src.utils.resume_sections import (
+    ALL_SECTION_NAMES,
+    DROPPED_SECTIONS,
+    EMAIL_PATTERN,
+    PHONE_PATTERN,
+    TITLE_HEADERS,
+)
+from src.utils.text_features import count_tokens
+
+URL_PATTERN = re.compile(
+    r"(?:https?://|www\.)\S+|\b(?:linkedin|github|gitlab)\.com/\S*", re.IGNORECASE
+)
+PAGE_MARKER_PATTERN = re.compile(
+    # "Page 2 of 3", "página 2", "2 / 3" or a bare page number
+    r"^(?:(?:page|página|pagina)\s*\d+(?:\s*(?:of|de|/)\s*\d+)?"
+    r"|\d+\s*(?:of|de|/)\s*\d+"
+    r"|\d{1,3})$",
+    re.IGNORECASE,
+)
+BULLET_PATTERN = re.compile(r"^[•▪●‣⁃◦*·\-–—]+\s*")
+HEADER_STRIP = " :|-•\t"
+
+Section = Tuple[Optional[str], List[str]]
+
+
+@dataclass
+class CondensedResume:
+    """Compact resume text sent to the LLM and its token accounting"""
+
+    text: str
+    original_tokens: int
+    condensed_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.condensed_tokens
+
+
+SECTION_PREFIX_PATTERN = re.compile(
+    r"^(" + "|".join(sorted(ALL_SECTION_NAMES, key=len, reverse=True)) + r")\b"
+)
+
+
+def _section_name(line: str) -> Optional[str]:
+    """Section of a header line: "SKILLS", "Experience:", "FORMAÇÃO ACADÊMICA"."""
+    if len(line) > 40:
+        return None
+    name = line.strip(HEADER_STRIP).lower()
+    if name in ALL_SECTION_NAMES:
+        return name
+
+    # Longer headers count when they look like one: upper case or a trailing colon
+    stripped = line.strip(HEADER_STRIP)
+    if len(name.split()) <= 4 and (stripped.isupper() or line.rstrip().endswith(":")):
+        match = SECTION_PREFIX_PATTERN.match(name)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _clean_line(line: str) -> str:
+    removed = 0
+    for pattern in (URL_PATTERN, EMAIL_PATTERN, PHONE_PATTERN):
+        line, count = pattern.subn(" ", line)
+        removed += count
+
+    words = line.split()
+    if removed and len(words) <= 3:
+        # What is left of a contact line: "Email:", "Phone: |", a name
+        return ""
+
+    line = " ".join(words)
+    if not line or PAGE_MARKER_PATTERN.match(line):
+        return ""
+    return BULLET_PATTERN.sub("- ", line)
+
+
+def segment_resume(text: str) -> List[Section]:
+    """
+    Split the resume into (header, lines) sections using the same section
+    names as the resume validation. Boilerplate is removed on the way:
+    contact details, page markers, repeated lines (page headers and footers,
+    duplicated bullets), document titles and the contact/references sections.
+    """
+    sections: List[Section] = [(None, [])]
+    seen = set()
+    dropping = False
+
+    for raw_line in text.splitlines():
+        line = _clean_line(raw_line)
+        if not line:
+            continue
+
+        name = _section_name(line)
+        if name is not None:
+            dropping = name in DROPPED_SECTIONS
+            if name not in TITLE_HEADERS and not dropping:
+                sections.append((line.strip(HEADER_STRIP), []))
+            continue
+
+        key = BULLET_PATTERN.sub("", line).lower()
+        if dropping or key in seen:
+            continue
+        seen.add(key)
+        sections[-1][1].append(line)
+
+    return [(header, lines) for header, lines in sections if lines]
+
+
+def _bound(sections: List[Section], max_tokens: int) -> List[Section]:
+    """Trim every section proportionally so the whole fits in max_tokens"""
+    line_tokens = [[count_tokens(line) + 1 for line in lines] for _, lines in sections]
+    header_tokens = sum(count_tokens(header) + 2 for header, _ in sections if header)
+    body_tokens = sum(sum(tokens) for tokens in line_tokens)
+    if header_tokens + body_tokens <= max_tokens:
+        return sections
+
+    ratio = max(max_tokens - header_tokens, 0) / body_tokens
+    bounded = []
+    for (header, lines), tokens in zip(sections, line_tokens):
+        allowance = int(sum(tokens) * ratio)
+        kept, used = [], 0
+        for line, cost in zip(lines, tokens):
+            if used + cost > allowance:
+                break
+            kept.append(line)
+            used += cost
+        if kept:
+            bounded.append((header, kept))
+    return bounded
+
+
+def condense_resume(text: str, max_tokens: Optional[int] = None) -> CondensedResume:
+    """
+    Build the compact, bounded representation of a resume used in prompts.
+    :param text: Resume text extracted from the PDF
+    :param max_tokens: Upper bound of the result, RESUME_MAX_TOKENS by default
+    """
+    max_tokens = max_tokens or config["RESUME_MAX_TOKENS"]
+    sections = _bound(segment_resume(text), max_tokens)
+
+    condensed = "\n\n".join(
+        "\n".join(([header] if header else []) + lines) for header, lines in sections
+    )
+    if not condensed.strip():
+        # Nothing recognisable survived, keep the original rather than nothing
+        condensed = " ".join(text.split())
+
+    result = CondensedResume(condensed, count_tokens(text), count_tokens(condensed))
+    logger.send_log(
+        {
+            "message": "Resume condensed",
+            "original_tokens": result.original_tokens,
+            "condensed_tokens": result.condensed_tokens,
+            "saved_tokens": result.saved_tokens,
+            "saved_percent": round(
+                100 * result.saved_tokens / max(result.original_tokens, 1), 1
+            ),
+        }
+    )
+    return result
@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import importlib.util
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from src.config import config
+from src.helpers.logger import logger
+from src.utils.job_index import JobPosting
+
+if TYPE_CHECKING:
+    from src.database.vector_store import VectorStore
+
+# Metadata returned by the search; rows indexed before may carry a filename
+SEARCH_RESULT_FIELDS = ("id", "language", "indexed_at")
+
+# numpy (vector store, embeddings) is imported on first use, not at startup
+_resume_store: Optional["VectorStore"] = None
+
+
+def get_resume_store() -> "VectorStore":
+    """
+    Return the shared resume vector store, opening it on first use.
+    """
+    global _resume_store
+    if _resume_store is None:
+        from src.database.vector_store import VectorStore
+        from src.services.embedding_service import embed_text
+
+        backend = config["RESUME_INDEX_BACKEND"]
+        if backend == "hnswlib" and importlib.util.find_spec("hnswlib") is None:
+            logger.send_warning("hnswlib is not installed, using brute-force search")
+            backend = "numpy"
+        dimensions = len(embed_text("dimension probe"))
+        _resume_store = VectorStore(
+            config["RESUME_INDEX_PATH"], dimensions, backend=backend
+        )
+    return _resume_store
+
+
+def resume_id(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.strip().encode()).hexdigest()
+
+
+def _index_resume(resume_text: str, metadata: Dict) -> bool:
+    from src.services.embedding_service import embed_text
+
+    return get_resume_store().add(
+        resume_id(resume_text),
+        embed_text(resume_text),
+        {**metadata, "indexed_at": int(time.time())},
+    )
+
+
+async def index_resume(resume_text: str, metadata: Dict) -> None:
+    """
+    Add a processed resume to the vector index. Failures are logged and never
+    break the analysis that triggered them.
+    """
+    if not config["RESUME_INDEX_ENABLED"]:
+        return
+
+    try:
+        await asyncio.to_thread(_index_resume, resume_text, metadata)
+    except Exception as e:
+        logger.send_warning(f"Could not index resume: {e}")
+
+
+def _search(job_posting: JobPosting, k: int) -> List[Dict]:
+    from src.services.embedding_service import embed_text
+
+    vector = job_posting.embedding or embed_text(job_posting.cleaned_text)
+    return [
+        {
+            **{f: metadata[f] for f in SEARCH_RESULT_FIELDS if f in metadata},
+            "score": score,
+        }
+        for metadata, score in get_resume_store().search(vector, k)
+    ]
+
+
+async def search_resumes(job_posting: JobPosting, k: int) -> List[Dict]:
+    """Top-k indexed resumes for a job posting, best match first"""
+    return await asyncio.to_thread(_search, job_posting, k)
@@ -1,43 +1,110 @@
+import asyncio
 import re
+from typing import Optional
 
 from fastapi import UploadFile
 
+from src.database.result_store import result_row
+from src.resources import get_resources
+from src.services.llm_usage import request_usage_context
 from src.services.pdf_reader_service import pdf_reader
+from src.services.resume_condenser import condense_resume
+from src.services.resume_index_service import index_resume, resume_id
 from src.services.similarity_service import SimilarityContent
-from src.helpers.logger import logger
+from src.utils.job_description_parser import ParseResult
+from src.utils.job_index import index_job_description
+from src.helpers.logger import logger, request_id_context
 from src.exceptions.NotResume import NotResume
+from src.utils.resume_sections import (
+    EDUCATION_TERMS,
+    EMAIL_PATTERN,
+    PHONE_PATTERN,
+    RESUME_SECTIONS,
+    resume_language,
+)
+
+
+def read_resume(resume: UploadFile, language: str) -> str:
+    """
+    Extract the text of the PDF and check that it is a resume
+    :raises NotResume: If the document is not a valid resume
+    """
+    pdf_content = pdf_reader(pdf_file=resume)
+    is_resume_content(resume=pdf_content, language=language)
+    return pdf_content
+
+
+async def extract_resume(resume: UploadFile, language: str) -> str:
+    """read_resume in a thread: extraction is CPU bound and must not block the loop"""
+    return await asyncio.to_thread(read_resume, resume, language)
 
 
 async def resume_matcher_service(
-    resume: UploadFile, job_description: str, language: str
+    resume: UploadFile,
+    job_description: ParseResult,
+    language: str,
+    resume_text: Optional[str] = None,
 ):
     """
     Function responsible for checking if the PDF contains actual resume content
     in either English or Portuguese
 
     :param resume: PDF content file
-    :param job_description: Optional job description to compare against
+    :param job_description: Parsed job description (content and closed flag)
     :param language: Language
+    :param resume_text: Text already returned by extract_resume, if any
     :return: tuple (bool, str, str) - (is_resume, reason, detected_language)
     :raises NotResume: If the document is not a valid resume
     """
-    pdf_content = pdf_reader(pdf_file=resume)
-    is_resume_content(resume=pdf_content, language=language)
-
+    pdf_content = resume_text
+    if pdf_content is None:
+        pdf_content = await extract_resume(resume=resume, language=language)
+    # No filename or other personal data next to the embedding
+    await index_resume(pdf_content, {"language": language})
+
+    condensed_resume = condense_resume(pdf_content)
+    job_posting = await index_job_description(job_description.content)
     similarity_score = SimilarityContent(
-        resume_text=pdf_content, job_description=job_description, language=language
+        resume_text=condensed_resume.text,
+        job_posting=job_posting,
+        language=language,
+        is_position_closed=job_description.is_position_closed,
     )
     similarity_response = await similarity_score.compute_similarity()
 
     logger.send_log(f"Similarity Score {similarity_response}")
 
-    return {
+    result = {
         "score": round(similarity_response["similarity_score"] * 100, 2),
         "missing_keywords": similarity_response["missing_keywords"],
         "total_missing": similarity_response["total_missing"],
         "message": similarity_response["feedback"],
         "is_position_closed": similarity_response["is_position_closed"],
     }
+    record_result(result, language, job_posting.content_hash, resume_id(pdf_content))
+    return result
+
+
+def record_result(result: dict, language: str, job_hash: str, resume_hash: str):
+    """
+    Queue the result for the analysis history (written in batches by the
+    worker's ResultSink, never during the request)
+    """
+    sink = get_resources().result_sink
+    if sink is None:
+        return
+
+    usage = request_usage_context.get()
+    sink.submit(
+        result_row(
+            result,
+            language,
+            job_hash=job_hash,
+            resume_hash=resume_hash,
+            request_id=request_id_context.get() or None,
+            llm_tokens=usage.total_tokens if usage is not None else None,
+        )
+    )
 
 
 def is_resume_content(resume: str, language: str):
@@ -53,51 +120,15 @@ def is_resume_content(resume: str, language: str):
 
     content_lower = resume.lower()
 
-    if language.lower() in ['pt-br', 'pt', 'portuguese']:
-        language = "Portuguese"
-        resume_sections = [
-            r"formação", r"formacao", r"educação", r"educacao",
-            r"experiência", r"experiencia", r"experiência profissional", r"experiencia profissional",
-            r"habilidades", r"competências", r"competencias", r"qualificações", r"qualificacoes",
-            r"certificações", r"certificacoes", r"certificados",
-            r"projetos", r"realizações", r"realizacoes", r"conquistas",
-            r"objetivo", r"objetivos", r"resumo", r"perfil", r"perfil profissional",
-            r"contato", r"informações pessoais", r"informacoes pessoais", r"referências", r"referencias",
-            r"idiomas", r"línguas", r"linguas",
-            r"currículo", r"curriculo", r"curriculum"
-        ]
-
-        education_terms = [
-            r"\bdiploma\b", r"\bbacharelado\b", r"\blicenciatura\b", r"\bmestrado\b",
-            r"\bdoutorado\b", r"\bpós-graduação\b", r"\bpos-graduacao\b",
-            r"\buniversidade\b", r"\bfaculdade\b", r"\bescola\b",
-            r"\bformado\b", r"\bgraduado\b", r"\bconcluído\b", r"\bconcluido\b"
-        ]
-    else:
-        language = "English"
-        resume_sections = [
-            r"education", r"experience", r"work experience", r"employment",
-            r"skills", r"technical skills", r"professional skills",
-            r"certifications", r"projects", r"achievements",
-            r"objective", r"summary", r"profile", r"professional profile",
-            r"contact", r"personal information", r"references", r"languages",
-            r"resume", r"curriculum vitae", r"cv"
-        ]
-
-        education_terms = [
-            r"\bdegree\b", r"\bbachelor\b", r"\bmaster\b", r"\bphd\b",
-            r"\buniversity\b", r"\bcollege\b", r"\bschool\b",
-            r"\bgraduated\b", r"\bgpa\b"
-        ]
+    language = resume_language(language)
+    resume_sections = RESUME_SECTIONS[language]
+    education_terms = EDUCATION_TERMS[language]
 
     section_pattern = r'\b(' + '|'.join(resume_sections) + r')\b'
     sections_found = len(re.findall(section_pattern, content_lower))
 
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    phone_pattern = r'(\+\d{1,3}[-\s]?)?\(?\d{2,3}\)?[-\s]?\d{3,5}[-\s]?\d{4}'
-
-    has_email = bool(re.search(email_pattern, resume))
-    has_phone = bool(re.search(phone_pattern, resume))
+    has_email = bool(EMAIL_PATTERN.search(resume))
+    has_phone = bool(PHONE_PATTERN.search(resume))
 
     if language.lower() in ['pt-br', 'pt', 'portuguese']:
         date_pattern = r'\b(jan|fev|mar|abr|mai|jun|jul|ago|set|out|nov|dez)[a-z]*[\s,-]+\d{4}\b'
@@ -2,14 +2,43 @@ import hashlib
 import json
 
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
+from src.config import config
+from src.database.redis_client import (
+    SIMILARITY_CACHE_EXPIRATION,
+    get_value,
+    set_with_expiry,
+)
+from src.exceptions.LLMBudgetExceeded import LLMBudgetExceeded
+from src.exceptions.LLMUnavailable import LLMUnavailable
+from src.helpers import metrics
+from src.helpers.logger import logger
+from src.services.llm_usage import BUDGET_DOWNGRADE
+from src.services.local_scorer import (
+    REASON_OVER_BUDGET,
+    REASON_POSITION_CLOSED,
+    local_similarity,
+)
+from src.services.near_duplicate_service import (
+    add_near_duplicate,
+    find_near_duplicate,
+    resume_signature,
+)
 from src.services.openai_llm import OpenAiLLM
-from src.utils.job_description_parser import ParseResult
-from src.database.redis_client import get_redis_client, set_with_expiry, get_value, RATE_LIMIT_EXPIRATION
+from src.utils.job_index import JobPosting
+from src.utils.text_features import count_tokens, normalize_text, tokenize
 
-redis_client = get_redis_client()
+CLOSED_SCORING_LOCAL = "local"
+CLOSED_SCORING_SKIP = "skip"
+
+CLOSED_POSITION_MESSAGE = {
+    "pt-BR": "Esta vaga não está mais aceitando candidaturas.",
+    "en": "This position is no longer accepting applications.",
+}
+
+# compute_similarity asks the LLM for the jaccard and the contextual scores
+LLM_CALLS_PER_SCORING = 2
 
 
 @dataclass
@@ -19,48 +48,187 @@ class MissingKeywordsInfo:
 
 
 class SimilarityContent:
-    def __init__(self, resume_text: str, job_description: str, language: str):
-        if not resume_text or not job_description:
+    def __init__(
+        self,
+        resume_text: str,
+        job_posting: JobPosting,
+        language: str,
+        is_position_closed: bool = False,
+    ):
+        if not resume_text or not job_posting or not job_posting.cleaned_text:
             raise ValueError("Resume text and job description cannot be empty.")
         self.resume_text = resume_text
-        self.job_description = job_description
+        self.job_posting = job_posting
+        self.job_description = job_posting.cleaned_text
         self.language = language
+        self.is_position_closed = is_position_closed
         self.open_ai = OpenAiLLM(language=self.language)
-        self.cache_key = self._generate_cache_key(resume_text, job_description)
+        # Feedback is written in the request language
+        self.posting_key = f"{job_posting.content_hash}:{language}"
+        self.cache_key = self._generate_cache_key(resume_text, self.posting_key)
+        self._signature: Optional[List[int]] = None
+        # Only LLM results are reused: a degraded answer is not kept for days
+        self._scored_by_llm = False
+        # Memoized per instance: an lru_cache on the methods kept the last
+        # 1000 instances (resume text, posting) alive for the process lifetime
+        # and cached coroutines, which cannot be awaited twice
+        self._jaccard: Optional[float] = None
+        self._contextual: Optional[dict] = None
 
-    @lru_cache(maxsize=1000)
     async def jaccard_similarity(self) -> float:
-        return await self.open_ai.calculate_jaccard_similarity(
-            self.resume_text, self.job_description
-        )
+        if self._jaccard is None:
+            self._jaccard = await self.open_ai.calculate_jaccard_similarity(
+                self.resume_text, self.job_description
+            )
+        return self._jaccard
 
-    @lru_cache(maxsize=1000)
     async def contextual_similarity(self) -> dict:
-        return await self.open_ai.calculate_contextual_similarity(
-            self.resume_text, self.job_description
-        )
+        if self._contextual is None:
+            self._contextual = await self.open_ai.calculate_contextual_similarity(
+                self.resume_text, self.job_description
+            )
+        return self._contextual
 
-    def _generate_cache_key(self, resume_text: str, job_description: str) -> str:
-        """Generate a similarity key"""
-        combined = f"{resume_text}:{job_description}"
+    def _generate_cache_key(self, resume_text: str, job_hash: str) -> str:
+        """Generate a similarity key, the same for a re-exported PDF"""
+        combined = f"{normalize_text(resume_text)}:{job_hash}"
         return f"similarity_result:{hashlib.sha256(combined.encode()).hexdigest()}"
 
+    def _missing_posting_keywords(self, limit: int = 15) -> List[str]:
+        """Indexed posting keywords that do not appear in the resume"""
+        resume_tokens = set(tokenize(self.resume_text))
+        return [k for k in self.job_posting.keywords if k not in resume_tokens][:limit]
+
+    def _count_avoided_llm_calls(self):
+        """Estimate of the LLM spend saved by not scoring with the LLM"""
+        metrics.increment("LLM/CallsAvoided", LLM_CALLS_PER_SCORING)
+        metrics.increment(
+            "LLM/PromptTokensAvoided",
+            LLM_CALLS_PER_SCORING
+            * (count_tokens(self.resume_text) + self.job_posting.token_count),
+        )
+
+    def _closed_position_analysis(self) -> dict:
+        """Fast path for postings that no longer accept applications"""
+        self._count_avoided_llm_calls()
+        if config["CLOSED_POSITION_SCORING"] == CLOSED_SCORING_SKIP:
+            metrics.increment("Scoring/ClosedSkipped")
+            language = "pt-BR" if self.language == "pt-BR" else "en"
+            return {
+                "score": 0.0,
+                "keywords": [],
+                "feedback": CLOSED_POSITION_MESSAGE[language],
+            }
+
+        metrics.increment("Scoring/ClosedLocal")
+        return local_similarity(
+            self.resume_text, self.job_posting, self.language, REASON_POSITION_CLOSED
+        )
+
+    async def _llm_analysis(self) -> dict:
+        try:
+            jaccard_score = await self.jaccard_similarity()
+            contextual_analysis = await self.contextual_similarity()
+        except LLMUnavailable:
+            if not config["LLM_DEGRADE_TO_LOCAL"]:
+                raise
+            logger.send_warning("LLM unavailable, degrading to the local scorer")
+            metrics.increment("Scoring/DegradedLocal")
+            return local_similarity(self.resume_text, self.job_posting, self.language)
+        except LLMBudgetExceeded as e:
+            if config["LLM_TOKEN_BUDGET_POLICY"] != BUDGET_DOWNGRADE:
+                raise
+            logger.send_warning(
+                f"LLM token budget exceeded ({e.tokens}/{e.budget}), "
+                f"downgrading to the local scorer"
+            )
+            metrics.increment("Scoring/BudgetLocal")
+            return local_similarity(
+                self.resume_text, self.job_posting, self.language, REASON_OVER_BUDGET
+            )
+
+        metrics.increment("Scoring/LLM")
+        self._scored_by_llm = True
+        return {
+            **contextual_analysis,
+            "score": (jaccard_score + contextual_analysis.get("score", 0.0)) / 2,
+        }
+
+    def _near_duplicate_result(self) -> Optional[dict]:
+        """
+        Result of an almost identical resume (one line edited, another PDF
+        export) already scored for this posting, its missing keywords
+        narrowed to those this resume still lacks. None when there is none.
+        """
+        self._signature = resume_signature(self.resume_text)
+        found = find_near_duplicate(
+            self.posting_key,
+            self._signature,
+            config["NEAR_DUPLICATE_THRESHOLD"],
+        )
+        if found is None:
+            return None
+
+        similarity, previous = found
+        logger.send_debug(f"Reusing the result of a near duplicate ({similarity:.2f})")
+        metrics.increment("Scoring/NearDuplicate")
+        self._count_avoided_llm_calls()
+        resume = f" {normalize_text(self.resume_text)} "
+        missing_keywords = [
+            keyword
+            for keyword in previous["missing_keywords"]
+            if f" {normalize_text(keyword)} " not in resume
+        ]
+        return {
+            **previous,
+            "missing_keywords": missing_keywords,
+            "total_missing": len(missing_keywords),
+            "is_position_closed": self.is_position_closed,
+        }
+
+    def _store_result(self, result: dict):
+        set_with_expiry(self.cache_key, json.dumps(result), SIMILARITY_CACHE_EXPIRATION)
+        if self._signature is not None:
+            add_near_duplicate(
+                self.posting_key,
+                self.cache_key.rsplit(":", 1)[-1],
+                self._signature,
+                result,
+            )
+
     async def compute_similarity(self) -> Dict[str, Union[float, List[str]]]:
         cached_result = get_value(self.cache_key)
         if cached_result:
+            metrics.increment("Scoring/Cached")
             return json.loads(cached_result)
 
-        jaccard_score = await self.jaccard_similarity()
-        contextual_analysis = await self.contextual_similarity()
-        combined_score = (jaccard_score + contextual_analysis.get("score", 0.0)) / 2
+        if self.is_position_closed and config["CLOSED_POSITION_SCORING"] in (
+            CLOSED_SCORING_LOCAL,
+            CLOSED_SCORING_SKIP,
+        ):
+            analysis = self._closed_position_analysis()
+        else:
+            if config["NEAR_DUPLICATE_ENABLED"]:
+                near_duplicate = self._near_duplicate_result()
+                if near_duplicate is not None:
+                    return near_duplicate
+            analysis = await self._llm_analysis()
 
-        return {
-            "similarity_score": round(combined_score, 2),
-            "missing_keywords": contextual_analysis.get("keywords", []),
-            "total_missing": len(contextual_analysis.get("keywords", [])),
-            "feedback": contextual_analysis.get("feedback"),
-            "is_position_closed": self.job_description.is_position_closed
-            if isinstance(self.job_description, ParseResult)
-               and hasattr(self.job_description, "is_position_closed")
-            else False,
+        if self._scored_by_llm:
+            # An empty list from the LLM is a full match, not a missing answer
+            missing_keywords = analysis.get("keywords") or []
+        else:
+            missing_keywords = (
+                analysis.get("keywords") or self._missing_posting_keywords()
+            )
+
+        result = {
+            "similarity_score": round(analysis.get("score", 0.0), 2),
+            "missing_keywords": missing_keywords,
+            "total_missing": len(missing_keywords),
+            "feedback": analysis.get("feedback"),
+            "is_position_closed": self.is_position_closed,
         }
+        if self._scored_by_llm:
+            self._store_result(result)
+        return result
@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.helpers.logger import logger
+
+
+class BrowserPool:
+    """
+    One headless Chromium per worker process, shared by every Playwright
+    fetch. Each page gets its own isolated context, and at most `size` pages
+    render at the same time.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._semaphore = asyncio.Semaphore(size)
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self.in_use = 0
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        async with self._lock:
+            if self.started:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            logger.send_log(f"Browser pool started ({self.size} pages)")
+
+    async def close(self):
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def context(self):
+        """New browser context, closed on exit (also when the fetch is cancelled)"""
+        async with self._semaphore:
+            self.in_use += 1
+            try:
+                async with self._open_context() as context:
+                    yield context
+            finally:
+                self.in_use -= 1
+
+    @asynccontextmanager
+    async def _open_context(self):
+        if not self.started:
+            # The browser crashed or was never launched in this worker
+            await self.start()
+        context = await self._browser.new_context()
+        try:
+            yield context
+        finally:
+            await context.close()
+
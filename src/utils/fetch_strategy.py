@@ -0,0 +1,132 @@
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.config import config
+from src.database.redis_client import FETCH_STRATEGY_EXPIRATION, get_redis_client
+from src.helpers.logger import logger
+
+SIMPLE_REQUEST = "simple_request"
+PLAYWRIGHT = "playwright"
+
+STATIC_PLAN: Tuple[str, ...] = (SIMPLE_REQUEST,)
+DYNAMIC_PLAN: Tuple[str, ...] = (PLAYWRIGHT,)
+UNKNOWN_PLAN: Tuple[str, ...] = (SIMPLE_REQUEST, PLAYWRIGHT)
+
+# Keeps a long streak from making a host's classification permanent
+MAX_SCORE = 5.0
+# Half-lives after which a host's scores are rewritten against a new
+# reference time, before the growth factor of the increments gets large
+REBASE_AFTER = 32
+
+
+def get_host(url: str) -> Optional[str]:
+    hostname = urlparse(url).hostname
+    return hostname.lower() if hostname else None
+
+
+def decay_scores(
+    raw: Dict[str, str], now: float, half_life: float
+) -> Dict[str, float]:
+    """
+    Decay the stored per-strategy scores to the current time.
+    :param raw: Redis hash with a score per strategy, as of its "updated_at"
+        reference time
+    :param now: Current timestamp
+    :param half_life: Seconds for a score to lose half of its weight
+    """
+    updated_at = float(raw.get("updated_at", now))
+    factor = 0.5 ** (max(now - updated_at, 0.0) / half_life)
+    scores = {}
+    for strategy in (SIMPLE_REQUEST, PLAYWRIGHT):
+        score = float(raw.get(strategy, 0.0)) * factor
+        scores[strategy] = max(-MAX_SCORE, min(MAX_SCORE, score))
+    return scores
+
+
+def plan_for(scores: Dict[str, float], threshold: float) -> Tuple[str, ...]:
+    """
+    Choose the strategies to try, in order, from the decayed scores.
+
+    Hosts where the simple request keeps working never launch a browser,
+    hosts where only Playwright works skip the simple request.
+    """
+    if scores[SIMPLE_REQUEST] >= threshold:
+        return STATIC_PLAN
+    if scores[PLAYWRIGHT] >= threshold and scores[SIMPLE_REQUEST] <= 0:
+        return DYNAMIC_PLAN
+    return UNKNOWN_PLAN
+
+
+class HostStrategyMemory:
+    """
+    Remembers in Redis which fetch strategy works for each host.
+
+    The stored scores are kept as of the hash's "updated_at" reference time
+    and each outcome is added with HINCRBYFLOAT, scaled to that time, so
+    workers recording at once do not overwrite each other's updates.
+    """
+
+    def __init__(
+        self,
+        half_life: Optional[float] = None,
+        threshold: Optional[float] = None,
+    ):
+        self.half_life = half_life or config["FETCH_STRATEGY_HALF_LIFE"]
+        self.threshold = (
+            config["FETCH_STRATEGY_THRESHOLD"] if threshold is None else threshold
+        )
+
+    @staticmethod
+    def _key(host: str) -> str:
+        return f"fetch_strategy:{host}"
+
+    def scores(self, host: str) -> Dict[str, float]:
+        try:
+            raw = get_redis_client().hgetall(self._key(host))
+        except Exception as e:
+            logger.send_warning(f"Error reading fetch strategy from Redis: {e}")
+            raw = {}
+        return decay_scores(raw or {}, time.time(), self.half_life)
+
+    def plan(self, url: str) -> Tuple[str, ...]:
+        host = get_host(url)
+        if host is None:
+            return UNKNOWN_PLAN
+        return plan_for(self.scores(host), self.threshold)
+
+    def record(self, url: str, strategy: str, success: bool) -> None:
+        """Reward or penalise a strategy for the url's host"""
+        host = get_host(url)
+        if host is None:
+            return
+
+        key = self._key(host)
+        now = time.time()
+        try:
+            client = get_redis_client()
+            pipe = client.pipeline()
+            pipe.hsetnx(key, "updated_at", now)
+            pipe.hgetall(key)
+            _, raw = pipe.execute()
+
+            scores = decay_scores(raw, now, self.half_life)
+            delta = 1.0 if success else -1.0
+            # Clamped against the score read: concurrent outcomes may go past
+            # MAX_SCORE by a little, reads clamp it again
+            target = max(-MAX_SCORE, min(MAX_SCORE, scores[strategy] + delta))
+            elapsed = (now - float(raw["updated_at"])) / self.half_life
+
+            pipe = client.pipeline()
+            if elapsed > REBASE_AFTER:
+                # Rare, and the only write that is not an increment
+                scores[strategy] = target
+                pipe.hset(key, mapping={**scores, "updated_at": now})
+            elif target != scores[strategy]:
+                pipe.hincrbyfloat(
+                    key, strategy, (target - scores[strategy]) * 2 ** elapsed
+                )
+            pipe.expire(key, FETCH_STRATEGY_EXPIRATION)
+            pipe.execute()
+        except Exception as e:
+            logger.send_warning(f"Error saving fetch strategy in Redis: {e}")
@@ -0,0 +1,198 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - exercised only without lxml installed
+    HAS_LXML = False
+
+STRIPPED_TAGS = ("script", "style", "header", "footer", "nav", "aside")
+
+_SELECTOR_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?"
+    r"(?:\.(?P<class_name>[\w-]+)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\[(?P<attribute>[\w-]+)(?:(?P<operator>\*?=)[\"'](?P<value>[^\"']*)[\"'])?\])?$"
+)
+
+
+@dataclass(frozen=True)
+class SelectorMatcher:
+    """Subset of CSS selectors used by the parser, matched without soupsieve"""
+
+    selector: str
+    tag: Optional[str] = None
+    attribute: Optional[str] = None
+    operator: Optional[str] = None
+    value: Optional[str] = None
+
+    def matches(self, tag: str, get_attribute: Callable[[str], Optional[str]]) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.attribute is None:
+            return True
+
+        attribute = get_attribute(self.attribute)
+        if attribute is None:
+            return False
+        if self.operator == "=":
+            return attribute == self.value
+        if self.operator == "*=":
+            return self.value in attribute
+        if self.operator == "~=":
+            return self.value in attribute.split()
+        return True
+
+
+def compile_selector(selector: str) -> SelectorMatcher:
+    """
+    Compile a simple selector (tag, .class, #id, [attr], [attr="v"],
+    [attr*="v"], optionally prefixed by a tag name).
+    :raises ValueError: For selectors outside of this subset
+    """
+    match = _SELECTOR_PATTERN.match(selector.strip())
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Unsupported selector: {selector}")
+
+    tag = match.group("tag").lower() if match.group("tag") else None
+    if match.group("class_name"):
+        return SelectorMatcher(selector, tag, "class", "~=", match.group("class_name"))
+    if match.group("id"):
+        return SelectorMatcher(selector, tag, "id", "=", match.group("id"))
+    if match.group("attribute"):
+        return SelectorMatcher(
+            selector,
+            tag,
+            match.group("attribute").lower(),
+            match.group("operator"),
+            match.group("value"),
+        )
+    return SelectorMatcher(selector, tag)
+
+
+@lru_cache(maxsize=32)
+def compile_selectors(selectors: Tuple[str, ...]) -> Tuple[SelectorMatcher, ...]:
+    return tuple(compile_selector(selector) for selector in selectors)
+
+
+def _best_match(elements: Iterable, matchers: Sequence[SelectorMatcher], describe):
+    """
+    Walk the elements once, in document order, and return the first element
+    matched by the highest priority selector, as chained select_one calls would.
+    """
+    best_index = len(matchers)
+    best_element = None
+
+    for element in elements:
+        tag, get_attribute = describe(element)
+        if tag is None:
+            continue
+        for index in range(best_index):
+            if matchers[index].matches(tag, get_attribute):
+                best_index, best_element = index, element
+                break
+        if best_index == 0:
+            break
+
+    return best_element
+
+
+def _join_strings(strings: Iterable[str]) -> str:
+    return " ".join(text for text in (string.strip() for string in strings) if text)
+
+
+def _parse_with_lxml(html_content: str):
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+    try:
+        return lxml_html.document_fromstring(html_content, parser=parser)
+    except ValueError:
+        # Unicode input carrying an XML encoding declaration
+        return lxml_html.document_fromstring(
+            html_content.encode("utf-8"), parser=parser
+        )
+
+
+def _describe_lxml(element):
+    if not isinstance(element.tag, str):
+        return None, None
+    return element.tag, element.get
+
+
+def _extract_with_lxml(
+    html_content: str, matchers: Sequence[SelectorMatcher]
+) -> Optional[str]:
+    try:
+        root = _parse_with_lxml(html_content)
+    except etree.ParserError:
+        return None
+
+    etree.strip_elements(root, *STRIPPED_TAGS, with_tail=False)
+
+    element = _best_match(root.iter(), matchers, _describe_lxml)
+    if element is not None:
+        return _join_strings(element.itertext())
+
+    body = root.find("body")
+    if body is not None:
+        return _join_strings(body.itertext())
+
+    return None
+
+
+def _describe_soup(element):
+    name = getattr(element, "name", None)
+    if name is None:
+        return None, None
+
+    def get_attribute(attribute: str) -> Optional[str]:
+        value = element.get(attribute)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    return name, get_attribute
+
+
+def _extract_with_soup(
+    html_content: str, matchers: Sequence[SelectorMatcher]
+) -> Optional[str]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    for element in soup(list(STRIPPED_TAGS)):
+        element.decompose()
+
+    element = _best_match(soup.descendants, matchers, _describe_soup)
+    if element is not None:
+        return element.get_text(separator=" ", strip=True)
+
+    if soup.body:
+        return soup.body.get_text(separator=" ", strip=True)
+
+    return None
+
+
+def extract_main_text(html_content: str, selectors: Sequence[str]) -> Optional[str]:
+    """
+    Extract the text of the main content block of a page.
+
+    Parses with lxml when installed (BeautifulSoup otherwise), drops scripts,
+    styles and page chrome, and resolves the whole selector list in a single
+    walk of the tree. Falls back to the text of <body>.
+    :param html_content: Raw HTML
+    :param selectors: Selectors in priority order
+    :return: Text with whitespace-separated strings or None
+    """
+    if not html_content or not html_content.strip():
+        return None
+
+    matchers = compile_selectors(tuple(selectors))
+    if HAS_LXML:
+        return _extract_with_lxml(html_content, matchers)
+    return _extract_with_soup(html_content, matchers)
@@ -1,13 +1,90 @@
 import asyncio
 import re
 from dataclasses import dataclass
-from typing import Optional
-
-import aiohttp
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
 
+from src.config import config
 from src.helpers.logger import logger
+from src.utils.browser_pool import BrowserPool
+from src.utils.fetch_strategy import (
+    PLAYWRIGHT,
+    SIMPLE_REQUEST,
+    UNKNOWN_PLAN,
+    HostStrategyMemory,
+)
+from src.utils.html_extractor import extract_main_text
+from src.utils.job_index import index_job_description
+
+if TYPE_CHECKING:
+    import aiohttp
+
+URL_PATTERN = re.compile(
+    r"^https?://"
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"
+    r"localhost|"
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
+    r"(?::\d+)?"
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+
+# Whitespace runs are collapsed with str.split, the remaining pass drops
+# everything that is not a word character, whitespace or basic punctuation.
+DISALLOWED_CHARS_PATTERN = re.compile(r"[^\w\s.,!?-]+")
+
+CLOSED_POSITION_INDICATORS: Dict[str, Tuple[str, ...]] = {
+    "en": (
+        "this role is currently no longer accepting new applications",
+        "applications closed",
+        "position filled",
+        "we are no longer accepting applications",
+    ),
+    "pt-BR": (
+        "vaga encerrada",
+        "não estamos mais aceitando candidaturas",
+        "processo seletivo encerrado",
+    ),
+}
+
+
+class ClosedPositionMatcher:
+    """
+    Detects closed-position notices in a page.
+
+    The indicators of every language are lowercased, deduplicated and reduced
+    to the ones not containing another indicator, then each remaining needle
+    is a C-level substring scan of the lowercased text. On large pages this
+    beats a single regex alternation, which CPython's engine tries position
+    by position.
+    """
+
+    def __init__(self, indicators: Iterable[str]):
+        needles = sorted({i.strip().lower() for i in indicators if i.strip()}, key=len)
+        self.indicators: Tuple[str, ...] = tuple(
+            needle
+            for index, needle in enumerate(needles)
+            if not any(shorter in needle for shorter in needles[:index])
+        )
+
+    @classmethod
+    def from_languages(
+        cls, *languages: Dict[str, Iterable[str]]
+    ) -> "ClosedPositionMatcher":
+        return cls(
+            indicator
+            for indicators_by_language in languages
+            for indicators in indicators_by_language.values()
+            for indicator in indicators
+        )
+
+    def matches(self, text: str) -> bool:
+        normalized_text = text.lower()
+        return any(indicator in normalized_text for indicator in self.indicators)
+
+
+closed_position_matcher = ClosedPositionMatcher.from_languages(
+    CLOSED_POSITION_INDICATORS, config.get("JOB_CLOSED_INDICATORS") or {}
+)
 
 
 @dataclass
@@ -43,174 +120,253 @@ class JobDescriptionParser:
             "#job-details",
         ]
 
+        self.strategy_memory = HostStrategyMemory()
+        self.hedge_delay = config["FETCH_HEDGE_DELAY"]
+        self.strategies = {
+            SIMPLE_REQUEST: self.try_simple_request,
+            PLAYWRIGHT: self.try_playwright,
+        }
+
+        # Per-worker resources, created by start() in the app lifespan
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self.browser_pool: Optional[BrowserPool] = None
+
+    async def start(self):
+        """Open the shared HTTP session and launch the browser pool"""
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool(config["BROWSER_POOL_SIZE"])
+        try:
+            await self.browser_pool.start()
+        except Exception as e:
+            # Retried on the first Playwright fetch
+            logger.send_warning(f"Browser pool not started: {e}")
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.browser_pool is not None:
+            await self.browser_pool.close()
+            self.browser_pool = None
+
     async def is_url(self, text: str) -> bool:
         """Verifica se o texto é uma URL válida"""
-        url_pattern = re.compile(
-            r"^https?://"
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"
-            r"localhost|"
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
-            r"(?::\d+)?"
-            r"(?:/?|[/?]\S+)$",
-            re.IGNORECASE,
-        )
-        return bool(url_pattern.match(text))
+        return bool(URL_PATTERN.match(text))
 
     def clean_text(self, text: str) -> str:
         """Limpa e formata o texto extraído"""
         if not text:
             return ""
 
-        text = re.sub(r"\s+", " ", text)
-        text = re.sub(r"[\n\r\t]", " ", text)
-        text = re.sub(r"[^\w\s.,!?-]", "", text)
+        text = " ".join(text.split())
+        text = DISALLOWED_CHARS_PATTERN.sub("", text)
 
         return text.strip()
 
     def is_job_finished(self, text: str) -> bool:
         """Verify if the job position is closed"""
-        normalized_text = text.lower()
-
-        closed_indicators = [
-            "this role is currently no longer accepting new applications",
-            "vaga encerrada",
-            "não estamos mais aceitando candidaturas",
-            "processo seletivo encerrado",
-            "applications closed",
-            "position filled",
-            "we are no longer accepting applications",
-        ]
-
-        for indicator in closed_indicators:
-            if indicator in normalized_text:
-                return True
+        return closed_position_matcher.matches(text)
 
     def extract_text_from_html(
         self, html_content: str, selectors: list
     ) -> Optional[str]:
-        """Extrai texto do HTML usando BeautifulSoup"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        """Extrai o texto principal do HTML (lxml, selectors em uma única passada)"""
+        return extract_main_text(html_content, selectors)
 
-        for element in soup(["script", "style", "header", "footer", "nav", "aside"]):
-            element.decompose()
-
-        for selector in selectors:
-            try:
-                content = soup.select_one(selector)
-                if content:
-                    return content.get_text(separator=" ", strip=True)
-            except Exception:
-                continue
-
-        if soup.body:
-            return soup.body.get_text(separator=" ", strip=True)
-
-        return None
+    async def extract_text_from_html_async(
+        self, html_content: str, selectors: list
+    ) -> Optional[str]:
+        """Parse em thread separada para páginas grandes não bloquearem o event loop"""
+        return await asyncio.to_thread(
+            self.extract_text_from_html, html_content, selectors
+        )
 
     async def try_simple_request(self, url: str) -> ParseResult:
         """Tenta fazer uma requisição HTTP simples"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, headers=self.headers, timeout=10
-                ) as response:
-                    if response.status != 200:
-                        return ParseResult(
-                            None,
-                            "simple_request",
-                            False,
-                            f"Status code: {response.status}",
-                        )
-
-                    html_content = await response.text()
-                    text = self.extract_text_from_html(
-                        html_content, self.content_selectors
-                    )
+            if self.session is not None and not self.session.closed:
+                return await self._request_page(self.session, url)
+            import aiohttp
 
-                    if text and len(text) > 100:
-                        return ParseResult(
-                            self.clean_text(text),
-                            "simple_request",
-                            True,
-                            None,
-                            self.is_job_finished(text),
-                        )
-
-                    return ParseResult(
-                        None, "simple_request", False, "Conteúdo insuficiente"
-                    )
+            async with aiohttp.ClientSession() as session:
+                return await self._request_page(session, url)
         except Exception as e:
             return ParseResult(None, "simple_request", False, str(e))
 
+    async def _request_page(
+        self, session: "aiohttp.ClientSession", url: str
+    ) -> ParseResult:
+        async with session.get(url, headers=self.headers, timeout=10) as response:
+            if response.status != 200:
+                return ParseResult(
+                    None,
+                    "simple_request",
+                    False,
+                    f"Status code: {response.status}",
+                )
+
+            html_content = await response.text()
+            text = await self.extract_text_from_html_async(
+                html_content, self.content_selectors
+            )
+
+            if text and len(text) > 100:
+                return ParseResult(
+                    self.clean_text(text),
+                    "simple_request",
+                    True,
+                    None,
+                    self.is_job_finished(text),
+                )
+
+            return ParseResult(None, "simple_request", False, "Conteúdo insuficiente")
+
     async def try_playwright(self, url: str) -> ParseResult:
         """Tenta usar Playwright para renderizar JavaScript"""
         try:
+            if self.browser_pool is not None:
+                # Contexto fechado também quando a tentativa é cancelada pelo hedge
+                async with self.browser_pool.context() as context:
+                    return await self._render_page(context, url)
+
+            from playwright.async_api import async_playwright
+
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page = await context.new_page()
-
-                await page.goto(url, wait_until="networkidle")
-                await asyncio.sleep(2)
-
-                for selector in self.content_selectors:
-                    try:
-                        element = await page.query_selector(selector)
-                        if element:
-                            content = await element.inner_text()
-                            if content and len(content) > 100:
-                                await browser.close()
-                                return ParseResult(
-                                    self.clean_text(content), "playwright", True
-                                )
-                    except Exception:
-                        continue
-
-                content = await page.content()
-                text = self.extract_text_from_html(content, self.content_selectors)
-                await browser.close()
-
-                if text and len(text) > 100:
-                    return ParseResult(
-                        self.clean_text(text),
-                        "playwright",
-                        True,
-                        None,
-                        self.is_job_finished(text),
-                    )
-
-                return ParseResult(None, "playwright", False, "Conteúdo insuficiente")
+                try:
+                    return await self._render_page(await browser.new_context(), url)
+                finally:
+                    await browser.close()
 
         except Exception as e:
             return ParseResult(None, "playwright", False, str(e))
 
-    async def parse(self, text: str) -> Optional[str]:
+    async def _render_page(self, context, url: str) -> ParseResult:
+        page = await context.new_page()
+
+        await page.goto(url, wait_until="networkidle")
+        await asyncio.sleep(2)
+
+        for selector in self.content_selectors:
+            try:
+                element = await page.query_selector(selector)
+                if element:
+                    content = await element.inner_text()
+                    if content and len(content) > 100:
+                        # O aviso de vaga encerrada pode estar fora do seletor
+                        is_closed = self.is_job_finished(
+                            content
+                        ) or self.is_job_finished(await page.inner_text("body"))
+                        return ParseResult(
+                            self.clean_text(content), "playwright", True, None, is_closed
+                        )
+            except Exception:
+                continue
+
+        content = await page.content()
+        text = await self.extract_text_from_html_async(content, self.content_selectors)
+
+        if text and len(text) > 100:
+            return ParseResult(
+                self.clean_text(text),
+                "playwright",
+                True,
+                None,
+                self.is_job_finished(text),
+            )
+
+        return ParseResult(None, "playwright", False, "Conteúdo insuficiente")
+
+    async def _attempt(self, url: str, strategy: str) -> ParseResult:
+        result = await self.strategies[strategy](url)
+        logger.send_log(f"Resultado {strategy}: {result.success}")
+        # Two Redis round trips, off the event loop
+        await asyncio.to_thread(
+            self.strategy_memory.record, url, strategy, result.success
+        )
+        return result
+
+    async def _fetch_sequential(self, url: str, plan: Tuple[str, ...]) -> ParseResult:
+        result = ParseResult(None, "none", False, "Nenhuma estratégia disponível")
+        for strategy in plan:
+            result = await self._attempt(url, strategy)
+            if result.success:
+                break
+        return result
+
+    async def _fetch_hedged(self, url: str) -> ParseResult:
+        """
+        Starts the simple request and, if it has not produced content within
+        the hedge delay, races Playwright against it. The first successful
+        result wins and the other attempt is cancelled (closing the browser).
+        """
+        simple = asyncio.create_task(self._attempt(url, SIMPLE_REQUEST))
+        pending = {simple}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if done:
+                result = simple.result()
+                if result.success:
+                    return result
+                return await self._attempt(url, PLAYWRIGHT)
+
+            logger.send_log(
+                f"simple_request sem resposta em {self.hedge_delay}s, "
+                "iniciando Playwright em paralelo"
+            )
+            pending.add(asyncio.create_task(self._attempt(url, PLAYWRIGHT)))
+
+            result = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if result.success:
+                        return result
+            return result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def parse(self, text: str) -> Optional[ParseResult]:
         """Método principal para fazer parse do conteúdo"""
         if not await self.is_url(text):
-            return text
+            return ParseResult(text, "text", True, None, self.is_job_finished(text))
 
         logger.send_log(f"Iniciando parse da URL: {text}")
 
-        result = await self.try_simple_request(text)
-        logger.send_log(f"Resultado simple_request: {result.success}")
+        plan = await asyncio.to_thread(self.strategy_memory.plan, text)
+        logger.send_log(f"Estratégias para a URL: {', '.join(plan)}")
 
-        if result.success:
-            return result.content
-
-        logger.send_log("Trying with Playwright...")
-        result = await self.try_playwright(text)
-        logger.send_log(f"Resultado playwright: {result.success}")
+        if plan == UNKNOWN_PLAN and self.hedge_delay > 0:
+            result = await self._fetch_hedged(text)
+        else:
+            result = await self._fetch_sequential(text, plan)
 
         if result.success:
-            return result.content
+            return result
 
         logger.send_error("Todas as tentativas falharam")
         return None
 
 
-parser = JobDescriptionParser()
-
+async def parse_job_description(
+    text: str, parser: Optional[JobDescriptionParser] = None
+) -> Optional[ParseResult]:
+    """Function to parse job description and index the posting artifacts"""
+    if parser is None:
+        from src.resources import get_resources
 
-async def parse_job_description(text: str) -> Optional[str]:
-    """Function to parse job description"""
-    return await parser.parse(text)
+        parser = get_resources().parser
+    result = await parser.parse(text)
+    if result is not None and result.content:
+        await index_job_description(result.content)
+    return result
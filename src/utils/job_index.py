@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from src.config import config
+from src.database.redis_client import JOB_INDEX_EXPIRATION, get_value, set_with_expiry
+from src.helpers.logger import logger
+from src.utils.text_features import count_tokens, extract_keywords
+
+# Recently used postings are also kept in process: a posting analysed against
+# many resumes is then loaded from Redis once per worker.
+LOCAL_CACHE_SIZE = 256
+
+
+@dataclass
+class JobPosting:
+    """Artifacts derived once per job posting and shared by every analysis"""
+
+    content_hash: str
+    cleaned_text: str
+    keywords: List[str]
+    token_count: int
+    embedding: Optional[List[float]] = None
+
+
+_local_cache: "OrderedDict[str, JobPosting]" = OrderedDict()
+
+
+def job_content_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode()).hexdigest()
+
+
+def _key(content_hash: str) -> str:
+    return f"job_index:{content_hash}"
+
+
+def _remember(posting: JobPosting) -> JobPosting:
+    _local_cache[posting.content_hash] = posting
+    _local_cache.move_to_end(posting.content_hash)
+    while len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+    return posting
+
+
+def build_job_posting(text: str) -> JobPosting:
+    """Compute the artifacts of a job posting (CPU only, embedding excluded)"""
+    cleaned_text = " ".join(text.split())
+    return JobPosting(
+        content_hash=job_content_hash(text),
+        cleaned_text=cleaned_text,
+        keywords=extract_keywords(cleaned_text),
+        token_count=count_tokens(cleaned_text),
+    )
+
+
+def get_job_posting(content_hash: str) -> Optional[JobPosting]:
+    """Load an indexed posting from the process cache or Redis"""
+    posting = _local_cache.get(content_hash)
+    if posting is not None:
+        _local_cache.move_to_end(content_hash)
+        return posting
+
+    stored = get_value(_key(content_hash))
+    if not stored:
+        return None
+
+    try:
+        return _remember(JobPosting(**json.loads(stored)))
+    except (TypeError, ValueError) as e:
+        logger.send_warning(f"Invalid job index entry {content_hash}: {e}")
+        return None
+
+
+async def index_job_description(text: str) -> JobPosting:
+    """
+    Return the artifacts of a job posting, computing and storing them in
+    Redis the first time the posting is seen.
+    :param text: Job description text (already parsed when it was a URL)
+    """
+    posting = get_job_posting(job_content_hash(text))
+    if posting is not None:
+        return posting
+
+    posting = await asyncio.to_thread(build_job_posting, text)
+
+    if config["JOB_INDEX_EMBEDDINGS"]:
+        from src.services.embedding_service import embed_text, to_list
+
+        try:
+            vector = await asyncio.to_thread(embed_text, posting.cleaned_text)
+            posting.embedding = to_list(vector)
+        except Exception as e:
+            logger.send_warning(f"Could not embed job posting: {e}")
+
+    set_with_expiry(
+        _key(posting.content_hash), json.dumps(asdict(posting)), JOB_INDEX_EXPIRATION
+    )
+    logger.send_log(
+        {
+            "message": "Job posting indexed",
+            "content_hash": posting.content_hash,
+            "token_count": posting.token_count,
+            "keywords": len(posting.keywords),
+        }
+    )
+    return _remember(posting)
@@ -0,0 +1,64 @@
+"""
+MinHash signatures of texts, for near-duplicate detection: the share of equal
+positions of two signatures estimates the Jaccard similarity of their word
+shingles, and LSH bands of the signature find the candidates without
+comparing against every stored one.
+"""
+import hashlib
+from typing import List, Set
+
+import numpy as np
+
+from src.utils.text_features import normalize_text
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs above ~0.8 Jaccard share a band (are candidates)
+# 95% of the time, below ~0.5 rarely do; the threshold is checked afterwards
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+
+_PRIME = (1 << 31) - 1
+# Fixed seed: signatures are stored and compared across workers and deploys
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> List[int]:
+    """MinHash of the word shingles, NUM_PERMUTATIONS values"""
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+            for s in shingles(text)
+        ),
+        dtype=np.uint64,
+    )
+    if not hashes.size:
+        return [_PRIME] * NUM_PERMUTATIONS
+    # (a * x + b) mod p for every permutation and shingle; < 2^62, no overflow
+    permuted = (np.outer(_A, hashes % _PRIME) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).tolist()
+
+
+def band_hashes(values: List[int]) -> List[str]:
+    """One bucket per band: near duplicates collide in at least one of them"""
+    array = np.asarray(values, dtype=np.uint64)
+    return [
+        hashlib.blake2b(array[band * ROWS : (band + 1) * ROWS].tobytes(), digest_size=8)
+        .hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def estimated_jaccard(first: List[int], second: List[int]) -> float:
+    if len(first) != len(second) or not first:
+        return 0.0
+    return float(np.mean(np.asarray(first) == np.asarray(second)))
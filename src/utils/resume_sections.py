@@ -0,0 +1,66 @@
+import re
+
+PORTUGUESE_LANGUAGES = ("pt-br", "pt", "portuguese")
+
+RESUME_SECTIONS = {
+    "Portuguese": [
+        r"formação", r"formacao", r"educação", r"educacao",
+        r"experiência", r"experiencia", r"experiência profissional", r"experiencia profissional",
+        r"habilidades", r"competências", r"competencias", r"qualificações", r"qualificacoes",
+        r"certificações", r"certificacoes", r"certificados",
+        r"projetos", r"realizações", r"realizacoes", r"conquistas",
+        r"objetivo", r"objetivos", r"resumo", r"perfil", r"perfil profissional",
+        r"contato", r"informações pessoais", r"informacoes pessoais", r"referências", r"referencias",
+        r"idiomas", r"línguas", r"linguas",
+        r"currículo", r"curriculo", r"curriculum"
+    ],
+    "English": [
+        r"education", r"experience", r"work experience", r"employment",
+        r"skills", r"technical skills", r"professional skills",
+        r"certifications", r"projects", r"achievements",
+        r"objective", r"summary", r"profile", r"professional profile",
+        r"contact", r"personal information", r"references", r"languages",
+        r"resume", r"curriculum vitae", r"cv"
+    ],
+}
+
+EDUCATION_TERMS = {
+    "Portuguese": [
+        r"\bdiploma\b", r"\bbacharelado\b", r"\blicenciatura\b", r"\bmestrado\b",
+        r"\bdoutorado\b", r"\bpós-graduação\b", r"\bpos-graduacao\b",
+        r"\buniversidade\b", r"\bfaculdade\b", r"\bescola\b",
+        r"\bformado\b", r"\bgraduado\b", r"\bconcluído\b", r"\bconcluido\b"
+    ],
+    "English": [
+        r"\bdegree\b", r"\bbachelor\b", r"\bmaster\b", r"\bphd\b",
+        r"\buniversity\b", r"\bcollege\b", r"\bschool\b",
+        r"\bgraduated\b", r"\bgpa\b"
+    ],
+}
+
+# Resumes are often written in another language than the one of the request
+ALL_SECTION_NAMES = frozenset(
+    name for names in RESUME_SECTIONS.values() for name in names
+)
+
+# Sections that carry no signal for matching a resume against a job
+DROPPED_SECTIONS = {
+    "contato", "informações pessoais", "informacoes pessoais",
+    "referências", "referencias",
+    "contact", "personal information", "references",
+}
+
+# Document titles: the line is dropped, the text under it is kept
+TITLE_HEADERS = {
+    "currículo", "curriculo", "curriculum", "resume", "curriculum vitae", "cv",
+}
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-\s]?)?\(?\d{2,3}\)?[-\s]?\d{3,5}[-\s]?\d{4}')
+
+
+def resume_language(language: str) -> str:
+    """Map the request language to the key of the section tables"""
+    if language.lower() in PORTUGUESE_LANGUAGES:
+        return "Portuguese"
+    return "English"
@@ -0,0 +1,74 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List
+
+# Words may carry the symbols used by technology names: c++, c#, node.js, ci/cd
+WORD_PATTERN = re.compile(r"[^\W_][\w+#./-]*")
+
+STOPWORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being but by can
+    could do does for from has have having he her his how i if in into is it its
+    job may more most must my no not of on or our out over per role she should
+    so such than that the their them then there these they this those through
+    to under up us we were what when where which while who will with within
+    would you your years year experience work working team teams strong ability
+    knowledge skills including etc using well new plus need looking seeking
+    join ideal candidate preferred required requirements
+    ao aos as à às com como da das de do dos e é em entre era essa esse esta
+    este eu foi for isso já mais mas na nas no nos o os ou para pela pelo por
+    que se sem ser seu sua suas seus também um uma umas uns vaga vagas você
+    anos experiência conhecimento conhecimentos trabalho equipe sobre
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words, keeping symbols such as c++ or node.js intact"""
+    return [
+        token.rstrip("./-")
+        for token in WORD_PATTERN.findall(text.lower())
+        if token.rstrip("./-")
+    ]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercased words only: layout, punctuation and PDF re-exports do not count"""
+    return " ".join(tokenize(text))
+
+
+def extract_keywords(text: str, limit: int = 40) -> List[str]:
+    """
+    Most frequent non-stopword terms of a text, ties kept in order of first
+    appearance. Cheap, local stand-in for the requirement keywords.
+    """
+    counts = Counter(
+        token
+        for token in tokenize(text)
+        if len(token) > 1 and token not in STOPWORDS and not token.isdigit()
+    )
+    return [token for token, _ in counts.most_common(limit)]
+
+
+@lru_cache(maxsize=8)
+def _encoding_for(model: str):
+    """tiktoken encoding for the model, None when tiktoken cannot load one"""
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Not installed, or the BPE file could not be downloaded
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Token count with tiktoken, or the usual 4 characters per token estimate"""
+    encoding = _encoding_for(model)
+    if encoding is None:
+        return max(1, len(text) // 4) if text else 0
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from src.database.result_store import ResultStore, result_row
+
+RESULT = {
+    "score": 72.5,
+    "missing_keywords": ["kafka"],
+    "total_missing": 1,
+    "message": "Bom alinhamento",
+    "is_position_closed": False,
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_store_uses_wal(store):
+    connection = sqlite3.connect(store.path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    connection.close()
+
+
+def test_results_round_trip(store):
+    rows = [
+        result_row({**RESULT, "score": float(i)}, "pt-BR", job_hash=f"job-{i % 2}")
+        for i in range(5)
+    ]
+
+    assert store.write_many(rows) == 5
+
+    results = store.read()
+    assert [r["score"] for r in results] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert results[0]["payload"]["message"] == "Bom alinhamento"
+    assert results[0]["language"] == "pt-BR"
+    assert store.read(limit=2)[-1]["score"] == 1.0
+
+
+def test_bulk_reads_page_through_the_table(store):
+    store.write_many([result_row(RESULT, "en") for _ in range(25)])
+
+    results = list(store.iter_results(batch_size=10))
+
+    assert len(results) == 25
+    assert len({r["id"] for r in results}) == 25
+
+
+def test_time_window_and_summary(store):
+    old = {**result_row(RESULT, "en", job_hash="a"), "created_at": 100.0}
+    new = {
+        **result_row({**RESULT, "is_position_closed": True}, "en", job_hash="b"),
+        "created_at": 200.0,
+        "llm_tokens": 900,
+    }
+    store.write_many([old, new])
+
+    assert [r["job_hash"] for r in store.read(since=150)] == ["b"]
+    assert [r["job_hash"] for r in store.read(until=150)] == ["a"]
+    assert store.summary() == {
+        "analyses": 2,
+        "average_score": 72.5,
+        "closed_positions": 1,
+        "llm_tokens": 900,
+        "job_postings": 2,
+    }
+
+
+def test_other_connections_read_while_writing(store):
+    store.write_many([result_row(RESULT, "en")])
+    reader = ResultStore(store.path)
+
+    store.write_many([result_row(RESULT, "en")])
+
+    assert len(reader.read()) == 2
+    reader.close()
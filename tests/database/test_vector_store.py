@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.database import vector_store
+from src.database.vector_store import VectorStore
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def random_vectors(count, dimensions, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimensions))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+        np.float32
+    )
+
+
+def test_search_returns_best_matches_first(tmp_path):
+    store = VectorStore(str(tmp_path), dimensions=3)
+    store.add("python", unit([1, 0, 0]), {"filename": "python.pdf"})
+    store.add("java", unit([0, 1, 0]), {"filename": "java.pdf"})
+    store.add("fullstack", unit([1, 1, 0]), {"filename": "fullstack.pdf"})
+
+    results = store.search(unit([1, 0.2, 0]), k=2)
+
+    assert [metadata["id"] for metadata, _ in results] == ["python", "fullstack"]
+    assert results[0][1] > results[1][1]
+
+
+def test_duplicate_ids_are_not_added(tmp_path):
+    store = VectorStore(str(tmp_path), dimensions=2)
+
+    assert store.add("a", unit([1, 0]), {}) is True
+    assert store.add("a", unit([0, 1]), {}) is False
+    assert len(store) == 1
+
+
+def test_store_grows_and_persists(tmp_path):
+    vectors = random_vectors(50, 8)
+    with patch.object(vector_store, "INITIAL_CAPACITY", 4):
+        store = VectorStore(str(tmp_path), dimensions=8)
+        for index, vector in enumerate(vectors):
+            store.add(str(index), vector, {"n": index})
+
+        reopened = VectorStore(str(tmp_path), dimensions=8)
+
+    assert len(reopened) == 50
+    assert reopened.search(vectors[37], k=1)[0][0] == {"n": 37, "id": "37"}
+
+
+def test_rows_added_by_another_process_are_visible(tmp_path):
+    reader = VectorStore(str(tmp_path), dimensions=2)
+    writer = VectorStore(str(tmp_path), dimensions=2)
+
+    writer.add("b", unit([0, 1]), {})
+
+    assert "b" not in reader
+    assert reader.search(unit([0, 1]), k=5)[0][0]["id"] == "b"
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    VectorStore(str(tmp_path), dimensions=4)
+
+    with pytest.raises(ValueError):
+        VectorStore(str(tmp_path), dimensions=8)
+
+
+def test_empty_store_search(tmp_path):
+    assert VectorStore(str(tmp_path), dimensions=2).search(unit([1, 0])) == []
+
+
+def test_hnswlib_backend_matches_brute_force(tmp_path):
+    pytest.importorskip("hnswlib")
+    vectors = random_vectors(200, 16, seed=1)
+    exact = VectorStore(str(tmp_path / "exact"), dimensions=16)
+    approximate = VectorStore(str(tmp_path / "ann"), dimensions=16, backend="hnswlib")
+    for index, vector in enumerate(vectors):
+        exact.add(str(index), vector, {})
+        approximate.add(str(index), vector, {})
+
+    query = vectors[5]
+    assert [m["id"] for m, _ in approximate.search(query, 5)] == [
+        m["id"] for m, _ in exact.search(query, 5)
+    ]
+
+
+def test_concurrent_searches_load_new_rows_once(tmp_path):
+    writer = VectorStore(str(tmp_path), dimensions=4)
+    reader = VectorStore(str(tmp_path), dimensions=4)
+    vectors = random_vectors(20, 4)
+    for number, vector in enumerate(vectors):
+        writer.add(f"r{number}", vector, {})
+
+    loads = json.loads
+
+    def slow_loads(line):
+        time.sleep(0.001)  # widens the window between reading and appending rows
+        return loads(line)
+
+    with patch.object(vector_store.json, "loads", slow_loads):
+        threads = [
+            threading.Thread(target=reader.search, args=(vectors[0],))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(reader) == 20
+    assert all(reader._metadata[row]["id"] == f"r{row}" for row in range(20))
+    assert reader.search(vectors[7], k=1)[0][0]["id"] == "r7"
@@ -0,0 +1,48 @@
+import logging
+from logging.handlers import RotatingFileHandler, WatchedFileHandler
+
+import pytest
+
+from src.helpers.logger import (
+    ROTATION_EXTERNAL,
+    ROTATION_NONE,
+    ROTATION_SIZE,
+    Logger,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_logger():
+    # Logger() configures the shared "AppLogger": restore its handlers
+    shared = logging.getLogger("AppLogger")
+    handlers = list(shared.handlers)
+    shared.handlers.clear()
+    yield shared
+    for handler in shared.handlers:
+        handler.close()
+    shared.handlers[:] = handlers
+
+
+@pytest.mark.parametrize(
+    "rotation, handler_class",
+    [
+        (ROTATION_SIZE, RotatingFileHandler),
+        (ROTATION_EXTERNAL, WatchedFileHandler),
+    ],
+)
+def test_file_handler_follows_the_rotation(tmp_path, rotation, handler_class):
+    path = tmp_path / "app.log"
+    logger = Logger(str(path), rotation)
+
+    file_handlers = [h for h in logger.logger.handlers if hasattr(h, "baseFilename")]
+    assert [type(h) for h in file_handlers] == [handler_class]
+    logger.send_warning("written")
+    assert "written" in path.read_text()
+
+
+def test_workers_can_log_to_stdout_only(tmp_path):
+    logger = Logger(str(tmp_path / "app.log"), ROTATION_NONE)
+
+    assert not any(hasattr(h, "baseFilename") for h in logger.logger.handlers)
+    logger.send_log("stdout")
+    assert not (tmp_path / "app.log").exists()
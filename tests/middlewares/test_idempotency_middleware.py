@@ -0,0 +1,244 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.exceptions.NotResume import NotResume
+from src.helpers import metrics
+from src.middlewares import idempotency_middleware
+from src.middlewares.exception_middleware import CatchExceptionMiddleware
+from src.middlewares.idempotency_middleware import (
+    PENDING,
+    REPLAY_HEADER,
+    IdempotencyMiddleware,
+)
+from src.middlewares.rate_limit_middleware import RateLimitMiddleware
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def setex(self, key, seconds, value):
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        return 1 if self.values.pop(key, None) is not None else 0
+
+    # Rate limiter
+    def exists(self, key):
+        return key in self.lists
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def expire(self, key, seconds):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+def make_app(calls, release=None):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(CatchExceptionMiddleware)
+    app.add_middleware(IdempotencyMiddleware)
+
+    @app.post("/analyze/resume")
+    async def analyze(request: Request, kind: str = "ok"):
+        await request.body()
+        calls.append(kind)
+        if release is not None:
+            await release.wait()
+        if kind == "resume":
+            raise NotResume(language="en")
+        if kind == "fail":
+            raise RuntimeError("boom")
+        return {"analysis": len(calls)}
+
+    return app
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    with patch(
+        "src.middlewares.rate_limit_middleware.get_redis_client", return_value=client
+    ), patch.object(
+        idempotency_middleware, "get_redis_client", return_value=client
+    ):
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+
+
+def test_completed_request_is_replayed_without_counting(redis):
+    calls = []
+    client = TestClient(make_app(calls), raise_server_exceptions=False)
+    headers = {"X-Request-ID": "retry-1"}
+
+    first = client.post("/analyze/resume", headers=headers)
+    retry = client.post("/analyze/resume", headers=headers)
+
+    assert calls == ["ok"]
+    assert retry.status_code == 200 and retry.json() == first.json()
+    assert retry.headers[REPLAY_HEADER] == "true"
+    assert retry.headers["X-Request-ID"] == "retry-1"
+    assert REPLAY_HEADER not in first.headers
+    assert redis.llen("rate_limit:testclient") == 1
+    assert metrics.snapshot()["counters"]["Idempotency/Replayed"] == 1
+
+
+def test_only_final_answers_are_stored(redis):
+    calls = []
+    client = TestClient(make_app(calls), raise_server_exceptions=False)
+
+    for kind in ("resume", "resume", "fail", "fail"):
+        client.post(
+            f"/analyze/resume?kind={kind}", headers={"X-Request-ID": f"id-{kind}"}
+        )
+    client.post("/analyze/resume")
+    client.post("/analyze/resume")
+
+    # NotResume (400) is replayed, the 500 and requests without an ID run again
+    assert calls == ["resume", "fail", "fail", "ok", "ok"]
+    assert "idempotency:POST:/analyze/resume:id-fail" not in redis.values
+
+
+@pytest.mark.asyncio
+async def test_retry_attaches_to_the_request_in_flight(redis):
+    calls = []
+    release = asyncio.Event()
+    transport = httpx.ASGITransport(app=make_app(calls, release))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"X-Request-ID": "slow"}
+        first = asyncio.create_task(client.post("/analyze/resume", headers=headers))
+        await asyncio.sleep(0.05)
+        retry = asyncio.create_task(client.post("/analyze/resume", headers=headers))
+        await asyncio.sleep(0.05)
+        release.set()
+        first, retry = await first, await retry
+
+    assert calls == ["ok"]
+    assert retry.json() == first.json() == {"analysis": 1}
+    assert retry.headers[REPLAY_HEADER] == "true"
+    assert metrics.snapshot()["counters"]["Idempotency/Attached"] == 1
+
+
+def test_waits_for_another_worker_then_gives_up(redis):
+    calls = []
+    client = TestClient(make_app(calls), raise_server_exceptions=False)
+    redis.values["idempotency:POST:/analyze/resume:elsewhere"] = PENDING
+
+    # Middlewares are built on the first request, with the patched config
+    with patch.object(idempotency_middleware, "POLL_INTERVAL", 0.01), patch.dict(
+        idempotency_middleware.config, {"IDEMPOTENCY_WAIT": 0.05}
+    ):
+        response = client.post(
+            "/analyze/resume", headers={"X-Request-ID": "elsewhere"}
+        )
+
+    assert calls == []
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_reused_id_on_a_different_request_is_rejected(redis):
+    calls = []
+    client = TestClient(make_app(calls), raise_server_exceptions=False)
+    headers = {"X-Request-ID": "reused"}
+
+    first = client.post("/analyze/resume", headers=headers, content=b"resume-a")
+    other = client.post("/analyze/resume", headers=headers, content=b"resume-b")
+    retry = client.post("/analyze/resume", headers=headers, content=b"resume-a")
+
+    assert calls == ["ok"]
+    assert other.status_code == 422 and REPLAY_HEADER not in other.headers
+    assert retry.json() == first.json() and retry.headers[REPLAY_HEADER] == "true"
+    assert metrics.snapshot()["counters"]["Idempotency/Mismatch"] == 1
+
+
+def test_multipart_retry_is_replayed(redis):
+    calls = []
+    client = TestClient(make_app(calls), raise_server_exceptions=False)
+    headers = {"X-Request-ID": "upload-1"}
+
+    def upload(pdf):
+        # Every send gets a new random boundary
+        return client.post(
+            "/analyze/resume",
+            headers=headers,
+            files={"file": ("resume.pdf", pdf, "application/pdf")},
+            data={"job_description": "Python engineer"},
+        )
+
+    first = upload(b"%PDF-1.4 resume")
+    retry = upload(b"%PDF-1.4 resume")
+    other = upload(b"%PDF-1.4 another resume")
+
+    assert calls == ["ok"]
+    assert retry.status_code == 200 and retry.json() == first.json()
+    assert retry.headers[REPLAY_HEADER] == "true"
+    assert other.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_reused_id_from_another_client_is_rejected(redis):
+    calls = []
+    app = make_app(calls)
+    headers = {"X-Request-ID": "shared"}
+    responses = []
+    for ip in ("10.0.0.1", "10.0.0.2"):
+        transport = httpx.ASGITransport(app=app, client=(ip, 50000))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            responses.append(await client.post("/analyze/resume", headers=headers))
+
+    assert calls == ["ok"]
+    assert [r.status_code for r in responses] == [200, 422]
+
+
+@pytest.mark.asyncio
+async def test_reused_id_does_not_attach_to_a_different_request(redis):
+    calls = []
+    release = asyncio.Event()
+    transport = httpx.ASGITransport(app=make_app(calls, release))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"X-Request-ID": "in-flight"}
+        first = asyncio.create_task(
+            client.post("/analyze/resume", headers=headers, content=b"resume-a")
+        )
+        await asyncio.sleep(0.05)
+        other = await client.post(
+            "/analyze/resume", headers=headers, content=b"resume-b"
+        )
+        release.set()
+        await first
+
+    assert calls == ["ok"]
+    assert other.status_code == 422
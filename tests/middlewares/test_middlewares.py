@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.exceptions.LLMBudgetExceeded import LLMBudgetExceeded
+from src.exceptions.LLMUnavailable import LLMUnavailable
+from src.exceptions.NotResume import NotResume
+from src.helpers.logger import request_id_context
+from src.middlewares.exception_middleware import CatchExceptionMiddleware
+from src.middlewares.rate_limit_middleware import RATE_LIMIT, RateLimitMiddleware
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.expirations = {}
+
+    def exists(self, key):
+        return key in self.lists
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def expire(self, key, seconds):
+        self.expirations[key] = seconds
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def ttl(self, key):
+        return self.expirations.get(key, -1)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(CatchExceptionMiddleware)
+
+    @app.get("/analyze/ping")
+    async def analyze_ping():
+        return {"request_id": request_id_context.get()}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    @app.get("/fail/{kind}")
+    async def fail(kind: str):
+        if kind == "resume":
+            raise NotResume(language="en")
+        if kind == "llm":
+            raise LLMUnavailable(retry_after=7.5)
+        if kind == "budget":
+            raise LLMBudgetExceeded(tokens=5000, budget=4000)
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    with patch(
+        "src.middlewares.rate_limit_middleware.get_redis_client", return_value=client
+    ):
+        yield client
+
+
+@pytest.fixture
+def client(redis):
+    return TestClient(make_app(), raise_server_exceptions=False)
+
+
+def test_request_id_is_propagated_and_echoed(client):
+    response = client.get("/analyze/ping", headers={"X-Request-ID": "abc"})
+
+    assert response.json() == {"request_id": "abc"}
+    assert response.headers["X-Request-ID"] == "abc"
+    assert request_id_context.get() == ""
+
+
+def test_request_id_is_generated(client):
+    response = client.get("/analyze/ping")
+
+    assert response.json()["request_id"] == response.headers["X-Request-ID"] != ""
+
+
+def test_streaming_responses_pass_through(client):
+    response = client.get("/stream")
+
+    assert response.content == b"abc"
+    assert "X-Request-ID" in response.headers
+
+
+@pytest.mark.parametrize(
+    "kind, status, message",
+    [
+        ("resume", 400, NotResume(language="en").message),
+        ("llm", 503, LLMUnavailable().message),
+        ("budget", 413, LLMBudgetExceeded().message),
+        ("other", 500, "boom"),
+    ],
+)
+def test_exceptions_become_the_error_envelope(client, kind, status, message):
+    with patch("src.middlewares.exception_middleware.logger") as logger:
+        response = client.get(f"/fail/{kind}", headers={"X-Request-ID": "req-1"})
+
+    body = response.json()
+    assert response.status_code == status
+    assert body["message"] == message
+    assert body["error"] is True and body["status"] == "error"
+    assert body["x_request_id"] == "req-1" and body["exception_id"]
+    if kind == "llm":
+        assert response.headers["Retry-After"] == "7"
+    if kind == "other":
+        logged = logger.send_error.call_args.args[0]
+        assert logged["exception_id"] == body["exception_id"]
+
+
+def test_rate_limit_per_client(client, redis):
+    responses = [
+        client.get("/analyze/ping", headers={"X-Request-ID": "r"})
+        for _ in range(RATE_LIMIT + 1)
+    ]
+
+    assert [r.status_code for r in responses[:RATE_LIMIT]] == [200] * RATE_LIMIT
+    limited = responses[-1]
+    assert limited.status_code == 429
+    assert limited.json()["message"].startswith("Rate limit exceeded. Try again in 7 days")
+    assert limited.json()["x_request_id"] == "r"
+    assert redis.llen("rate_limit:testclient") == RATE_LIMIT
+    # Other paths are not counted
+    assert client.get("/stream").status_code == 200
+
+
+def test_rate_limit_per_prefix(redis):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(
+        RateLimitMiddleware,
+        path_prefix="/resumes",
+        limit=2,
+        expiration=60 * 60,
+        key_prefix="rate_limit_resume_search",
+    )
+
+    @app.get("/resumes/search")
+    async def search():
+        return {}
+
+    client = TestClient(app)
+    statuses = [client.get("/resumes/search").status_code for _ in range(3)]
+    redis.expirations["rate_limit_resume_search:testclient"] = 30 * 60
+
+    assert statuses == [200, 200, 429]
+    limited = client.get("/resumes/search")
+    assert limited.json()["message"] == "Rate limit exceeded. Try again in 30 minutes."
+    # The analyses have their own counter
+    assert redis.llen("rate_limit:testclient") == 0
@@ -0,0 +1,118 @@
+import pstats
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import config
+from src.middlewares.exception_middleware import CatchExceptionMiddleware
+from src.middlewares.profiling_middleware import PROFILE_HEADER, ProfilingMiddleware
+
+TOKEN = "secret-token"
+
+
+def busy_route_work():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+
+
+def make_client(tmp_path, mode="sampling"):
+    settings = {
+        "PROFILING_TOKEN": TOKEN,
+        "PROFILING_MODE": mode,
+        "PROFILING_DIR": str(tmp_path),
+        "PROFILING_INTERVAL": 0.001,
+    }
+    with patch.dict(config, settings):
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware)
+        app.add_middleware(CatchExceptionMiddleware)
+
+        @app.get("/work")
+        async def work():
+            busy_route_work()
+            return {"ok": True}
+
+        # Middleware stack is built (and config read) on the first request
+        client = TestClient(app)
+        client.get("/work")
+    return client
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    return make_client(tmp_path), tmp_path
+
+
+def test_requests_without_token_are_not_profiled(profiled):
+    client, directory = profiled
+
+    response = client.get("/work", headers={"X-Request-ID": "plain"})
+    wrong = client.get(
+        "/work", headers={"X-Request-ID": "wrong", PROFILE_HEADER: "guess"}
+    )
+
+    assert response.status_code == wrong.status_code == 200
+    assert "X-Profile" not in response.headers
+    assert "X-Profile" not in wrong.headers
+    assert list(directory.iterdir()) == []
+
+
+def test_sampling_profile_is_keyed_by_request_id(profiled):
+    client, directory = profiled
+
+    response = client.get(
+        "/work", headers={"X-Request-ID": "req-1", PROFILE_HEADER: TOKEN}
+    )
+
+    assert response.status_code == 200
+    filename = response.headers["X-Profile"]
+    assert filename.startswith("req-1-") and filename.endswith(".folded")
+    lines = (directory / filename).read_text().splitlines()
+    # Folded stacks: "frame;frame;... count"
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_route_work" in line for line in lines)
+
+
+def test_reused_request_id_keeps_earlier_profiles(profiled):
+    client, directory = profiled
+    headers = {"X-Request-ID": "reused", PROFILE_HEADER: TOKEN}
+
+    first = client.get("/work", headers=headers).headers["X-Profile"]
+    second = client.get("/work", headers=headers).headers["X-Profile"]
+
+    assert first != second
+    assert sorted(p.name for p in directory.iterdir()) == sorted([first, second])
+
+
+def test_request_id_cannot_escape_the_profile_dir(profiled):
+    client, directory = profiled
+
+    response = client.get(
+        "/work", headers={"X-Request-ID": "../../etc/x", PROFILE_HEADER: TOKEN}
+    )
+
+    filename = response.headers["X-Profile"]
+    assert filename.startswith(".._.._etc_x-") and "/" not in filename
+    assert [p.name for p in directory.iterdir()] == [filename]
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    client = make_client(tmp_path, mode="cprofile")
+
+    response = client.get(
+        "/work", headers={"X-Request-ID": "req-2", PROFILE_HEADER: TOKEN}
+    )
+
+    stats = pstats.Stats(str(tmp_path / response.headers["X-Profile"]))
+    assert any(name == "busy_route_work" for _, _, name in stats.stats)
+
+
+def test_disabled_by_default():
+    from src.main import app
+
+    assert ProfilingMiddleware not in [m.cls for m in app.user_middleware]
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.exceptions.NotResume import NotResume
+from src.routes import analyze_route
+from src.utils.job_description_parser import ParseResult
+
+PDF = SimpleNamespace(content_type="application/pdf", filename="cv.pdf")
+
+
+class SlowJobFetch:
+    def __init__(self, delay, content="Parsed job posting"):
+        self.delay = delay
+        self.content = content
+        self.cancelled = False
+
+    async def __call__(self, text):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.content is None:
+            return None
+        return ParseResult(self.content, "text", True)
+
+
+@pytest.mark.asyncio
+async def test_not_resume_cancels_the_job_fetch():
+    fetch = SlowJobFetch(delay=10)
+    extract = AsyncMock(side_effect=NotResume(language="en"))
+
+    with patch.object(analyze_route, "parse_job_description", fetch), patch.object(
+        analyze_route, "extract_resume_controller", extract
+    ):
+        start = time.perf_counter()
+        with pytest.raises(NotResume):
+            await analyze_route.analyze_resume(PDF, "https://jobs.example/1", "en")
+
+    assert fetch.cancelled
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_job_fetch_and_resume_extraction_overlap():
+    fetch = SlowJobFetch(delay=0.2)
+
+    async def extract(resume, language):
+        await asyncio.sleep(0.2)
+        return "Resume text"
+
+    analyze = AsyncMock(return_value={"score": 80})
+    with patch.object(analyze_route, "parse_job_description", fetch), patch.object(
+        analyze_route, "extract_resume_controller", extract
+    ), patch.object(analyze_route, "analyze_controller", analyze):
+        start = time.perf_counter()
+        response = await analyze_route.analyze_resume(PDF, "job", "en")
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert json.loads(response.body) == {"error": False, "data": {"score": 80}}
+    assert analyze.call_args.kwargs["resume_text"] == "Resume text"
+    assert analyze.call_args.kwargs["job_description"].content == "Parsed job posting"
+
+
+@pytest.mark.asyncio
+async def test_unparseable_job_description_is_rejected():
+    fetch = SlowJobFetch(delay=0, content=None)
+    extract = AsyncMock(return_value="Resume text")
+
+    with patch.object(analyze_route, "parse_job_description", fetch), patch.object(
+        analyze_route, "extract_resume_controller", extract
+    ):
+        response = await analyze_route.analyze_resume(PDF, "job", "en")
+
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from src.routes import resume_search_route
+from src.services import resume_index_service
+from src.utils.job_description_parser import ParseResult
+from src.utils.job_index import build_job_posting
+
+
+@pytest.fixture
+def admin_token():
+    with patch.dict(resume_search_route.config, {"RESUME_SEARCH_TOKEN": "s3cret"}):
+        yield "s3cret"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token", [None, "", "wrong"])
+async def test_search_needs_the_admin_token(admin_token, token):
+    parse = AsyncMock()
+    with patch.object(resume_search_route, "parse_job_description", parse):
+        response = await resume_search_route.top_matching_resumes("job", 10, token)
+
+    assert response.status_code == 401
+    parse.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_is_disabled_without_a_configured_token():
+    with patch.dict(resume_search_route.config, {"RESUME_SEARCH_TOKEN": None}):
+        response = await resume_search_route.top_matching_resumes("job", 10, "")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_search_results_carry_no_filename(admin_token):
+    store = type("Store", (), {})()
+    store.search = lambda vector, k: [
+        ({"id": "abc", "filename": "jane-doe.pdf", "language": "en"}, 0.9)
+    ]
+    posting = build_job_posting("Python engineer with FastAPI")
+    with patch.object(
+        resume_search_route,
+        "parse_job_description",
+        AsyncMock(return_value=ParseResult("Python engineer", "text", True)),
+    ), patch(
+        "src.controllers.resume_search_controller.index_job_description",
+        AsyncMock(return_value=posting),
+    ), patch.object(
+        resume_index_service, "get_resume_store", return_value=store
+    ), patch(
+        "src.services.embedding_service.embed_text", return_value=np.zeros(4)
+    ):
+        response = await resume_search_route.top_matching_resumes(
+            "job", 10, admin_token
+        )
+
+    assert json.loads(response.body)["data"] == [
+        {"id": "abc", "language": "en", "score": 0.9}
+    ]
@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.health_service import HealthMonitor
+from src.services.llm_governor import AdaptiveLimiter, CircuitBreaker, LLMGovernor
+from src.services.llm_providers import LLMProvider, LLMRouter
+
+
+def make_resources():
+    session = SimpleNamespace(closed=False)
+    pool = SimpleNamespace(started=False, in_use=0, size=4)
+    governor = LLMGovernor(
+        AdaptiveLimiter(4, 1, 8), CircuitBreaker(1, 30), 0, 0.0, 0.0
+    )
+    return SimpleNamespace(
+        started=True,
+        started_at=0.0,
+        parser=SimpleNamespace(session=session, browser_pool=pool),
+        llm_governor=governor,
+        llm_router=LLMRouter([LLMProvider("fake", {"scoring": "small"})]),
+    )
+
+
+@pytest.fixture
+def redis():
+    client = MagicMock()
+    with patch("src.services.health_service.get_redis_client", return_value=client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_ready_without_browser_pool(redis):
+    readiness = await HealthMonitor(make_resources(), ttl=0).readiness()
+
+    assert readiness["ready"] is True
+    assert readiness["checks"]["redis"]["ok"] is True
+    assert readiness["checks"]["browser_pool"]["ok"] is False
+
+
+@pytest.mark.asyncio
+async def test_probes_are_cached_and_shared(redis):
+    monitor = HealthMonitor(make_resources(), ttl=60)
+
+    results = await asyncio.gather(*(monitor.readiness() for _ in range(20)))
+
+    assert redis.ping.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_slow_redis_makes_the_worker_unready(redis):
+    monitor = HealthMonitor(make_resources(), ttl=0)
+
+    with patch.dict(
+        "src.services.health_service.config", {"HEALTH_REDIS_MAX_LATENCY_MS": -1}
+    ):
+        slow = await monitor.readiness()
+    redis.ping.side_effect = ConnectionError("pool exhausted")
+    down = await monitor.readiness()
+
+    assert slow["ready"] is False and "latency_ms" in slow["checks"]["redis"]
+    assert down["ready"] is False and "pool exhausted" in down["checks"]["redis"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_or_long_llm_queue_makes_the_worker_unready(redis):
+    resources = make_resources()
+    monitor = HealthMonitor(resources, ttl=0)
+
+    resources.llm_governor.breaker.record_failure()
+    assert (await monitor.readiness())["checks"]["llm"]["ok"] is False
+
+    with patch.dict(
+        "src.services.health_service.config", {"LLM_DEGRADE_TO_LOCAL": True}
+    ):
+        assert (await monitor.readiness())["ready"] is True
+
+    resources.llm_governor.breaker.record_success()
+    with patch.dict(
+        "src.services.health_service.config", {"HEALTH_LLM_MAX_QUEUE": -1}
+    ):
+        assert (await monitor.readiness())["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_worker_is_ready_again_once_the_circuit_can_probe(redis):
+    resources = make_resources()
+    resources.llm_governor.breaker = CircuitBreaker(1, reset_timeout=0.05)
+    monitor = HealthMonitor(resources, ttl=0)
+
+    resources.llm_governor.breaker.record_failure()
+    assert (await monitor.readiness())["ready"] is False
+    await asyncio.sleep(0.06)
+
+    # No LLM call happened meanwhile: the breaker is still "open" internally
+    assert resources.llm_governor.breaker.state == CircuitBreaker.OPEN
+    assert (await monitor.readiness())["ready"] is True
+
+
+def test_liveness_checks_nothing():
+    assert HealthMonitor(make_resources()).liveness()["status"] == "alive"
@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import pytest
+from langchain.schema import AIMessage, HumanMessage
+
+from src.services.llm_cache import (
+    MODE_OFF,
+    MODE_RECORD,
+    MODE_REDIS,
+    MODE_REPLAY,
+    LLMReplayMiss,
+    LLMResponseCache,
+    prompt_hash,
+)
+from src.services.llm_governor import AdaptiveLimiter, CircuitBreaker, LLMGovernor
+from src.services.llm_providers import TASK_SCORING, LLMCall, LLMProvider, LLMRouter
+from src.services.openai_llm import OpenAiLLM
+
+PROMPT = [HumanMessage(content="Score this resume")]
+CONTEXTUAL = "Score: 0.8\nKeywords: python, docker\nFeedback: good match"
+
+
+class CountingRouter(LLMRouter):
+    def __init__(self, content):
+        super().__init__([LLMProvider("fake", {TASK_SCORING: "small"})])
+        self.content = content
+        self.calls = 0
+
+    async def invoke(self, task, messages, temperature, **kwargs):
+        self.calls += 1
+        return LLMCall(AIMessage(content=self.content), "fake", "small", 0.0)
+
+
+def make_llm(router, cache):
+    governor = LLMGovernor(
+        AdaptiveLimiter(1, 1, 1), CircuitBreaker(5, 30), 0, 0.0, 0.0
+    )
+    return OpenAiLLM("en", router=router, governor=governor, cache=cache)
+
+
+def test_prompt_hash_covers_model_temperature_and_options():
+    base = prompt_hash("small", 0.1, PROMPT)
+
+    assert base == prompt_hash("small", 0.1, [HumanMessage(content="Score this resume")])
+    assert base != prompt_hash("large", 0.1, PROMPT)
+    assert base != prompt_hash("small", 0.2, PROMPT)
+    assert base != prompt_hash("small", 0.1, PROMPT, function_call={"name": "f"})
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        LLMResponseCache(mode="memory")
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_from_disk(tmp_path):
+    response = AIMessage(
+        content="", additional_kwargs={"function_call": {"arguments": '{"score": 1}'}}
+    )
+
+    async def call():
+        return response
+
+    recorder = LLMResponseCache(mode=MODE_RECORD, directory=str(tmp_path))
+    assert await recorder.fetch("abc", call) == response
+
+    replay = LLMResponseCache(mode=MODE_REPLAY, directory=str(tmp_path))
+    replayed = await replay.fetch("abc", None)
+    assert replayed.additional_kwargs == response.additional_kwargs
+
+    with pytest.raises(LLMReplayMiss):
+        await replay.fetch("missing", call)
+
+
+@pytest.mark.asyncio
+async def test_redis_mode_stores_raw_completion_with_ttl():
+    cache = LLMResponseCache(mode=MODE_REDIS, expiration=60)
+
+    async def call():
+        return AIMessage(content="0.7")
+
+    with patch("src.services.llm_cache.get_value", return_value=None), patch(
+        "src.services.llm_cache.set_with_expiry"
+    ) as set_with_expiry:
+        await cache.fetch("abc", call)
+
+    key, raw, expiration = set_with_expiry.call_args.args
+    assert key == "llm_response:abc"
+    assert '"0.7"' in raw
+    assert expiration == 60
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_reach_the_llm_once(tmp_path):
+    router = CountingRouter(CONTEXTUAL)
+    llm = make_llm(router, LLMResponseCache(mode=MODE_RECORD, directory=str(tmp_path)))
+
+    first = await llm.calculate_contextual_similarity("resume", "job")
+    # Same prompt as the fallback of analyze_resume_job_match
+    second = await llm.calculate_contextual_similarity("resume", "job")
+
+    assert first == second == {
+        "score": 0.8,
+        "keywords": ["python", "docker"],
+        "feedback": "good match",
+    }
+    assert router.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_calls_the_llm():
+    router = CountingRouter("0.5")
+    llm = make_llm(router, LLMResponseCache(mode=MODE_OFF))
+
+    await llm.calculate_jaccard_similarity("resume", "job")
+    await llm.calculate_jaccard_similarity("resume", "job")
+
+    assert router.calls == 2
+
+
+class FallbackRouter(CountingRouter):
+    """The preferred model is down, a fallback model answers"""
+
+    async def invoke(self, task, messages, temperature, **kwargs):
+        self.calls += 1
+        return LLMCall(AIMessage(content=self.content), "backup", "large", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_fallback_completions_are_not_cached_as_the_preferred_model(tmp_path):
+    router = FallbackRouter("0.5")
+    llm = make_llm(router, LLMResponseCache(mode=MODE_RECORD, directory=str(tmp_path)))
+
+    await llm.calculate_jaccard_similarity("resume", "job")
+    await llm.calculate_jaccard_similarity("resume", "job")
+
+    assert router.calls == 2
+    assert not list(tmp_path.iterdir())
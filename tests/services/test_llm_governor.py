@@ -0,0 +1,190 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.exceptions.LLMUnavailable import LLMUnavailable
+from src.services.llm_governor import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    LLMGovernor,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def make_governor(max_retries=2, limit=2, failures=3, reset=30.0):
+    return LLMGovernor(
+        limiter=AdaptiveLimiter(initial=limit, minimum=1, maximum=8),
+        breaker=CircuitBreaker(failure_threshold=failures, reset_timeout=reset),
+        max_retries=max_retries,
+        base_delay=0.001,
+        max_delay=0.01,
+    )
+
+
+def failing_then(result, errors):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (StatusError(429), True),
+        (StatusError(503), True),
+        (StatusError(400), False),
+        (asyncio.TimeoutError(), True),
+        (type("APIConnectionError", (Exception,), {})(), True),
+        (ValueError("bad prompt"), False),
+    ],
+)
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds(StatusError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(StatusError(429, {"retry-after-ms": "150"})) == 0.15
+    assert retry_after_seconds(StatusError(429)) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_retried_and_halve_the_limit():
+    governor = make_governor(limit=4)
+    call, calls = failing_then("ok", [StatusError(429, {"retry-after": "0"})])
+
+    assert await governor.call(call) == "ok"
+    assert len(calls) == 2
+    assert governor.limiter.limit == pytest.approx(2.5)
+    assert governor.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_retry_after():
+    governor = make_governor()
+    call, _ = failing_then("ok", [StatusError(429, {"retry-after": "0.005"})])
+
+    with patch("src.services.llm_governor.asyncio.sleep") as sleep:
+        sleep.return_value = None
+        await governor.call(call)
+
+    (delay,), _ = sleep.call_args
+    assert 0.005 <= delay <= 0.006
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    governor = make_governor()
+    call, calls = failing_then("ok", [StatusError(400)])
+
+    with pytest.raises(StatusError):
+        await governor.call(call)
+    assert len(calls) == 1
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast():
+    governor = make_governor(max_retries=0, failures=2)
+    call, calls = failing_then("ok", [StatusError(503)] * 2)
+
+    for _ in range(2):
+        with pytest.raises(StatusError):
+            await governor.call(call)
+
+    with pytest.raises(LLMUnavailable) as exc_info:
+        await governor.call(call)
+    assert len(calls) == 2
+    assert exc_info.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_opens_after_reset_timeout():
+    governor = make_governor(max_retries=0, failures=1, reset=0.01)
+    call, _ = failing_then("ok", [StatusError(503)])
+
+    with pytest.raises(StatusError):
+        await governor.call(call)
+    await asyncio.sleep(0.02)
+
+    assert await governor.call(call) == "ok"
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_keep_the_circuit_half_open():
+    governor = make_governor(max_retries=0, failures=1, reset=0.01)
+    call, _ = failing_then("ok", [StatusError(503)])
+    with pytest.raises(StatusError):
+        await governor.call(call)
+    await asyncio.sleep(0.02)
+
+    async def hanging():
+        await asyncio.Event().wait()
+
+    probe = asyncio.create_task(governor.call(hanging))
+    await asyncio.sleep(0.01)
+    assert governor.breaker.state == CircuitBreaker.HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # The next call is the probe, instead of every call being rejected
+    assert await governor.call(call) == "ok"
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+    assert governor.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_queue_is_reported():
+    governor = make_governor(limit=2)
+    release = asyncio.Event()
+    peak = []
+
+    async def call():
+        peak.append(governor.limiter.in_flight)
+        await release.wait()
+        return True
+
+    tasks = [asyncio.create_task(governor.call(call)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+
+    assert governor.snapshot()["in_flight"] == 2
+    assert governor.snapshot()["queue_depth"] == 3
+
+    release.set()
+    assert all(await asyncio.gather(*tasks))
+    assert max(peak) <= 3
+    assert governor.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveLimiter(initial=1, minimum=1, maximum=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.services import llm_providers
+from src.services.llm_providers import (
+    TASK_ANALYSIS,
+    TASK_SCORING,
+    LLMProvider,
+    LLMRouter,
+    load_providers,
+)
+
+
+class FakeChat:
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.cancelled = False
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return f"{self.name}-response"
+
+
+def make_router(providers, clients):
+    return LLMRouter(providers, client_factory=lambda p, model, t: clients[p.name])
+
+
+LOCAL = LLMProvider("local", {TASK_SCORING: "llama-3-8b"}, base_url="http://vllm/v1")
+OPENAI = LLMProvider(
+    "openai", {TASK_SCORING: "gpt-3.5-turbo", TASK_ANALYSIS: "gpt-4-turbo"}
+)
+
+
+def test_default_provider_comes_from_model_settings():
+    settings = {
+        "LLM_PROVIDERS": [],
+        "LLM_BASE_URL": "http://localhost:8080/v1",
+        "LLM_SCORING_MODEL": "small",
+        "LLM_ANALYSIS_MODEL": "large",
+        "LLM_API_KEY": "key",
+    }
+    with patch.dict(llm_providers.config, settings):
+        (provider,) = load_providers()
+
+    assert provider.base_url == "http://localhost:8080/v1"
+    assert provider.models == {TASK_SCORING: "small", TASK_ANALYSIS: "large"}
+    assert provider.api_key == "key"
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_routed_per_model():
+    clients = {"local": FakeChat("local"), "openai": FakeChat("openai")}
+    router = make_router([LOCAL, OPENAI], clients)
+
+    scoring = await router.invoke(TASK_SCORING, ["hi"], 0.1)
+    analysis = await router.invoke(TASK_ANALYSIS, ["hi"], 0.2, functions=[])
+
+    assert (scoring.provider, scoring.model) == ("local", "llama-3-8b")
+    assert (analysis.provider, analysis.model) == ("openai", "gpt-4-turbo")
+    assert clients["openai"].calls[0][1] == {"functions": []}
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_next_provider_on_error():
+    clients = {
+        "local": FakeChat("local", error=ConnectionError("down")),
+        "openai": FakeChat("openai"),
+    }
+    router = make_router([LOCAL, OPENAI], clients)
+
+    call = await router.invoke(TASK_SCORING, ["hi"], 0.1)
+
+    assert call.response == "openai-response"
+    assert router.stats["local"].failures == 1
+    assert router.candidates(TASK_SCORING)[0][0].name == "openai"
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_times_out_and_falls_back():
+    slow_local = LLMProvider("local", {TASK_SCORING: "llama"}, timeout=0.05)
+    clients = {"local": FakeChat("local", delay=0.3), "openai": FakeChat("openai")}
+    router = make_router([slow_local, OPENAI], clients)
+
+    call = await router.invoke(TASK_SCORING, ["hi"], 0.1)
+
+    assert call.provider == "openai"
+    # The timed-out request is cancelled, not left running in a thread
+    assert clients["local"].cancelled
+
+
+@pytest.mark.asyncio
+async def test_providers_are_ordered_by_observed_latency():
+    clients = {"local": FakeChat("local", delay=0.05), "openai": FakeChat("openai")}
+    router = make_router([LOCAL, OPENAI], clients)
+
+    await router.invoke(TASK_SCORING, ["hi"], 0.1)
+    router.stats["openai"].record(0.001, success=True)
+
+    assert [p.name for p, _ in router.candidates(TASK_SCORING)] == ["openai", "local"]
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_when_every_provider_fails():
+    clients = {"openai": FakeChat("openai", error=RuntimeError("boom"))}
+    router = make_router([OPENAI], clients)
+
+    with pytest.raises(RuntimeError):
+        await router.invoke(TASK_SCORING, ["hi"], 0.1)
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(ValueError):
+        make_router([LOCAL], {}).candidates(TASK_ANALYSIS)
@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.exceptions.LLMBudgetExceeded import LLMBudgetExceeded
+from src.helpers import metrics
+from src.services import llm_usage, similarity_service
+from src.services.llm_cache import MODE_OFF, LLMResponseCache
+from src.services.llm_governor import AdaptiveLimiter, CircuitBreaker, LLMGovernor
+from src.services.llm_providers import TASK_SCORING, LLMCall, LLMProvider, LLMRouter
+from src.services.llm_usage import (
+    RequestUsage,
+    finish_request_usage,
+    request_usage_context,
+    start_request_usage,
+)
+from src.services.openai_llm import OpenAiLLM
+from src.services.similarity_service import SimilarityContent
+from src.utils.job_index import build_job_posting
+
+RESUME = "Backend engineer with Python, FastAPI and PostgreSQL experience"
+POSTING = build_job_posting(
+    "Senior Python engineer. We use Python, FastAPI, Kubernetes and Kafka."
+)
+
+
+class UsageRouter(LLMRouter):
+    """Answers with the usage metadata the OpenAI chat models report"""
+
+    def __init__(self):
+        super().__init__([LLMProvider("fake", {TASK_SCORING: "small"})])
+        self.calls = 0
+
+    async def invoke(self, task, messages, temperature, **kwargs):
+        self.calls += 1
+        response = AIMessage(
+            content="0.5",
+            usage_metadata={"input_tokens": 120, "output_tokens": 3, "total_tokens": 123},
+        )
+        return LLMCall(response, "fake", "small", 0.01)
+
+
+class MemoryCache(LLMResponseCache):
+    def __init__(self):
+        super().__init__(mode=MODE_OFF)
+        self.responses = {}
+
+    def get(self, key):
+        return self.responses.get(key)
+
+    def set(self, key, response):
+        self.responses[key] = response
+
+
+def make_llm(router, cache=None):
+    governor = LLMGovernor(AdaptiveLimiter(1, 1, 1), CircuitBreaker(5, 30), 0, 0, 0)
+    return OpenAiLLM(
+        "en", router=router, governor=governor, cache=cache or LLMResponseCache(MODE_OFF)
+    )
+
+
+@pytest.fixture(autouse=True)
+def request_usage():
+    metrics.reset()
+    token = start_request_usage()
+    yield request_usage_context.get()
+    request_usage_context.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_calls_are_accounted_to_the_request(request_usage):
+    llm = make_llm(UsageRouter(), MemoryCache())
+
+    with patch.dict(llm_usage.config, {"LLM_TOKEN_PRICES": {"small": [0.5, 1.5]}}):
+        await llm.calculate_jaccard_similarity(RESUME, POSTING.cleaned_text)
+        await llm.calculate_jaccard_similarity(RESUME, POSTING.cleaned_text)
+        summary = request_usage.summary()
+
+    assert summary["calls"] == 2 and summary["cached_calls"] == 1
+    assert summary["prompt_tokens"] == 120 and summary["completion_tokens"] == 3
+    assert summary["models"]["small"]["calls"] == 2
+    assert summary["cost"] == pytest.approx((120 * 0.5 + 3 * 1.5) / 1000)
+    counters = metrics.snapshot()["counters"]
+    assert counters["LLM/PromptTokens"] == 120
+    assert counters["LLM/Tokens/small"] == 123
+    assert counters["LLM/CachedCalls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_over_budget_prompt_is_not_sent():
+    router = UsageRouter()
+    token = request_usage_context.set(RequestUsage(budget=10))
+    try:
+        with pytest.raises(LLMBudgetExceeded) as error:
+            await make_llm(router).calculate_jaccard_similarity(
+                RESUME, POSTING.cleaned_text
+            )
+    finally:
+        request_usage_context.reset(token)
+
+    assert router.calls == 0
+    assert error.value.budget == 10 and error.value.tokens > 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["downgrade", "reject"])
+async def test_scoring_over_budget(policy):
+    content = SimilarityContent(RESUME, POSTING, "en")
+    content.open_ai = make_llm(UsageRouter())
+    token = request_usage_context.set(RequestUsage(budget=10))
+    settings = {"LLM_TOKEN_BUDGET_POLICY": policy}
+    try:
+        with patch.object(similarity_service, "get_value", return_value=None), patch.dict(
+            similarity_service.config, settings
+        ):
+            if policy == "reject":
+                with pytest.raises(LLMBudgetExceeded):
+                    await content.compute_similarity()
+                return
+            result = await content.compute_similarity()
+    finally:
+        request_usage_context.reset(token)
+
+    assert "kubernetes" in result["missing_keywords"]
+    assert result["feedback"].startswith("Simplified keyword-based analysis")
+    assert metrics.snapshot()["counters"]["Scoring/BudgetLocal"] == 1
+
+
+def test_usage_is_logged_once_per_request(request_usage):
+    token = start_request_usage()
+    request_usage_context.get().record(
+        llm_usage.CallUsage(TASK_SCORING, "small", 100, 5, 0.2)
+    )
+
+    with patch.object(llm_usage, "logger") as logger:
+        finish_request_usage(token)
+
+    logged = logger.send_log.call_args.args[0]
+    assert logged["message"] == "LLM usage"
+    assert logged["total_tokens"] == 105 and logged["latency_ms"] == 200.0
+    assert request_usage_context.get() is request_usage
@@ -0,0 +1,125 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import UploadFile
+
+from src.services import pdf_reader_service
+from src.services.pdf_reader_service import (
+    available_backends,
+    extract_pdf_text,
+    pdf_reader,
+    resolve_backend,
+)
+
+
+def make_pdf(pages):
+    """Build a minimal PDF with one Helvetica text line per entry of each page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        stream = (
+            b"BT /F1 12 Tf 72 720 Td 14 TL "
+            + b" ".join(b"(" + line.encode("latin-1") + b") '" for line in lines)
+            + b" ET"
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = (
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % kid for kid in kids)
+        + b"] /Count %d >>" % len(kids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(output)
+
+
+SAMPLE_PDF = make_pdf(
+    [
+        ["John Doe", "EXPERIENCE Senior Engineer", "EDUCATION University"],
+        ["SKILLS Python, FastAPI"],
+    ]
+)
+
+
+def normalized_words(text):
+    return text.split()
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_extract_every_page(backend):
+    text = extract_pdf_text(io.BytesIO(SAMPLE_PDF), backend=backend)
+
+    assert normalized_words(text) == [
+        "John", "Doe", "EXPERIENCE", "Senior", "Engineer",
+        "EDUCATION", "University", "SKILLS", "Python,", "FastAPI",
+    ]
+
+
+def test_falls_back_to_pypdf2_when_backend_fails():
+    failing = MagicMock(side_effect=RuntimeError("broken document"))
+
+    with patch.dict(pdf_reader_service.PDF_BACKENDS, {"pdfminer": failing}), patch(
+        "src.services.pdf_reader_service.available_backends",
+        return_value=["pdfminer", "pypdf2"],
+    ):
+        text = extract_pdf_text(io.BytesIO(SAMPLE_PDF), backend="pdfminer")
+
+    failing.assert_called_once()
+    assert "SKILLS Python, FastAPI" in text
+
+
+def test_falls_back_to_pypdf2_when_backend_returns_no_text():
+    with patch.dict(
+        pdf_reader_service.PDF_BACKENDS, {"pypdfium2": MagicMock(return_value="  ")}
+    ), patch(
+        "src.services.pdf_reader_service.available_backends",
+        return_value=["pypdfium2", "pypdf2"],
+    ):
+        text = extract_pdf_text(io.BytesIO(SAMPLE_PDF), backend="pypdfium2")
+
+    assert "John Doe" in text
+
+
+def test_missing_backend_resolves_to_pypdf2():
+    with patch(
+        "src.services.pdf_reader_service.available_backends", return_value=["pypdf2"]
+    ):
+        assert resolve_backend("pypdfium2") == "pypdf2"
+        assert resolve_backend("auto") == "pypdf2"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_backend("tesseract")
+
+
+def test_pdf_reader_reads_upload_file():
+    upload = MagicMock(spec=UploadFile)
+    upload.file = io.BytesIO(SAMPLE_PDF)
+
+    assert "EXPERIENCE Senior Engineer" in pdf_reader(pdf_file=upload)
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.helpers import metrics
+from src.services.result_sink import ResultSink
+
+
+class RecordingStore:
+    def __init__(self, block: threading.Event = None):
+        self.batches = []
+        self.closed = False
+        self.block = block
+
+    def write_many(self, results):
+        if self.block is not None:
+            self.block.wait()
+        self.batches.append(list(results))
+        return len(results)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_the_batch_is_full():
+    store = RecordingStore()
+    sink = ResultSink(store, batch_size=3, flush_interval=60, max_queue=100)
+    sink.start()
+
+    for i in range(7):
+        assert sink.submit({"id": i})
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in store.batches] == [3, 3]
+    await sink.close()
+    assert [len(batch) for batch in store.batches] == [3, 3, 1]
+    assert sink.written == 7 and store.closed
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_the_interval():
+    store = RecordingStore()
+    sink = ResultSink(store, batch_size=100, flush_interval=0.05, max_queue=100)
+    sink.start()
+
+    sink.submit({"id": 1})
+    await asyncio.sleep(0.02)
+    assert store.batches == []
+    await asyncio.sleep(0.1)
+
+    assert store.batches == [[{"id": 1}]]
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking():
+    block = threading.Event()
+    store = RecordingStore(block)
+    sink = ResultSink(store, batch_size=1, flush_interval=0, max_queue=2)
+    sink.start()
+
+    sink.submit({"id": 0})
+    await asyncio.sleep(0.01)  # taken by the task, whose write is blocked
+    accepted = [sink.submit({"id": i}) for i in range(1, 5)]
+
+    assert accepted == [True, True, False, False]
+    assert metrics.snapshot()["counters"]["Results/Dropped"] == 2
+
+    # put() waits for room instead
+    waiting = asyncio.create_task(sink.put({"id": 5}))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    block.set()
+    await asyncio.wait_for(waiting, 1)
+    await sink.close()
+    written = [r["id"] for batch in store.batches for r in batch]
+    assert written == [0, 1, 2, 5]
+
+
+@pytest.mark.asyncio
+async def test_results_are_not_accepted_after_close():
+    sink = ResultSink(RecordingStore(), batch_size=10, flush_interval=1, max_queue=10)
+    sink.start()
+    await sink.close()
+
+    assert sink.submit({"id": 1}) is False
+    with pytest.raises(RuntimeError):
+        await sink.put({"id": 1})
@@ -0,0 +1,75 @@
+from src.services.resume_condenser import condense_resume, segment_resume
+
+RESUME = """
+CURRICULUM VITAE
+John Doe
+john.doe@example.com | (123) 456-7890 | linkedin.com/in/johndoe
+Page 1 of 2
+
+SUMMARY
+Backend engineer focused on Python services.
+
+EXPERIENCE
+Senior Software Engineer - ABC Tech
+January 2019 - Present
+• Built RESTful APIs with FastAPI
+• Built RESTful APIs with FastAPI
+John Doe - Resume
+Page 2 of 2
+Technical Skills:
+- Python, Redis, Docker
+
+REFERENCES
+Jane Roe, jane@example.com
+Available upon request
+John Doe - Resume
+"""
+
+
+def test_segments_by_resume_sections():
+    sections = segment_resume(RESUME)
+
+    assert [header for header, _ in sections] == [
+        None,
+        "SUMMARY",
+        "EXPERIENCE",
+        "Technical Skills",
+    ]
+
+
+def test_boilerplate_is_removed():
+    text = condense_resume(RESUME).text
+
+    assert "@" not in text
+    assert "456-7890" not in text
+    assert "linkedin" not in text
+    assert "Page" not in text
+    assert "CURRICULUM VITAE" not in text
+    assert "Available upon request" not in text
+    assert text.count("Built RESTful APIs with FastAPI") == 1
+    assert text.count("John Doe - Resume") == 1
+    assert "- Python, Redis, Docker" in text
+
+
+def test_reports_token_savings():
+    condensed = condense_resume(RESUME)
+
+    assert condensed.condensed_tokens < condensed.original_tokens
+    assert condensed.saved_tokens == (
+        condensed.original_tokens - condensed.condensed_tokens
+    )
+
+
+def test_output_is_bounded():
+    long_resume = "EXPERIENCE\n" + "\n".join(
+        f"- Delivered project number {n} using Python and Kubernetes" for n in range(500)
+    ) + "\nSKILLS\n" + "\n".join(f"- Skill {n}" for n in range(200))
+
+    condensed = condense_resume(long_resume, max_tokens=300)
+
+    assert condensed.condensed_tokens <= 300
+    assert "EXPERIENCE" in condensed.text and "SKILLS" in condensed.text
+
+
+def test_unrecognised_text_is_kept():
+    assert condense_resume("(123) 456-7890").text == "(123) 456-7890"
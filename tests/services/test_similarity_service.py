@@ -0,0 +1,183 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.helpers import metrics
+from src.services import near_duplicate_service, similarity_service
+from src.services.similarity_service import SimilarityContent
+from src.utils.job_index import build_job_posting
+
+RESUME = "Backend engineer with Python, FastAPI and PostgreSQL experience"
+POSTING = build_job_posting(
+    "Senior Python engineer. We use Python, FastAPI, Kubernetes and Kafka."
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    def smembers(self, key):
+        self.results.append(set(self.redis.sets.get(key, ())))
+
+    def sadd(self, key, member):
+        self.redis.sets.setdefault(key, set()).add(member)
+
+    def setex(self, key, seconds, value):
+        self.redis.values[key] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        return self.results
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    metrics.reset()
+    client = FakeRedis()
+    with patch.object(similarity_service, "get_value", return_value=None), patch.object(
+        similarity_service, "set_with_expiry"
+    ), patch.object(near_duplicate_service, "get_redis_client", return_value=client):
+        yield client
+
+
+def make_content(is_position_closed, jaccard=0.6, contextual=0.8):
+    content = SimilarityContent(
+        RESUME, POSTING, "en", is_position_closed=is_position_closed
+    )
+    content.open_ai.calculate_jaccard_similarity = AsyncMock(return_value=jaccard)
+    content.open_ai.calculate_contextual_similarity = AsyncMock(
+        return_value={"score": contextual, "keywords": ["kafka"], "feedback": "ok"}
+    )
+    return content
+
+
+@pytest.mark.asyncio
+async def test_open_position_is_scored_by_the_llm():
+    content = make_content(is_position_closed=False)
+
+    result = await content.compute_similarity()
+
+    assert result["similarity_score"] == 0.7
+    assert result["is_position_closed"] is False
+    assert metrics.snapshot()["counters"] == {"Scoring/LLM": 1}
+
+
+@pytest.mark.asyncio
+async def test_full_match_from_the_llm_has_no_missing_keywords():
+    content = make_content(is_position_closed=False)
+    content.open_ai.calculate_contextual_similarity = AsyncMock(
+        return_value={"score": 1.0, "keywords": [], "feedback": "Perfect match"}
+    )
+
+    result = await content.compute_similarity()
+
+    assert result["missing_keywords"] == []
+    assert result["total_missing"] == 0
+
+
+@pytest.mark.asyncio
+async def test_closed_position_uses_only_the_local_scorer():
+    content = make_content(is_position_closed=True)
+
+    result = await content.compute_similarity()
+
+    content.open_ai.calculate_jaccard_similarity.assert_not_called()
+    content.open_ai.calculate_contextual_similarity.assert_not_called()
+    assert result["is_position_closed"] is True
+    assert "kubernetes" in result["missing_keywords"]
+    assert result["feedback"].startswith("This position is no longer accepting")
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["Scoring/ClosedLocal"] == 1
+    assert counters["LLM/CallsAvoided"] == 2
+    assert counters["LLM/PromptTokensAvoided"] > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, expected_counter", [("skip", "Scoring/ClosedSkipped"), ("llm", "Scoring/LLM")]
+)
+async def test_closed_position_modes(mode, expected_counter):
+    content = make_content(is_position_closed=True)
+
+    with patch.dict(similarity_service.config, {"CLOSED_POSITION_SCORING": mode}):
+        result = await content.compute_similarity()
+
+    assert result["is_position_closed"] is True
+    assert expected_counter in metrics.snapshot()["counters"]
+    if mode == "skip":
+        assert result["similarity_score"] == 0.0
+
+
+LONG_RESUME = (
+    "Backend engineer at Acme from 2019 to 2023 building REST APIs with Python, "
+    "FastAPI and PostgreSQL. Moved the nightly batch jobs to Kafka consumers on "
+    "Kubernetes and cut the processing time in half. Mentored four engineers "
+    "and ran the on-call rotation of the payments team. Previously maintained "
+    "Django services and the CI/CD pipelines of a retail platform."
+)
+
+
+def make_resume_content(resume, language="en"):
+    content = SimilarityContent(resume, POSTING, language)
+    content.open_ai.calculate_jaccard_similarity = AsyncMock(return_value=0.6)
+    content.open_ai.calculate_contextual_similarity = AsyncMock(
+        return_value={
+            "score": 0.8,
+            "keywords": ["terraform", "go", "grafana"],
+            "feedback": "ok",
+        }
+    )
+    return content
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_resume_reuses_the_previous_result():
+    first = await make_resume_content(LONG_RESUME).compute_similarity()
+    similarity_service.set_with_expiry.assert_called_once()
+
+    # One word edited, re-exported with another layout
+    edited = LONG_RESUME.replace("four", "five").replace(". ", ".\n  ")
+    content = make_resume_content(edited + " Terraform.")
+    result = await content.compute_similarity()
+
+    content.open_ai.calculate_jaccard_similarity.assert_not_called()
+    assert result["similarity_score"] == first["similarity_score"] == 0.7
+    assert result["feedback"] == "ok"
+    # Adjusted to this resume: it now mentions terraform
+    assert result["missing_keywords"] == ["go", "grafana"]
+    assert result["total_missing"] == 2
+    counters = metrics.snapshot()["counters"]
+    assert counters["Scoring/NearDuplicate"] == 1
+    assert counters["LLM/CallsAvoided"] == 2
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_are_not_reused_across_languages_or_when_disabled():
+    await make_resume_content(LONG_RESUME).compute_similarity()
+
+    other_language = make_resume_content(LONG_RESUME, language="pt-BR")
+    await other_language.compute_similarity()
+    with patch.dict(similarity_service.config, {"NEAR_DUPLICATE_ENABLED": False}):
+        disabled = make_resume_content(LONG_RESUME.replace("four", "five"))
+        await disabled.compute_similarity()
+
+    other_language.open_ai.calculate_jaccard_similarity.assert_called_once()
+    disabled.open_ai.calculate_jaccard_similarity.assert_called_once()
+    assert "Scoring/NearDuplicate" not in metrics.snapshot()["counters"]
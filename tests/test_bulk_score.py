@@ -0,0 +1,196 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src import bulk_score
+from src.bulk_score import BulkScorer, load_checkpoint, load_jobs
+from src.database import redis_client
+
+RESUME_LINES = [
+    "John Doe - john.doe@example.com - +1 555 123 4567",
+    "EXPERIENCE",
+    "Backend Engineer, Acme, Jan 2019 - Dec 2023",
+    "Python, FastAPI, PostgreSQL, Docker",
+    "EDUCATION",
+    "Bachelor of Computer Science, State University, 2018",
+    "SKILLS",
+    "Python, Kafka, Kubernetes",
+]
+JOBS = [
+    {"id": "backend", "text": "Senior Python engineer with FastAPI and Kafka."},
+    {"id": "data", "text": "Data engineer with Spark, Airflow and Python."},
+]
+SIMILARITY = {
+    "similarity_score": 0.5,
+    "missing_keywords": ["kafka"],
+    "total_missing": 1,
+    "feedback": "ok",
+    "is_position_closed": False,
+}
+
+
+class NullRedis:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def make_pdf(lines):
+    stream = (
+        b"BT /F1 12 Tf 72 720 Td 14 TL "
+        + b" ".join(b"(" + line.encode("latin-1") + b") '" for line in lines)
+        + b" ET"
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [5 0 R] /Count 1 >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>",
+    ]
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(output)
+
+
+@pytest.fixture
+def resumes_dir(tmp_path):
+    directory = tmp_path / "resumes"
+    (directory / "batch").mkdir(parents=True)
+    (directory / "alice.pdf").write_bytes(make_pdf(RESUME_LINES))
+    (directory / "batch" / "bob.pdf").write_bytes(make_pdf(RESUME_LINES[::-1]))
+    (directory / "invoice.pdf").write_bytes(make_pdf(["Invoice 42", "Total 10"]))
+    (directory / "notes.txt").write_text("not a pdf")
+    return directory
+
+
+@pytest.fixture
+def similarity():
+    with patch.object(redis_client, "_redis_client", NullRedis()), patch.object(
+        bulk_score.SimilarityContent,
+        "compute_similarity",
+        AsyncMock(return_value=SIMILARITY),
+    ) as compute:
+        yield compute
+
+
+def run(resumes_dir, output):
+    scorer = BulkScorer(str(resumes_dir), JOBS, str(output), "en", 2, 4)
+    return asyncio.run(scorer.run())
+
+
+def read_rows(output):
+    return [json.loads(line) for line in output.read_text().splitlines()]
+
+
+def test_load_jobs_formats(tmp_path):
+    jsonl = tmp_path / "jobs.jsonl"
+    jsonl.write_text(
+        '{"id": "a", "text": "Python engineer"}\n\n{"url": "https://jobs.example/1"}\n'
+    )
+    text = tmp_path / "jobs.txt"
+    text.write_text("Python engineer\n---\nData engineer\nSpark\n---\n")
+
+    assert load_jobs(str(jsonl)) == [
+        {"id": "a", "text": "Python engineer"},
+        {"id": "3", "text": "https://jobs.example/1"},
+    ]
+    assert load_jobs(str(text)) == [
+        {"id": "1", "text": "Python engineer"},
+        {"id": "2", "text": "Data engineer\nSpark"},
+    ]
+
+
+def test_scores_every_resume_against_every_job(resumes_dir, tmp_path, similarity):
+    output = tmp_path / "results.jsonl"
+
+    counts = run(resumes_dir, output)
+
+    assert counts == {"ok": 4, "not_resume": 2, "error": 0}
+    rows = read_rows(output)
+    scored = {(r["resume"], r["job_id"]) for r in rows if r["status"] == "ok"}
+    assert scored == {
+        (resume, job["id"])
+        for resume in ("alice.pdf", "batch/bob.pdf")
+        for job in JOBS
+    }
+    ok = next(r for r in rows if r["status"] == "ok")
+    assert ok["score"] == 50.0 and ok["resume_hash"] and ok["job_hash"]
+    assert {r["resume"] for r in rows if r["status"] == "not_resume"} == {
+        "invoice.pdf"
+    }
+
+
+def test_resumes_from_the_checkpoint(resumes_dir, tmp_path, similarity):
+    output = tmp_path / "results.jsonl"
+    output.write_text(
+        json.dumps({"resume": "alice.pdf", "job_id": "backend", "status": "ok"})
+        + "\n"
+        + json.dumps({"resume": "alice.pdf", "job_id": "data", "status": "error"})
+        + "\n"
+        + json.dumps({"resume": "invoice.pdf", "job_id": "backend", "status": "not_resume"})
+        + "\n"
+        + '{"resume": "batch/bob.pdf", "job_'  # cut by an interrupted run
+    )
+
+    assert load_checkpoint(str(output)) == {
+        ("alice.pdf", "backend"),
+        ("invoice.pdf", "backend"),
+    }
+    counts = run(resumes_dir, output)
+
+    # Only the failed pair, bob's and the invoice's remaining job
+    assert counts == {"ok": 3, "not_resume": 1, "error": 0}
+    assert similarity.await_count == 3
+    rows = output.read_text().splitlines()
+    assert json.loads(rows[4])["status"] in ("ok", "not_resume")
+
+
+def test_resumes_in_flight_are_bounded(tmp_path):
+    resumes_dir = tmp_path / "resumes"
+    resumes_dir.mkdir()
+    for number in range(8):
+        (resumes_dir / f"{number}.pdf").write_bytes(
+            make_pdf([f"Candidate {number}"] + RESUME_LINES[1:])
+        )
+    remaining, held = {}, []
+    condense = bulk_score.condense_resume
+
+    def condense_resume(text):
+        condensed = condense(text)
+        remaining[condensed.text] = len(JOBS)
+        held.append(len(remaining))
+        return condensed
+
+    async def compute_similarity(self):
+        await asyncio.sleep(0.01)
+        remaining[self.resume_text] -= 1
+        if not remaining[self.resume_text]:
+            del remaining[self.resume_text]
+        return SIMILARITY
+
+    # One worker, one scoring slot: extraction outpaces the scoring
+    output = tmp_path / "results.jsonl"
+    scorer = BulkScorer(str(resumes_dir), JOBS, str(output), "en", 1, 1)
+    with patch.object(redis_client, "_redis_client", NullRedis()), patch.object(
+        bulk_score, "condense_resume", condense_resume
+    ), patch.object(
+        bulk_score.SimilarityContent, "compute_similarity", compute_similarity
+    ):
+        counts = asyncio.run(scorer.run())
+
+    assert counts["ok"] == 16
+    assert max(held) <= 2
@@ -0,0 +1,29 @@
+import pytest
+
+from src import config as config_module
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ('{"en": ["closed"', "JOB_CLOSED_INDICATORS is not valid JSON"),
+        ('["closed"]', "JOB_CLOSED_INDICATORS must be a JSON dict, got list"),
+        ('{"es": "vacante cerrada"}', "JOB_CLOSED_INDICATORS['es'] must be a list"),
+    ],
+)
+def test_malformed_closed_indicators_are_reported(monkeypatch, value, message):
+    monkeypatch.setenv("JOB_CLOSED_INDICATORS", value)
+
+    with pytest.raises(ValueError, match=message.replace("[", r"\[")):
+        config_module._closed_indicators_env()
+
+
+def test_closed_indicators_stay_keyed_by_language(monkeypatch):
+    monkeypatch.setenv(
+        "JOB_CLOSED_INDICATORS", '{"es": ["vacante cerrada"], "en": ["role filled"]}'
+    )
+
+    assert config_module._closed_indicators_env() == {
+        "es": ["vacante cerrada"],
+        "en": ["role filled"],
+    }
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time of src.main, best of RUNS (about 0.35s when this
+# budget was set, 1.6s before the heavy libraries were deferred)
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 800))
+RUNS = 3
+
+# Libraries that must only be imported on first use
+DEFERRED = (
+    "aiohttp",
+    "bs4",
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "newrelic",
+    "numpy",
+    "playwright",
+    "PyPDF2",
+    "redis",
+    "uvicorn",
+)
+
+
+def import_profile(module: str = "src.main") -> dict:
+    """Cumulative import time (us) of every module, from python -X importtime"""
+    env = {**os.environ, "API_ENV": "test"}
+    env.pop("NEW_RELIC_LICENSE_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return [import_profile() for _ in range(RUNS)]
+
+
+def test_heavy_libraries_are_deferred(profiles):
+    imported = {name.split(".")[0] for name in profiles[0]}
+    assert sorted(imported.intersection(DEFERRED)) == []
+
+
+def test_startup_import_budget(profiles):
+    best_ms = min(profile["src.main"] for profile in profiles) / 1000
+    assert best_ms < BUDGET_MS, (
+        f"import src.main took {best_ms:.0f}ms, budget is {BUDGET_MS:.0f}ms"
+    )
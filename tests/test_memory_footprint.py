@@ -0,0 +1,202 @@
+import asyncio
+import gc
+import io
+import logging
+import os
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.database import redis_client
+from src.services import openai_llm
+from src.services.llm_cache import MODE_REDIS, LLMResponseCache
+from src.services.llm_governor import AdaptiveLimiter, CircuitBreaker, LLMGovernor
+from src.services.llm_providers import (
+    TASK_ANALYSIS,
+    TASK_SCORING,
+    LLMCall,
+    LLMProvider,
+    LLMRouter,
+)
+from src.services.pdf_reader_service import extract_pdf_text
+from src.services.resume_condenser import condense_resume
+from src.services.similarity_service import SimilarityContent
+from src.utils.html_extractor import extract_main_text
+from src.utils.job_index import index_job_description
+
+# Simulated analyses per stage after the warm-up; the steady state must not
+# grow by more than BUDGET_KB whatever the number of analyses
+ANALYSES = int(os.getenv("MEMORY_TEST_ANALYSES", 2000))
+WARMUP = 300
+BUDGET_KB = float(os.getenv("MEMORY_BUDGET_KB", 256))
+TOP_SITES = 10
+
+POSTINGS = [
+    f"Posting {n}: senior Python engineer. We use Python, FastAPI, PostgreSQL, "
+    f"Kubernetes and Kafka. Team {n} builds the payments platform. " * 20
+    for n in range(20)
+]
+RESUME = (
+    "Candidate {i}\nEXPERIENCE\nBackend engineer at Company {i}, Python, "
+    "FastAPI and PostgreSQL since 2019.\nEDUCATION\nComputer Science, "
+    "University {i}\nSKILLS\nPython, Docker, Redis, Kafka\n"
+) * 10
+PAGE = (
+    "<html><head><script>var tracking = {i};</script><style>p {{}}</style></head>"
+    "<body><nav>menu</nav><div class='job-description'>{body}</div>"
+    "<footer>footer {i}</footer></body></html>"
+)
+SELECTORS = [".job-description", "#job-details", "article", "main"]
+CONTEXTUAL = "Score: 0.8\nKeywords: kafka, kubernetes\nFeedback: good match"
+
+
+class NullRedis:
+    """Redis that stores nothing: the memory of a real one is not the worker's"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class StubRouter(LLMRouter):
+    def __init__(self):
+        super().__init__(
+            [LLMProvider("stub", {TASK_SCORING: "small", TASK_ANALYSIS: "large"})]
+        )
+
+    async def invoke(self, task, messages, temperature, **kwargs):
+        jaccard = "score value only" in messages[0].content
+        content = "0.6" if jaccard else CONTEXTUAL
+        return LLMCall(AIMessage(content=content), "stub", "small", 0.0)
+
+
+def make_pdf(lines):
+    """One page PDF with a Helvetica text line per entry"""
+    stream = (
+        b"BT /F1 12 Tf 72 720 Td 14 TL "
+        + b" ".join(b"(" + line.encode("latin-1") + b") '" for line in lines)
+        + b" ET"
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [5 0 R] /Count 1 >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>",
+    ]
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(output)
+
+
+def steady_state_growth(run_one):
+    """
+    Bytes still allocated after ANALYSES runs that follow a warm-up (process
+    caches, compiled regexes, lazy imports), and the sites that allocated them
+    """
+    for i in range(WARMUP):
+        run_one(i)
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(WARMUP, WARMUP + ANALYSES):
+            run_one(i)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    ignored = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    stats = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "lineno"
+    )
+    return sum(stat.size_diff for stat in stats), stats
+
+
+def app_handlers_only():
+    """pytest's log capture keeps every record, the app's own handlers do not"""
+    app_logger = logging.getLogger("AppLogger")
+    handlers = [
+        handler
+        for handler in app_logger.handlers
+        if not type(handler).__module__.startswith("_pytest")
+    ]
+    return patch.multiple(app_logger, handlers=handlers, propagate=False)
+
+
+def assert_bounded(stage, run_one):
+    with app_handlers_only():
+        growth, stats = steady_state_growth(run_one)
+    top_sites = "\n".join(str(stat) for stat in stats[:TOP_SITES])
+    print(f"\n{stage}: {growth / 1024:.1f} KiB after {ANALYSES} analyses\n{top_sites}")
+    assert growth < BUDGET_KB * 1024, (
+        f"{stage} retained {growth / 1024:.1f} KiB over {ANALYSES} analyses "
+        f"(budget {BUDGET_KB:.0f} KiB). Top allocation sites:\n{top_sites}"
+    )
+
+
+@pytest.fixture(autouse=True)
+def null_redis():
+    with patch.object(redis_client, "_redis_client", NullRedis()):
+        yield
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_pdf_extraction_memory_is_bounded():
+    def run_one(i):
+        lines = [f"Candidate {i}", "EXPERIENCE Engineer", "EDUCATION University"]
+        extract_pdf_text(io.BytesIO(make_pdf(lines * 10)))
+
+    assert_bounded("pdf extraction", run_one)
+
+
+def test_html_extraction_memory_is_bounded():
+    body = "".join(f"<p>{POSTINGS[0]}</p>" for _ in range(10))
+
+    def run_one(i):
+        extract_main_text(PAGE.format(i=i, body=body), SELECTORS)
+
+    assert_bounded("html extraction", run_one)
+
+
+def test_scoring_memory_is_bounded(loop):
+    router = StubRouter()
+    governor = LLMGovernor(AdaptiveLimiter(4, 1, 16), CircuitBreaker(5, 30), 0, 0, 0)
+    cache = LLMResponseCache(mode=MODE_REDIS)
+
+    async def analyze(i):
+        condensed = condense_resume(RESUME.format(i=i))
+        posting = await index_job_description(POSTINGS[i % len(POSTINGS)])
+        content = SimilarityContent(condensed.text, posting, "en")
+        return await content.compute_similarity()
+
+    # Plain functions: mocks would keep a record of every call
+    with patch.object(openai_llm, "get_llm_router", lambda: router), patch.object(
+        openai_llm, "get_llm_governor", lambda: governor
+    ), patch.object(openai_llm, "get_llm_cache", lambda: cache):
+        assert loop.run_until_complete(analyze(0))["similarity_score"] == 0.7
+        assert_bounded("scoring", lambda i: loop.run_until_complete(analyze(i)))
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import config
+from src.database.result_store import result_row
+from src.resources import Resources
+
+
+@pytest.fixture
+def redis(tmp_path):
+    client = MagicMock()
+    client.ping.return_value = True
+    with patch("src.resources.get_redis_client", return_value=client), patch(
+        "src.services.health_service.get_redis_client", return_value=client
+    ), patch("src.resources.close_redis_client") as close, patch(
+        "src.helpers.preload.preload_state"
+    ) as preload, patch(
+        "src.utils.job_description_parser.BrowserPool.start"
+    ), patch.dict(
+        config, {"RESULT_STORE_PATH": str(tmp_path / "results.sqlite3")}
+    ):
+        client.close = close
+        client.preload = preload
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_start(redis):
+    readiness = await Resources().health.readiness()
+
+    assert readiness["started"] is False
+    assert readiness["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_start_warms_pools_and_close_releases_them(redis):
+    resources = Resources()
+    await resources.start()
+
+    readiness = await resources.health.readiness()
+    assert readiness["ready"] is True
+    assert readiness["checks"]["llm"]["circuit"] == "closed"
+    assert redis.ping.called
+
+    session = resources.parser.session
+    sink = resources.result_sink
+    assert sink.started
+    await resources.close()
+
+    assert session.closed
+    assert not sink.started
+    assert redis.close.called
+    # The cached result is dropped on shutdown
+    assert (await resources.health.readiness())["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_workers_preload_only_when_asked(redis):
+    resources = Resources()
+    await resources.start()
+    await resources.close()
+    assert not redis.preload.called
+
+    with patch.dict(config, {"PRELOAD_ON_START": True}):
+        await resources.start()
+        await resources.close()
+    assert redis.preload.called
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_when_the_parser_fails_to_close(redis):
+    resources = Resources()
+    await resources.start()
+    sink = resources.result_sink
+    sink.submit(result_row({"score": 0.7}, "en"))
+    parser_close = resources.parser.close
+
+    with patch.object(
+        resources.parser, "close", side_effect=RuntimeError("browser gone")
+    ), pytest.raises(RuntimeError):
+        await resources.close()
+    await parser_close()
+
+    assert sink.written == 1 and not sink.started
+    assert redis.close.called
+
+
+@pytest.mark.asyncio
+async def test_unknown_pdf_backend_fails_at_startup(redis):
+    resources = Resources()
+
+    with patch.dict(config, {"PDF_BACKEND": "tesseract"}), pytest.raises(
+        ValueError, match="tesseract"
+    ):
+        await resources.start()
+    assert not resources.started
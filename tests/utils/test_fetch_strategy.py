@@ -0,0 +1,252 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.utils.fetch_strategy import (
+    DYNAMIC_PLAN,
+    PLAYWRIGHT,
+    SIMPLE_REQUEST,
+    STATIC_PLAN,
+    UNKNOWN_PLAN,
+    HostStrategyMemory,
+    decay_scores,
+    get_host,
+    plan_for,
+)
+from src.utils.job_description_parser import JobDescriptionParser, ParseResult
+
+DAY = 60 * 60 * 24
+
+
+def test_scores_halve_after_each_half_life():
+    raw = {SIMPLE_REQUEST: "4", PLAYWRIGHT: "-2", "updated_at": "0"}
+
+    scores = decay_scores(raw, now=2 * DAY, half_life=DAY)
+
+    assert scores == {SIMPLE_REQUEST: 1.0, PLAYWRIGHT: -0.5}
+
+
+def test_missing_host_history_is_neutral():
+    assert decay_scores({}, now=100.0, half_life=DAY) == {
+        SIMPLE_REQUEST: 0.0,
+        PLAYWRIGHT: 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "scores, expected",
+    [
+        ({SIMPLE_REQUEST: 2.5, PLAYWRIGHT: 0.0}, STATIC_PLAN),
+        ({SIMPLE_REQUEST: -3.0, PLAYWRIGHT: 2.0}, DYNAMIC_PLAN),
+        ({SIMPLE_REQUEST: 1.0, PLAYWRIGHT: 3.0}, UNKNOWN_PLAN),
+        ({SIMPLE_REQUEST: -1.0, PLAYWRIGHT: 1.0}, UNKNOWN_PLAN),
+        ({SIMPLE_REQUEST: 0.0, PLAYWRIGHT: 0.0}, UNKNOWN_PLAN),
+    ],
+)
+def test_plan_for(scores, expected):
+    assert plan_for(scores, threshold=2) == expected
+
+
+def test_get_host_normalises_case():
+    assert get_host("https://Jobs.Example.com:8443/x") == "jobs.example.com"
+
+
+class FakeRedis:
+    """Hashes with the pipeline commands of HostStrategyMemory.record"""
+
+    def __init__(self, read_barrier=None):
+        self.hashes = {}
+        self.lock = threading.Lock()
+        self.read_barrier = read_barrier
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        results, reads = [], False
+        with self.redis.lock:
+            for name, args, kwargs in self.commands:
+                values = self.redis.hashes.setdefault(args[0], {})
+                if name == "hsetnx":
+                    values.setdefault(args[1], str(args[2]))
+                elif name == "hgetall":
+                    reads = True
+                    results.append(dict(values))
+                    continue
+                elif name == "hincrbyfloat":
+                    values[args[1]] = str(float(values.get(args[1], 0)) + args[2])
+                elif name == "hset":
+                    values.update({k: str(v) for k, v in kwargs["mapping"].items()})
+                results.append(None)
+        if reads and self.redis.read_barrier is not None:
+            self.redis.read_barrier.wait(timeout=5)
+        return results
+
+
+def test_record_failure_is_clamped_and_persisted():
+    client = FakeRedis()
+    key = "fetch_strategy:board.example.com"
+    client.hashes[key] = {SIMPLE_REQUEST: "-5", "updated_at": str(time.time())}
+    memory = HostStrategyMemory(half_life=DAY, threshold=2)
+
+    with patch("src.utils.fetch_strategy.get_redis_client", return_value=client):
+        memory.record("https://board.example.com/job/1", SIMPLE_REQUEST, False)
+        memory.record("https://board.example.com/job/2", PLAYWRIGHT, True)
+        scores = memory.scores("board.example.com")
+
+    assert scores[SIMPLE_REQUEST] == pytest.approx(-5.0)
+    assert scores[PLAYWRIGHT] == pytest.approx(1.0)
+
+
+def test_concurrent_records_are_not_lost():
+    # Every worker reads the host's scores before any of them writes
+    client = FakeRedis(read_barrier=threading.Barrier(4))
+    memory = HostStrategyMemory(half_life=DAY, threshold=0)
+
+    def record():
+        memory.record("https://race.example.com/job", SIMPLE_REQUEST, True)
+
+    with patch("src.utils.fetch_strategy.get_redis_client", return_value=client):
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        scores = memory.scores("race.example.com")
+
+    assert scores[SIMPLE_REQUEST] == pytest.approx(4.0)
+    # An explicit threshold of 0 is kept
+    assert memory.threshold == 0
+
+
+def test_redis_errors_fall_back_to_unknown_plan():
+    client = MagicMock()
+    client.hgetall.side_effect = ConnectionError("redis down")
+
+    with patch("src.utils.fetch_strategy.get_redis_client", return_value=client):
+        plan = HostStrategyMemory(half_life=DAY, threshold=2).plan("https://a.com/1")
+
+    assert plan == UNKNOWN_PLAN
+
+
+@pytest.mark.asyncio
+async def test_known_dynamic_host_skips_simple_request():
+    parser = JobDescriptionParser()
+    parser.strategy_memory = MagicMock()
+    parser.strategy_memory.plan.return_value = DYNAMIC_PLAN
+    simple = AsyncMock()
+    playwright = AsyncMock(return_value=ParseResult("content", PLAYWRIGHT, True))
+    parser.strategies = {SIMPLE_REQUEST: simple, PLAYWRIGHT: playwright}
+
+    assert (await parser.parse("https://spa.example.com/job")).content == "content"
+
+    simple.assert_not_awaited()
+    parser.strategy_memory.record.assert_called_once_with(
+        "https://spa.example.com/job", PLAYWRIGHT, True
+    )
+
+
+@pytest.mark.asyncio
+async def test_unknown_host_records_every_attempt():
+    parser = JobDescriptionParser()
+    parser.strategy_memory = MagicMock()
+    parser.strategy_memory.plan.return_value = UNKNOWN_PLAN
+    parser.strategies = {
+        SIMPLE_REQUEST: AsyncMock(
+            return_value=ParseResult(None, SIMPLE_REQUEST, False, "Status code: 403")
+        ),
+        PLAYWRIGHT: AsyncMock(return_value=ParseResult("content", PLAYWRIGHT, True)),
+    }
+
+    assert (await parser.parse("https://new.example.com/job")).content == "content"
+
+    assert [c.args[1:] for c in parser.strategy_memory.record.call_args_list] == [
+        (SIMPLE_REQUEST, False),
+        (PLAYWRIGHT, True),
+    ]
+
+
+def hedged_parser(simple, playwright, delay=0.01):
+    parser = JobDescriptionParser()
+    parser.strategy_memory = MagicMock()
+    parser.strategy_memory.plan.return_value = UNKNOWN_PLAN
+    parser.hedge_delay = delay
+    parser.strategies = {SIMPLE_REQUEST: simple, PLAYWRIGHT: playwright}
+    return parser
+
+
+def slow_strategy(result, seconds, cancelled):
+    async def strategy(url):
+        try:
+            await asyncio.sleep(seconds)
+            return result
+        except asyncio.CancelledError:
+            cancelled.append(result.method)
+            raise
+
+    return strategy
+
+
+@pytest.mark.asyncio
+async def test_hedge_not_started_when_simple_request_is_fast():
+    playwright = AsyncMock()
+    parser = hedged_parser(
+        AsyncMock(return_value=ParseResult("static", SIMPLE_REQUEST, True)),
+        playwright,
+        delay=1,
+    )
+
+    assert (await parser.parse("https://static.example.com/job")).content == "static"
+    playwright.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_playwright_wins_race_and_simple_request_is_cancelled():
+    cancelled = []
+    parser = hedged_parser(
+        slow_strategy(ParseResult("late", SIMPLE_REQUEST, True), 5, cancelled),
+        AsyncMock(return_value=ParseResult("rendered", PLAYWRIGHT, True)),
+    )
+
+    assert (await parser.parse("https://slow.example.com/job")).content == "rendered"
+    assert cancelled == [SIMPLE_REQUEST]
+    assert [c.args[1:] for c in parser.strategy_memory.record.call_args_list] == [
+        (PLAYWRIGHT, True)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_simple_request_wins_race_and_browser_is_cancelled():
+    cancelled = []
+    parser = hedged_parser(
+        slow_strategy(ParseResult("static", SIMPLE_REQUEST, True), 0.05, []),
+        slow_strategy(ParseResult("rendered", PLAYWRIGHT, True), 5, cancelled),
+    )
+
+    assert (await parser.parse("https://slowish.example.com/job")).content == "static"
+    assert cancelled == [PLAYWRIGHT]
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_the_other_attempt_after_a_failure():
+    parser = hedged_parser(
+        slow_strategy(ParseResult(None, SIMPLE_REQUEST, False, "403"), 0.05, []),
+        slow_strategy(ParseResult("rendered", PLAYWRIGHT, True), 0.1, []),
+    )
+
+    assert (await parser.parse("https://mixed.example.com/job")).content == "rendered"
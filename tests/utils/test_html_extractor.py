@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.utils import html_extractor
+from src.utils.html_extractor import compile_selector, extract_main_text
+from src.utils.job_description_parser import JobDescriptionParser
+
+SELECTORS = JobDescriptionParser().content_selectors
+
+JOB_PAGE = """
+<html>
+  <head><title>Backend Engineer</title><style>.x { color: red }</style></head>
+  <body>
+    <header><nav>Home | Jobs</nav></header>
+    <main>
+      <div class="sidebar-content">Related jobs</div>
+      <div class="posting-wrapper">
+        <div class="job-description-body">
+          <h1>Backend Engineer</h1>
+          <p>We build <b>APIs</b> with Python &amp; FastAPI.</p>
+          <!-- tracking comment -->
+          <script>window.track("view")</script>
+          <ul><li>5+ years</li><li>Redis</li></ul>
+        </div>
+      </div>
+    </main>
+    <footer>Copyright</footer>
+  </body>
+</html>
+"""
+
+
+def legacy_extract(html_content, selectors):
+    """Reference implementation: one select_one tree walk per selector."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    for element in soup(["script", "style", "header", "footer", "nav", "aside"]):
+        element.decompose()
+    for selector in selectors:
+        content = soup.select_one(selector)
+        if content:
+            return content.get_text(separator=" ", strip=True)
+    if soup.body:
+        return soup.body.get_text(separator=" ", strip=True)
+    return None
+
+
+PAGES = [
+    JOB_PAGE,
+    "<html><body><article>Only an <i>article</i> here</article></body></html>",
+    '<div role="main"><p>Role main</p></div><div class="job-details">Details</div>',
+    "<html><body><p>No selector matches, plain body</p><aside>ad</aside></body></html>",
+]
+
+
+@pytest.fixture(params=[True, False], ids=["lxml", "html.parser"])
+def engine(request):
+    if request.param and not html_extractor.HAS_LXML:
+        pytest.skip("lxml is not installed")
+    with patch.object(html_extractor, "HAS_LXML", request.param):
+        yield
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_matches_legacy_select_one_chain(engine, page):
+    assert extract_main_text(page, SELECTORS) == legacy_extract(page, SELECTORS)
+
+
+def test_highest_priority_selector_wins(engine):
+    text = extract_main_text(JOB_PAGE, SELECTORS)
+
+    assert text.startswith("Backend Engineer We build APIs")
+    assert "window.track" not in text
+    assert "Related jobs" not in text
+    assert "tracking comment" not in text
+
+
+def test_empty_document_returns_none(engine):
+    assert extract_main_text("   ", SELECTORS) is None
+
+
+@pytest.mark.parametrize(
+    "selector", ["div > p", "div:first-child", "a[href^='http']", "div p"]
+)
+def test_unsupported_selectors_are_rejected(selector):
+    with pytest.raises(ValueError):
+        compile_selector(selector)
@@ -0,0 +1,112 @@
+import re
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.job_description_parser import (
+    ClosedPositionMatcher,
+    JobDescriptionParser,
+)
+
+parser = JobDescriptionParser()
+
+
+def legacy_clean_text(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[\n\r\t]", " ", text)
+    text = re.sub(r"[^\w\s.,!?-]", "", text)
+    return text.strip()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "  Senior   Engineer\n\n(Python/Go) — R$ 10.000,00!\t",
+        "Vaga: Desenvolvedor(a) Sênior @ Empresa\r\n* Requisitos: C++, Node.js",
+        "# ## ###",
+        " non breaking spaces ",
+    ],
+)
+def test_clean_text_matches_previous_behaviour(text):
+    assert parser.clean_text(text) == legacy_clean_text(text)
+
+
+def test_clean_text_empty():
+    assert parser.clean_text("") == ""
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Sorry, this role is currently NO LONGER accepting new applications.",
+        "Processo seletivo encerrado em 10/03",
+        "Status: Vaga Encerrada",
+    ],
+)
+def test_detects_closed_positions(text):
+    assert parser.is_job_finished(text) is True
+
+
+def test_open_position_is_not_finished():
+    assert parser.is_job_finished("We are hiring! Apply now.") is False
+
+
+def test_matcher_accepts_extra_languages_and_drops_redundant_needles():
+    matcher = ClosedPositionMatcher.from_languages(
+        {"en": ["Applications closed", "all applications closed"]},
+        {"es": ["Vacante cerrada"]},
+    )
+
+    assert matcher.indicators == ("vacante cerrada", "applications closed")
+    assert matcher.matches("La VACANTE CERRADA desde ayer")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("https://jobs.example.com/123?ref=x", True),
+        ("http://localhost:8000/job", True),
+        ("We need a Python developer", False),
+        ("ftp://example.com/file", False),
+    ],
+)
+async def test_is_url(text, expected):
+    assert await parser.is_url(text) is expected
+
+
+@pytest.mark.asyncio
+async def test_worker_resources_survive_missing_browser():
+    worker_parser = JobDescriptionParser()
+    with patch(
+        "src.utils.job_description_parser.BrowserPool.start",
+        side_effect=RuntimeError("chromium not installed"),
+    ):
+        await worker_parser.start()
+
+    session = worker_parser.session
+    assert not session.closed
+    assert worker_parser.browser_pool is not None
+
+    await worker_parser.close()
+    assert session.closed
+    assert worker_parser.session is None and worker_parser.browser_pool is None
+
+
+@pytest.mark.asyncio
+async def test_pasted_text_carries_the_closed_flag():
+    result = await parser.parse("Backend engineer. Applications closed.")
+
+    assert result.method == "text"
+    assert result.content == "Backend engineer. Applications closed."
+    assert result.is_position_closed is True
+
+
+@pytest.mark.asyncio
+async def test_postings_are_checked_against_every_language():
+    # The request language is the one of the feedback, not of the posting
+    for text in (
+        "Engenheiro Python. Vaga encerrada.",
+        "Python engineer. Position filled.",
+    ):
+        assert (await parser.parse(text)).is_position_closed is True
@@ -0,0 +1,75 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import job_index
+from src.utils.job_index import (
+    build_job_posting,
+    get_job_posting,
+    index_job_description,
+    job_content_hash,
+)
+
+JOB = """
+Senior Backend Engineer
+
+We are looking for a Python engineer with FastAPI and Redis experience.
+Python, FastAPI, Docker, Kubernetes and CI/CD. Node.js or C++ is a plus.
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_local_cache():
+    job_index._local_cache.clear()
+    yield
+    job_index._local_cache.clear()
+
+
+def test_build_job_posting_artifacts():
+    posting = build_job_posting(JOB)
+
+    assert posting.content_hash == job_content_hash(JOB)
+    assert posting.cleaned_text.startswith("Senior Backend Engineer We are")
+    assert posting.keywords[:3] == ["engineer", "python", "fastapi"]
+    assert {"redis", "ci/cd", "node.js", "c++"} <= set(posting.keywords)
+    assert not {"we", "for", "with", "and"} & set(posting.keywords)
+    assert posting.token_count > 20
+    assert posting.embedding is None
+
+
+@pytest.mark.asyncio
+async def test_posting_is_computed_and_stored_once():
+    with patch.object(job_index, "get_value", return_value=None), patch.object(
+        job_index, "set_with_expiry"
+    ) as set_with_expiry:
+        first = await index_job_description(JOB)
+        second = await index_job_description(JOB)
+
+    assert first is second
+    set_with_expiry.assert_called_once()
+    key, value, _ = set_with_expiry.call_args.args
+    assert key == f"job_index:{first.content_hash}"
+    assert json.loads(value)["keywords"] == first.keywords
+
+
+def test_posting_is_loaded_from_redis():
+    stored = build_job_posting(JOB)
+    payload = json.dumps(stored.__dict__)
+
+    with patch.object(job_index, "get_value", return_value=payload) as get_value:
+        loaded = get_job_posting(stored.content_hash)
+        get_job_posting(stored.content_hash)
+
+    assert loaded == stored
+    get_value.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embedding_is_optional():
+    with patch.dict(job_index.config, {"JOB_INDEX_EMBEDDINGS": True}), patch.object(
+        job_index, "get_value", return_value=None
+    ), patch.object(job_index, "set_with_expiry"):
+        posting = await index_job_description(JOB)
+
+    assert len(posting.embedding) == job_index.config["EMBEDDING_DIMENSIONS"]
@@ -0,0 +1,54 @@
+from src.utils.minhash import (
+    BANDS,
+    NUM_PERMUTATIONS,
+    band_hashes,
+    estimated_jaccard,
+    shingles,
+    signature,
+)
+
+RESUME = """
+Jane Doe - Backend Engineer
+Experience: Acme Corp, 2019-2023. Built REST APIs with Python, FastAPI and
+PostgreSQL; moved the batch jobs to Kafka consumers running on Kubernetes.
+Mentored four engineers and ran the on-call rotation for the payments team.
+Previously at Initech, 2016-2019, maintaining Django services and the CI/CD
+pipelines, cutting deploy time from forty minutes to eight.
+Education: BSc Computer Science, State University, 2016.
+Skills: Python, Go, SQL, Docker, Terraform, AWS, observability with Grafana.
+"""
+
+
+def jaccard(first, second):
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b)
+
+
+def test_layout_changes_do_not_change_the_signature():
+    reexported = RESUME.replace("\n", "  \n ").replace(", ", " ,  ").upper()
+
+    assert signature(reexported) == signature(RESUME)
+    assert len(signature(RESUME)) == NUM_PERMUTATIONS
+
+
+def test_estimate_follows_the_jaccard_similarity():
+    edited = RESUME.replace("four engineers", "five engineers")
+    other = "Registered nurse with ten years of ICU and emergency room practice."
+
+    for text in (edited, other):
+        expected = jaccard(RESUME, text)
+        assert abs(estimated_jaccard(signature(RESUME), signature(text)) - expected) < 0.12
+    assert jaccard(RESUME, edited) > 0.9 > 0.1 > jaccard(RESUME, other)
+
+
+def test_near_duplicates_share_a_band():
+    edited = RESUME.replace("2019-2023", "2019-2024")
+
+    original, near, unrelated = (
+        set(band_hashes(signature(text)))
+        for text in (RESUME, edited, "Chef de cuisine, French bistro, 2010-2020.")
+    )
+
+    assert len(original) == BANDS
+    assert original & near
+    assert not original & unrelated